@@ -0,0 +1,56 @@
+"""
+Micro-benchmarks comparing key list based indexing (`get_obj_elem_from_keys`/`set_obj_elem_from_keys`) with
+compiled key paths (`KeyPath`). Run them with `asv run` or `asv dev`.
+"""
+from openeo_pg_parser.utils import KeyPath
+from openeo_pg_parser.utils import get_obj_elem_from_keys
+from openeo_pg_parser.utils import set_obj_elem_from_keys
+
+N_REPEATS = 1000
+
+
+def create_nested_dict(depth):
+    """ Creates a nested dictionary with the given depth and returns it together with the keys to its leaf. """
+    keys = ["key_{}".format(i) for i in range(depth)]
+    obj = {}
+    elem = obj
+    for key in keys[:-1]:
+        elem[key] = {"sibling": 0}
+        elem = elem[key]
+    elem[keys[-1]] = 0
+    return obj, keys
+
+
+class KeyPathSuite:
+    """ Repeated reads and writes at the same location of a nested dictionary. """
+    params = [2, 8, 32]
+    param_names = ["depth"]
+
+    def setup(self, depth):
+        self.obj, self.keys = create_nested_dict(depth)
+        self.key_path = KeyPath(self.keys)
+        self.key_path_cached = KeyPath(self.keys, cache_parent=True)
+
+    def time_get_obj_elem_from_keys(self, depth):
+        for _ in range(N_REPEATS):
+            get_obj_elem_from_keys(self.obj, self.keys)
+
+    def time_key_path_get(self, depth):
+        for _ in range(N_REPEATS):
+            self.key_path.get(self.obj)
+
+    def time_key_path_get_cached(self, depth):
+        for _ in range(N_REPEATS):
+            self.key_path_cached.get(self.obj)
+
+    def time_set_obj_elem_from_keys(self, depth):
+        for i in range(N_REPEATS):
+            set_obj_elem_from_keys(self.obj, self.keys, i)
+
+    def time_key_path_set(self, depth):
+        for i in range(N_REPEATS):
+            self.key_path.set(self.obj, i)
+
+    def time_key_path_set_cached(self, depth):
+        for i in range(N_REPEATS):
+            self.key_path_cached.set(self.obj, i)
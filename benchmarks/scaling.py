@@ -0,0 +1,88 @@
+"""
+Scaling benchmarks of the translation, sorting, igraph conversion and validation of synthetic process graphs with 10
+up to 100k nodes (see `synthetic.generate_process_graph`), using the local catalog of `synthetic.create_catalog`.
+The `time_` benchmarks measure the wall time and the `peakmem_` benchmarks the peak memory of the process, so compare
+their growth across the number of nodes to spot scaling regressions. Run them with `asv run` or `asv dev`.
+"""
+import json
+import functools
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.validate import validate_process_graph
+from .synthetic import create_catalog
+from .synthetic import generate_process_graph
+
+try:
+    import igraph
+except ImportError:
+    igraph = None
+
+N_NODES = [10, 100, 1000, 10000, 100000]
+PROCESS_DEFS, COLLECTION_DEFS = create_catalog()
+
+
+@functools.lru_cache(maxsize=None)
+def _process_graph_json(n_nodes):
+    """ Generates a synthetic process graph with embedded process graphs of depth 2 and encodes it as JSON. """
+    return json.dumps(generate_process_graph(n_nodes, callback_depth=2, parameter_density=0.1, payload_size=8))
+
+
+class TranslationSuite:
+    """ Translation and validation of a process graph dictionary. """
+    params = N_NODES
+    param_names = ["n_nodes"]
+    timeout = 600
+    # the translation modifies the process graph, so it is decoded again before each call
+    number = 1
+    repeat = (1, 5, 60.)
+
+    def setup(self, n_nodes):
+        self.process_graph = json.loads(_process_graph_json(n_nodes))
+
+    def time_translate(self, n_nodes):
+        translate_process_graph(self.process_graph, process_defs=PROCESS_DEFS)
+
+    def peakmem_translate(self, n_nodes):
+        translate_process_graph(self.process_graph, process_defs=PROCESS_DEFS)
+
+    def time_validate(self, n_nodes):
+        validate_process_graph(self.process_graph, COLLECTION_DEFS, processes_src=PROCESS_DEFS)
+
+    def peakmem_validate(self, n_nodes):
+        validate_process_graph(self.process_graph, COLLECTION_DEFS, processes_src=PROCESS_DEFS)
+
+
+class GraphSuite:
+    """ Operations on a translated process graph. """
+    params = N_NODES
+    param_names = ["n_nodes"]
+    timeout = 600
+
+    def setup(self, n_nodes):
+        self.graph = translate_process_graph(json.loads(_process_graph_json(n_nodes)), process_defs=PROCESS_DEFS)
+
+    def time_sort(self, n_nodes):
+        self.graph.sort(by='dependency')
+
+    def time_sort_result(self, n_nodes):
+        self.graph.sort(by='result')
+
+    def peakmem_sort(self, n_nodes):
+        self.graph.sort(by='dependency')
+
+
+class IGraphSuite:
+    """ Conversion of a translated process graph to an igraph graph. """
+    params = N_NODES
+    param_names = ["n_nodes"]
+    timeout = 600
+
+    def setup(self, n_nodes):
+        if igraph is None:
+            raise NotImplementedError("'igraph' is not installed.")
+        self.graph = translate_process_graph(json.loads(_process_graph_json(n_nodes)), process_defs=PROCESS_DEFS)
+
+    def time_to_igraph(self, n_nodes):
+        self.graph.to_igraph()
+
+    def peakmem_to_igraph(self, n_nodes):
+        self.graph.to_igraph()
@@ -0,0 +1,188 @@
+"""
+Deterministic generator of synthetic openEO process graphs together with a local catalog of the processes and the
+collection they use. The generated graphs are meant for benchmarking, the processes do not have a meaningful
+semantic.
+"""
+import random
+import collections
+
+COLLECTION_ID = "SYNTHETIC"
+BAND_NAMES = ["B1", "B2", "B3", "B4"]
+N_GLOBAL_PARAMETERS = 16
+
+
+def _parameter(name, schema=None, optional=False):
+    """ Creates a parameter definition. """
+    parameter_def = {"name": name, "description": "Parameter '{}'.".format(name), "schema": schema or {}}
+    if optional:
+        parameter_def["optional"] = True
+        parameter_def["default"] = None
+    return parameter_def
+
+
+def create_catalog():
+    """
+    Creates the catalog of the processes and the collection used by the synthetic process graphs.
+
+    Returns
+    -------
+    process_defs : dict
+        Dictionary linking process IDs with process definitions.
+    collection_defs : dict
+        Dictionary linking collection IDs with collection definitions.
+
+    """
+
+    datacube = {"type": "object", "subtype": "datacube"}
+    number = {"type": ["number", "null"]}
+    callback = {"type": "object", "subtype": "process-graph",
+                "parameters": [_parameter("x"), _parameter("context", optional=True)]}
+    process_defs = {
+        "load_collection": [_parameter("id", {"type": "string"}),
+                            _parameter("bands", {"type": ["array", "null"]}, optional=True),
+                            _parameter("context", optional=True)],
+        "apply": [_parameter("data", datacube), _parameter("process", callback),
+                  _parameter("context", optional=True)],
+        "sum": [_parameter("data", {"type": "array"}), _parameter("context", optional=True)],
+        "add": [_parameter("x", number), _parameter("y", number), _parameter("context", optional=True)],
+        "multiply": [_parameter("x", number), _parameter("y", number), _parameter("context", optional=True)]
+    }
+    process_defs = {process_id: {"id": process_id, "parameters": parameter_defs,
+                                 "returns": {"description": "Result.", "schema": {}}}
+                    for process_id, parameter_defs in process_defs.items()}
+
+    collection_defs = {COLLECTION_ID: {
+        "id": COLLECTION_ID,
+        "cube:dimensions": {"bands": {"type": "bands", "values": BAND_NAMES}},
+        "summaries": {"eo:bands": [{"name": band_name} for band_name in BAND_NAMES]}
+    }}
+
+    return process_defs, collection_defs
+
+
+class _ProcessGraphGenerator:
+    """ Keeps the state of the generation of one synthetic process graph. """
+
+    def __init__(self, n_nodes, fan_in, fan_out, callback_depth, callback_ratio, parameter_density, payload_size,
+                 seed):
+        self.n_remaining = n_nodes
+        self.fan_in = fan_in
+        self.fan_out = fan_out
+        self.callback_depth = callback_depth
+        self.callback_ratio = callback_ratio
+        self.parameter_density = parameter_density
+        self.payload_size = payload_size
+        self.rng = random.Random(seed)
+        self.used_parameters = set()
+
+    def number(self):
+        """ Returns a constant number or, depending on the parameter density, a global parameter reference. """
+        if self.rng.random() < self.parameter_density:
+            parameter_name = "p{}".format(self.rng.randrange(N_GLOBAL_PARAMETERS))
+            self.used_parameters.add(parameter_name)
+            return {"from_parameter": parameter_name}
+        return self.rng.randint(1, 100)
+
+    def node(self, process_id, arguments):
+        """ Creates a node and adds the argument payload. """
+        self.n_remaining -= 1
+        if self.payload_size:
+            arguments["context"] = [self.rng.random() for _ in range(self.payload_size)]
+        return {"process_id": process_id, "arguments": arguments}
+
+    def callback(self, level):
+        """ Creates an embedded process graph, which is nested as long as the depth and the node budget allow it. """
+        process_graph = {"multiply": self.node("multiply", {"x": {"from_parameter": "x"}, "y": self.number()})}
+        if level < self.callback_depth and self.n_remaining >= 2:
+            process_graph["apply"] = self.node("apply", {"data": {"from_node": "multiply"},
+                                                         "process": self.callback(level + 1)})
+            process_graph["apply"]["result"] = True
+        else:
+            process_graph["multiply"]["result"] = True
+        return {"process_graph": process_graph}
+
+    def generate(self):
+        """ Generates the process graph. """
+        process_graph = dict()
+        process_graph["load_collection_0"] = self.node("load_collection", {"id": COLLECTION_ID,
+                                                                            "bands": list(BAND_NAMES)})
+        # window of the recently created nodes, which can still be used as an input, and their number of consumers
+        candidates = collections.deque(["load_collection_0"], maxlen=4 * self.fan_in)
+        consumers = {"load_collection_0": 0}
+        i = 0
+        while self.n_remaining > 0:
+            i += 1
+            input_names = self.rng.sample(candidates, self.rng.randint(1, min(self.fan_in, len(candidates))))
+            for input_name in input_names:
+                consumers[input_name] += 1
+                if consumers[input_name] >= self.fan_out:
+                    del consumers[input_name]
+                    candidates.remove(input_name)
+            inputs = [{"from_node": input_name} for input_name in input_names]
+
+            if len(inputs) > 1:
+                name = "sum_{}".format(i)
+                process_graph[name] = self.node("sum", {"data": inputs})
+            elif self.n_remaining >= 2 and self.rng.random() < self.callback_ratio:
+                name = "apply_{}".format(i)
+                process_graph[name] = self.node("apply", {"data": inputs[0]})
+                process_graph[name]["arguments"]["process"] = self.callback(1)
+            else:
+                name = "add_{}".format(i)
+                process_graph[name] = self.node("add", {"x": inputs[0], "y": self.number()})
+            # the oldest node falls out of the window
+            if len(candidates) == candidates.maxlen:
+                del consumers[candidates[0]]
+            candidates.append(name)
+            consumers[name] = 0
+        process_graph[list(process_graph.keys())[-1]]["result"] = True
+
+        parameters = [{"name": parameter_name, "description": "Global parameter.", "schema": {"type": "number"},
+                       "default": int(parameter_name[1:]) + 1} for parameter_name in sorted(self.used_parameters)]
+
+        return {"process_graph": process_graph, "parameters": parameters}
+
+
+def generate_process_graph(n_nodes, fan_in=2, fan_out=2, callback_depth=1, callback_ratio=0.2,
+                           parameter_density=0.1, payload_size=0, seed=0):
+    """
+    Generates a synthetic openEO process graph using the processes and the collection of `create_catalog`. The same
+    arguments always result in the same process graph.
+    The graph starts with a 'load_collection' node. Each following top level node takes its input from one up to
+    `fan_in` of the recently created nodes, which are used as an input at most `fan_out` times. Nodes with several
+    inputs are 'sum' processes, the others are 'apply' processes with an embedded process graph or 'add' processes.
+
+    Parameters
+    ----------
+    n_nodes : int
+        Total number of nodes, including the nodes of embedded process graphs.
+    fan_in : int, optional
+        Maximum number of inputs of a node (defaults to 2).
+    fan_out : int, optional
+        Maximum number of nodes using the output of a node (defaults to 2).
+    callback_depth : int, optional
+        Nesting depth of the embedded process graphs (defaults to 1). Each level consists of a 'multiply' node and,
+        apart from the deepest level, an 'apply' node embedding the next level.
+    callback_ratio : float, optional
+        Probability of a node with a single input to be an 'apply' process (defaults to 0.2).
+    parameter_density : float, optional
+        Probability of a numeric argument to reference a global parameter with 'from_parameter' (defaults to 0.1).
+    payload_size : int, optional
+        Number of random numbers added to the 'context' argument of each node (defaults to 0, i.e. no 'context').
+    seed : int, optional
+        Seed of the random number generator (defaults to 0).
+
+    Returns
+    -------
+    dict
+        openEO process graph including the definition of the used global parameters.
+
+    """
+
+    if n_nodes < 1:
+        err_msg = "At least one node is needed ({} given).".format(n_nodes)
+        raise ValueError(err_msg)
+
+    generator = _ProcessGraphGenerator(n_nodes, fan_in, fan_out, callback_depth, callback_ratio, parameter_density,
+                                       payload_size, seed)
+    return generator.generate()
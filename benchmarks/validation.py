@@ -0,0 +1,58 @@
+"""
+Benchmarks of the argument validation against the JSON schemas of the process parameters on a process graph with
+1000 nodes. Divide the timings by the number of nodes to get the cost per node. Run them with `asv run` or `asv dev`.
+"""
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.validate import ArgumentValidator
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+N_NODES = 1000
+
+PROCESS_DEFS = {
+    "add": {
+        "id": "add",
+        "parameters": [
+            {"name": "x", "description": "The first summand.", "schema": {"type": ["number", "null"]}},
+            {"name": "y", "description": "The second summand.", "schema": {"type": ["number", "null"]}}
+        ],
+        "returns": {"description": "The computed sum.", "schema": {"type": ["number", "null"]}}
+    }
+}
+
+
+def create_process_graph(n_nodes):
+    """ Creates a process graph consisting of a chain of 'add' processes. """
+    process_graph = dict()
+    for i in range(n_nodes):
+        x = {"from_node": "add{}".format(i - 1)} if i > 0 else 1
+        process_graph["add{}".format(i)] = {"process_id": "add", "arguments": {"x": x, "y": i}}
+    process_graph["add{}".format(n_nodes - 1)]["result"] = True
+    return {"process_graph": process_graph}
+
+
+class ArgumentValidationSuite:
+    """ Validation of all node arguments of a translated process graph. """
+    timeout = 300
+
+    def setup(self):
+        if jsonschema is None:
+            raise NotImplementedError("'jsonschema' is not installed.")
+        self.graph = translate_process_graph(create_process_graph(N_NODES), process_defs=PROCESS_DEFS)
+        # compile and cache the validators
+        ArgumentValidator(PROCESS_DEFS)(self.graph[0])
+
+    def time_compiled_validators(self):
+        validator = ArgumentValidator(PROCESS_DEFS)
+        for node in self.graph.nodes:
+            validator(node)
+
+    def time_uncompiled_validation(self):
+        for node in self.graph.nodes:
+            for parameter_def in PROCESS_DEFS[node.process_id]["parameters"]:
+                value = node.content["arguments"][parameter_def["name"]]
+                if not isinstance(value, dict):
+                    jsonschema.validate(value, parameter_def["schema"])
@@ -0,0 +1,117 @@
+from datetime import datetime
+
+
+def _n_days(temporal_extent):
+    """
+    Counts the days covered by a temporal extent.
+
+    Parameters
+    ----------
+    temporal_extent : list
+        Start and end date/time as ISO 8601 strings. Open or missing bounds are allowed.
+
+    Returns
+    -------
+    int
+        Number of days or 1 if the temporal extent is not fully specified.
+
+    """
+
+    if not isinstance(temporal_extent, list) or len(temporal_extent) != 2:
+        return 1
+    if not all([isinstance(date, str) for date in temporal_extent]):
+        return 1
+
+    try:
+        start_date, end_date = [datetime.strptime(date[:10], "%Y-%m-%d") for date in temporal_extent]
+    except ValueError:
+        return 1
+
+    return max((end_date - start_date).days, 1)
+
+
+def load_collection_cost(node):
+    """
+    Estimates the cost of loading a collection as the number of bands times the number of days.
+
+    Parameters
+    ----------
+    node : graph.OpenEONode
+        'load_collection' node.
+
+    Returns
+    -------
+    float
+
+    """
+
+    arguments = node.arguments
+    bands = arguments.get('bands')
+    n_bands = len(bands) if isinstance(bands, list) else 1
+    return float(n_bands * _n_days(arguments.get('temporal_extent')))
+
+
+DEFAULT_COST_FUNCS = {'load_collection': load_collection_cost}
+
+
+class CostModel:
+    """ Estimates the execution cost of each node of a process graph. """
+
+    def __init__(self, cost_funcs=None, default_cost=1., use_defaults=True):
+        """
+        Constructor of `CostModel`.
+
+        Parameters
+        ----------
+        cost_funcs : dict, optional
+            Dictionary linking process IDs with functions, which take a node (`graph.OpenEONode`) and return its
+            estimated cost as a number.
+        default_cost : float, optional
+            Cost of nodes, whose process ID has no cost function (defaults to 1).
+        use_defaults : bool, optional
+            If true, the default cost functions in `DEFAULT_COST_FUNCS` are used for all processes, which are not
+            specified in `cost_funcs` (default).
+
+        """
+
+        self.cost_funcs = dict(DEFAULT_COST_FUNCS) if use_defaults else dict()
+        if cost_funcs is not None:
+            self.cost_funcs.update(cost_funcs)
+        self.default_cost = default_cost
+
+    def register(self, process_id, cost_func):
+        """
+        Registers a cost function for a process.
+
+        Parameters
+        ----------
+        process_id : str
+            Unique OpenEO process name.
+        cost_func : callable
+            Function taking a node and returning its estimated cost.
+
+        """
+
+        self.cost_funcs[process_id] = cost_func
+
+    def cost(self, node):
+        """
+        Estimates the cost of a node.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Node of interest.
+
+        Returns
+        -------
+        float
+
+        """
+
+        cost_func = self.cost_funcs.get(getattr(node, "process_id", None))
+        return float(cost_func(node)) if cost_func is not None else float(self.default_cost)
+
+
+if __name__ == '__main__':
+    pass
@@ -1,8 +1,9 @@
 import os
 from json import load
 from openeo_pg_parser.utils import load_processes
+from openeo_pg_parser.utils import DEFAULT_PROCESSES_SRC
 from openeo_pg_parser.utils import get_obj_elem_from_keys
-from openeo_pg_parser.utils import walk_process_dictionary
+from openeo_pg_parser.utils import iter_key_paths
 
 
 class OpenEOProcess:
@@ -65,7 +66,7 @@ class OpenEOProcess:
 
         # use standard directory
         if src is None:
-            src = os.path.join(os.path.dirname(__file__), "..", "..", "processes")
+            src = DEFAULT_PROCESSES_SRC
 
         processes = load_processes(src)
 
@@ -109,15 +110,14 @@ class OpenEOProcess:
         sub_parameters = {}
         for param_def in self.definition['parameters']:
             parameter = OpenEOParameter(param_def)
-            keys_lineage, _, _, _ = walk_process_dictionary(parameter.schema)
-            keys_done = []
-            for key_lineage in keys_lineage:
+            keys_done = set()
+            for key_lineage in iter_key_paths(parameter.schema):
                 if 'parameters' not in key_lineage:  # continue if 'parameter' is not in the list of keys
                     continue
                 keys = key_lineage[:key_lineage.index('parameters')+1]
                 if keys in keys_done:  # continue if the keys were already used
                     continue
-                keys_done.append(keys)
+                keys_done.add(keys)
                 sub_param_defs = get_obj_elem_from_keys(parameter.schema, keys)
                 for sub_param_def in sub_param_defs:
                     sub_parameter = OpenEOParameter(sub_param_def)
@@ -198,4 +198,84 @@ class OpenEOParameter:
         str
 
         """
-        return str(self.definition)
\ No newline at end of file
+        return str(self.definition)
+
+
+class OpenEOCollection:
+    """
+    Class representing an openEO collection definition. The dimensions and band names are indexed on first access.
+    """
+
+    def __init__(self, collection_def):
+        """
+        Constructor of `OpenEOCollection` class.
+
+        Parameters
+        ----------
+        collection_def : dict
+            A dictionary defining an openEO collection.
+
+        """
+        self.definition = collection_def
+        self._dimensions = None
+        self._band_names = None
+        self._band_index = None
+
+    @property
+    def id(self):
+        """ str : ID of the collection. """
+        return self.definition['id']
+
+    @property
+    def dimensions(self):
+        """ dict : Dictionary linking dimension types with the names of all dimensions of this type. """
+        if self._dimensions is None:
+            dimensions = dict()
+            for dim_name, dim_def in self.definition.get('cube:dimensions', dict()).items():
+                dimensions.setdefault(dim_def['type'], []).append(dim_name)
+            self._dimensions = dimensions
+
+        return self._dimensions
+
+    @property
+    def band_names(self):
+        """ list of str : Case-folded values of all band dimensions in their original order. """
+        if self._band_names is None:
+            dim_defs = self.definition.get('cube:dimensions', dict())
+            self._band_names = [band.casefold() for dim_name in self.dimensions.get('bands', [])
+                                for band in dim_defs[dim_name].get('values', [])]
+
+        return self._band_names
+
+    @property
+    def band_index(self):
+        """
+        frozenset : Case-folded names of all bands, including their aliases, i.e. the names and common names of
+        the 'eo:bands' summary.
+        """
+        if self._band_index is None:
+            band_index = set(self.band_names)
+            eo_bands = self.definition.get('summaries', dict()).get('eo:bands') or []
+            for eo_band in eo_bands:
+                for key in ('name', 'common_name'):
+                    if isinstance(eo_band.get(key), str):
+                        band_index.add(eo_band[key].casefold())
+            self._band_index = frozenset(band_index)
+
+        return self._band_index
+
+    def has_band(self, band):
+        """
+        Checks if a band name or alias is available in the collection, ignoring the case.
+
+        Parameters
+        ----------
+        band : str
+            Band name or alias.
+
+        Returns
+        -------
+        bool
+
+        """
+        return band.casefold() in self.band_index
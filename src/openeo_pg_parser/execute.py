@@ -0,0 +1,396 @@
+import time
+import threading
+import concurrent.futures as cf
+
+
+class ExecutionError(Exception):
+    """ Raised if the implementation of a process fails during the execution of a process graph. """
+
+    def __init__(self, node_id, msg):
+        """
+        Constructor of `ExecutionError`.
+
+        Parameters
+        ----------
+        node_id : str
+            ID of the node, which failed.
+        msg : str
+            Error message.
+
+        """
+        super().__init__(msg)
+        self.node_id = node_id
+
+
+class ExecutionCancelled(Exception):
+    """ Raised if the execution of a process graph was cancelled. """
+    pass
+
+
+class _NodeReference:
+    """ Placeholder for the result of another node ('from_node'). """
+
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+
+class _ParameterReference:
+    """ Placeholder for a parameter value ('from_parameter'). """
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Timings:
+    """
+    Thread-safe accumulator of the wall time of nodes of embedded process graphs, which can be called several times.
+    Its values are not transferred when it is pickled, e.g. when passing it to another process.
+    """
+
+    def __init__(self):
+        self.values = dict()
+        self._lock = threading.Lock()
+
+    def add(self, node_id, wall_time):
+        with self._lock:
+            self.values[node_id] = self.values.get(node_id, 0.) + wall_time
+
+    def clear(self):
+        with self._lock:
+            self.values = dict()
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+
+class _SubGraph:
+    """
+    Callable executing an embedded process graph (callback). The keyword arguments of the call are the parameters of
+    the embedded process graph, e.g. `reducer(data=[1, 2, 3])`. It only consists of plain Python objects, so it can be
+    passed to other processes as long as the process implementations can be pickled.
+    """
+
+    def __init__(self, tasks, result_node_id, implementations, timings=None):
+        """
+        Constructor of `_SubGraph`.
+
+        Parameters
+        ----------
+        tasks : list of tuples
+            Node ID, process ID and compiled arguments of each node, sorted by dependency.
+        result_node_id : str
+            ID of the node, which returns the result of the embedded process graph.
+        implementations : dict
+            Dictionary linking process IDs with callables.
+        timings : _Timings, optional
+            Accumulator of the wall time of each node.
+
+        """
+        self.tasks = tasks
+        self.result_node_id = result_node_id
+        self.implementations = implementations
+        self.timings = timings
+
+    def __call__(self, **parameters):
+        results = dict()
+        for node_id, process_id, arguments in self.tasks:
+            arguments = _resolve_arguments(arguments, results, parameters)
+            if self.timings is None:
+                results[node_id] = self.implementations[process_id](**arguments)
+            else:
+                results[node_id], wall_time = _execute_task(self.implementations[process_id], arguments)
+                self.timings.add(node_id, wall_time)
+
+        return results[self.result_node_id]
+
+
+def _resolve_arguments(value, results, parameters):
+    """
+    Replaces node and parameter placeholders with their actual values.
+
+    Parameters
+    ----------
+    value : object
+        Compiled argument value.
+    results : dict
+        Dictionary linking node IDs with their results.
+    parameters : dict
+        Dictionary linking parameter names with their values.
+
+    Returns
+    -------
+    object
+
+    """
+
+    if isinstance(value, _NodeReference):
+        return results[value.node_id]
+    elif isinstance(value, _ParameterReference):
+        if value.name not in parameters:
+            err_msg = "Parameter '{}' is not available.".format(value.name)
+            raise ValueError(err_msg)
+        return parameters[value.name]
+    elif isinstance(value, dict):
+        return {k: _resolve_arguments(v, results, parameters) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_resolve_arguments(v, results, parameters) for v in value]
+    else:
+        return value
+
+
+def _execute_task(func, arguments):
+    """ Calls a process implementation and measures its wall time. """
+    start_time = time.perf_counter()
+    result = func(**arguments)
+    return result, time.perf_counter() - start_time
+
+
+class GraphExecutor:
+    """
+    Executes a translated openEO process graph with Python implementations of the processes.
+    Each node of the top level process graph is submitted to a thread or process pool as soon as all its process
+    dependencies are done. Embedded process graphs (callbacks) are passed as callables to the implementation of their
+    parent process.
+    """
+
+    def __init__(self, process_graph, implementations, max_workers=None, pool="thread", cost_model=None):
+        """
+        Constructor of `GraphExecutor`.
+
+        Parameters
+        ----------
+        process_graph : graph.Graph
+            Translated openEO process graph.
+        implementations : dict
+            Dictionary linking process IDs with callables. A callable is called with the node arguments as keyword
+            arguments, e.g. `implementations['max'](data=[1, 2], ignore_nodata=True)`.
+        max_workers : int, optional
+            Maximum number of workers of the pool.
+        pool : str or concurrent.futures.Executor, optional
+            Pool executing the nodes:
+                - "thread": a thread pool is used (default).
+                - "process": a process pool is used. Process implementations, arguments and results need to be
+                             picklable.
+                - an existing `concurrent.futures.Executor` instance, which is not shut down after the execution.
+        cost_model : cost.CostModel, optional
+            If given, nodes being ready at the same time are submitted in the order of their slack, i.e. nodes on the
+            critical path first. By default, they are submitted in dependency order.
+
+        """
+
+        self.process_graph = process_graph
+        self.implementations = implementations
+        self.max_workers = max_workers
+        self.pool = pool
+        self.timings = dict()
+        self._nested_timings = _Timings()
+        self._cancel_event = threading.Event()
+
+        missing_process_ids = sorted({node.process_id for node in process_graph.nodes
+                                      if node.process_id not in implementations})
+        if missing_process_ids:
+            err_msg = "No implementation given for the processes {}.".format(", ".join(missing_process_ids))
+            raise ValueError(err_msg)
+
+        node_order = {node_id: i for i, node_id in enumerate(process_graph.sort(by='dependency').ids)}
+        self._node_order = node_order
+        if cost_model is not None:
+            process_graph.critical_path(cost_model=cost_model)
+            self._priorities = {node.id: (node.slack, node_order[node.id]) for node in process_graph.nodes}
+        else:
+            self._priorities = node_order
+        self._top_nodes = [node for node in process_graph.nodes if node.parent_process is None]
+        self._top_nodes.sort(key=lambda node: node_order[node.id])
+        self._tasks = {node.id: (node.process_id, self._compile_node(node)) for node in self._top_nodes}
+
+    def _compile_node(self, node):
+        """
+        Compiles the arguments of a node, i.e. replaces references to other nodes, parameters and embedded process
+        graphs with placeholders.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Node to compile.
+
+        Returns
+        -------
+        dict
+            Compiled arguments.
+
+        """
+
+        # group child processes by the argument they are embedded in
+        callbacks = dict()
+        for child_node in node.child_processes.nodes:
+            callback_keys = tuple(child_node.keys[len(node.keys):-2])
+            callbacks.setdefault(callback_keys, []).append(child_node)
+
+        sub_graphs = dict()
+        for child_nodes in callbacks.values():
+            child_nodes.sort(key=lambda child_node: self._node_order[child_node.id])
+            tasks = [(child_node.id, child_node.process_id, self._compile_node(child_node))
+                     for child_node in child_nodes]
+            result_node_ids = [child_node.id for child_node in child_nodes if child_node.is_result]
+            if len(result_node_ids) != 1:
+                err_msg = "Exactly one result node is needed in the process graph embedded in '{}'.".format(node.id)
+                raise ValueError(err_msg)
+            sub_graphs[result_node_ids[0]] = _SubGraph(tasks, result_node_ids[0], self.implementations,
+                                                       timings=self._nested_timings)
+
+        def compile_value(value):
+            if isinstance(value, dict):
+                if "from_node" in value:
+                    node_id = value["from_node"]
+                    return sub_graphs[node_id] if node_id in sub_graphs else _NodeReference(node_id)
+                elif "from_parameter" in value:
+                    return _ParameterReference(value["from_parameter"])
+                else:
+                    return {k: compile_value(v) for k, v in value.items()}
+            elif isinstance(value, list):
+                return [compile_value(v) for v in value]
+            else:
+                return value
+
+        return compile_value(node.arguments)
+
+    def _create_pool(self):
+        """ concurrent.futures.Executor : Creates the pool for executing the nodes. """
+        if isinstance(self.pool, cf.Executor):
+            return self.pool
+        elif self.pool == "thread":
+            return cf.ThreadPoolExecutor(max_workers=self.max_workers)
+        elif self.pool == "process":
+            return cf.ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            err_msg = "Pool '{}' unknown.".format(self.pool)
+            raise ValueError(err_msg)
+
+    def cancel(self):
+        """
+        Cancels the execution. Nodes, which are not started yet, are not executed anymore, running nodes are
+        completed. If the execution is not running yet, the next call of `GraphExecutor.run` is cancelled.
+        """
+        self._cancel_event.set()
+
+    def run(self, parameters=None, timeout=None, poll_interval=0.1):
+        """
+        Executes the process graph.
+
+        Parameters
+        ----------
+        parameters : dict, optional
+            Values of parameters referenced with 'from_parameter' in the top level process graph.
+        timeout : float, optional
+            Maximum execution time in seconds. If it is exceeded, the execution is cancelled and a `TimeoutError`
+            is raised.
+        poll_interval : float, optional
+            Interval in seconds for checking if the execution was cancelled (defaults to 0.1).
+
+        Returns
+        -------
+        dict
+            Dictionary linking the node IDs of the top level process graph with their results.
+
+        Notes
+        -----
+        The wall time of each executed node is stored in `GraphExecutor.timings`. For nodes of embedded process
+        graphs, it is the sum over all their calls. It is not available for these nodes if a process pool is used,
+        since the embedded process graphs are executed in other processes then.
+
+        """
+
+        parameters = parameters or dict()
+        self.timings = dict()
+        self._nested_timings.clear()
+        start_time = time.perf_counter()
+
+        top_node_ids = set(self._tasks.keys())
+        n_dependencies = dict()
+        dependents = {node.id: [] for node in self._top_nodes}
+        for node in self._top_nodes:
+            dependency_ids = {dependency.id for dependency in node.dependencies.nodes} & top_node_ids
+            n_dependencies[node.id] = len(dependency_ids)
+            for dependency_id in dependency_ids:
+                dependents[dependency_id].append(node.id)
+
+        ready = [node.id for node in self._top_nodes if n_dependencies[node.id] == 0]
+        ready.sort(key=lambda node_id: self._priorities[node_id])
+        results = dict()
+        running = dict()
+        pool = self._create_pool()
+        try:
+            # the execution might have been cancelled before it started
+            if self._cancel_event.is_set():
+                raise ExecutionCancelled("Execution of the process graph was cancelled.")
+            while ready or running:
+                for node_id in ready:
+                    process_id, arguments = self._tasks[node_id]
+                    arguments = _resolve_arguments(arguments, results, parameters)
+                    future = pool.submit(_execute_task, self.implementations[process_id], arguments)
+                    running[future] = node_id
+                ready = []
+
+                done, _ = cf.wait(running, timeout=poll_interval, return_when=cf.FIRST_COMPLETED)
+                if self._cancel_event.is_set():
+                    raise ExecutionCancelled("Execution of the process graph was cancelled.")
+                if timeout is not None and (time.perf_counter() - start_time) > timeout:
+                    raise TimeoutError("Execution of the process graph exceeded {} seconds.".format(timeout))
+
+                for future in done:
+                    node_id = running.pop(future)
+                    try:
+                        results[node_id], self.timings[node_id] = future.result()
+                    except Exception as exc:
+                        err_msg = "Execution of node '{}' failed: {}".format(node_id, exc)
+                        raise ExecutionError(node_id, err_msg) from exc
+
+                    for dependent_id in dependents[node_id]:
+                        n_dependencies[dependent_id] -= 1
+                        if n_dependencies[dependent_id] == 0:
+                            ready.append(dependent_id)
+                ready.sort(key=lambda node_id: self._priorities[node_id])
+        finally:
+            for future in running:
+                future.cancel()
+            if pool is not self.pool:
+                pool.shutdown(wait=False)
+            self._cancel_event.clear()
+            self.timings.update(self._nested_timings.values)
+
+        return results
+
+
+def execute_process_graph(process_graph, implementations, parameters=None, max_workers=None, pool="thread"):
+    """
+    Executes a translated openEO process graph with Python implementations of the processes.
+
+    Parameters
+    ----------
+    process_graph : graph.Graph
+        Translated openEO process graph.
+    implementations : dict
+        Dictionary linking process IDs with callables, which are called with the node arguments as keyword arguments.
+    parameters : dict, optional
+        Values of parameters referenced with 'from_parameter' in the top level process graph.
+    max_workers : int, optional
+        Maximum number of workers of the pool.
+    pool : str or concurrent.futures.Executor, optional
+        "thread" (default), "process" or an existing `concurrent.futures.Executor` instance.
+
+    Returns
+    -------
+    dict
+        Dictionary linking the node IDs of the top level process graph with their results.
+
+    """
+
+    executor = GraphExecutor(process_graph, implementations, max_workers=max_workers, pool=pool)
+    return executor.run(parameters=parameters)
+
+
+if __name__ == '__main__':
+    pass
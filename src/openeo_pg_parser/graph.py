@@ -1,24 +1,33 @@
 import copy
+import json
+import zlib
+import heapq
+import struct
 import numpy as np
 from pprint import pformat
 from collections import OrderedDict
-import igraph as ig
 
+from openeo_pg_parser.cost import CostModel
+from openeo_pg_parser.trace import NULL_TRACER
+from openeo_pg_parser.utils import KeyPath
+from openeo_pg_parser.utils import fingerprint
+from openeo_pg_parser.utils import DEFAULT_PROCESSES_SRC
+from openeo_pg_parser.utils import get_obj_elem_from_keys
+from openeo_pg_parser.utils import iter_key_paths
+from openeo_pg_parser.utils import load_processes
+from openeo_pg_parser.utils import set_obj_elem_from_keys
 from openeo_pg_parser.utils import find_node_inputs
 from openeo_pg_parser.definitions import OpenEOProcess
 from openeo_pg_parser.definitions import OpenEOParameter
 
+# header of serialised graphs: magic bytes and format version
+SERIALISATION_MAGIC = b"OEPG"
+SERIALISATION_VERSION = 2
+# node attributes stored when serialising a graph, structural hashes only if they have been computed already
+SERIALISED_NODE_ATTRIBUTES = ("id", "name", "content", "depth", "keys", "parameter_refs", "callback_extras",
+                              "_structural_hash", "cost", "cumulative_cost", "slack")
+
 
-# def rec_sort_process_graph(process_graph, nodes, depth=0, list_idx=0):
-#     while True:
-#
-#         current_node = nodes[list_idx]
-#         pg_lower_dep = process_graph.lineage(current_node, link="callback", ancestors=True,
-#                                              include_node=False)
-#         if len(pg_lower_dep) == 0:
-#             return
-#         else:
-#             depth rec_sort_process_graph(process_graph, sorted_nodes, depth=depth)
 def create_edge(node_from, node_to, name="data", hidden=False):
     """
     Creates a directed edge of type `graph.Edge` between the nodes `node_from` and `node_to`.
@@ -46,10 +55,206 @@ def create_edge(node_from, node_to, name="data", hidden=False):
     node_to.add_edge(edge)
     node_from.add_edge(edge)
 
+
+def topological_sort(successors, labels=None):
+    """
+    Sorts the vertices of a directed acyclic graph topologically with Kahn's algorithm.
+    If several vertices are ready at the same time, the one with the lowest index is taken first, which makes the
+    order deterministic.
+
+    Parameters
+    ----------
+    successors : list of lists
+        Adjacency list, i.e. the i-th entry contains the indexes of all vertices having an incoming edge from vertex i.
+    labels : list of str, optional
+        Vertex labels used in the error message if the graph contains a cycle (defaults to the vertex indexes).
+
+    Returns
+    -------
+    list of int
+        Vertex indexes in topological order.
+
+    """
+
+    n_vertices = len(successors)
+    in_degrees = [0] * n_vertices
+    for vertex_succs in successors:
+        for succ in vertex_succs:
+            in_degrees[succ] += 1
+
+    ready = [vertex for vertex in range(n_vertices) if in_degrees[vertex] == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        vertex = heapq.heappop(ready)
+        order.append(vertex)
+        for succ in successors[vertex]:
+            in_degrees[succ] -= 1
+            if in_degrees[succ] == 0:
+                heapq.heappush(ready, succ)
+
+    if len(order) != n_vertices:
+        cycle = _find_cycle(successors, in_degrees)
+        labels = labels if labels is not None else [str(vertex) for vertex in range(n_vertices)]
+        err_msg = "Graph contains a cycle: {}.".format(" -> ".join([labels[vertex] for vertex in cycle]))
+        raise ValueError(err_msg)
+
+    return order
+
+
+def _find_cycle(successors, in_degrees):
+    """
+    Finds one cycle among the vertices, which are left over by Kahn's algorithm, i.e. which have a positive in-degree.
+
+    Parameters
+    ----------
+    successors : list of lists
+        Adjacency list, i.e. the i-th entry contains the indexes of all vertices having an incoming edge from vertex i.
+    in_degrees : list of int
+        Remaining in-degrees after running Kahn's algorithm.
+
+    Returns
+    -------
+    list of int
+        Vertex indexes of the cycle, starting and ending with the same vertex.
+
+    """
+
+    predecessors = [[] for _ in successors]
+    for vertex, vertex_succs in enumerate(successors):
+        if in_degrees[vertex] > 0:
+            for succ in vertex_succs:
+                predecessors[succ].append(vertex)
+
+    # every remaining vertex has a remaining predecessor, so walking backwards has to run into a cycle
+    vertex = next(vertex for vertex, in_degree in enumerate(in_degrees) if in_degree > 0)
+    visited = OrderedDict()
+    while vertex not in visited:
+        visited[vertex] = None
+        vertex = predecessors[vertex][0]
+
+    path = list(visited)
+    cycle = path[path.index(vertex):] + [vertex]
+    return cycle[::-1]
+
+
+def _strongly_connected_components(successors):
+    """
+    Finds the strongly connected components of a directed graph with an iterative version of Tarjan's algorithm.
+
+    Parameters
+    ----------
+    successors : list of lists
+        Adjacency list, i.e. the i-th entry contains the indexes of all vertices having an incoming edge from vertex i.
+
+    Returns
+    -------
+    list of lists
+        Vertex indexes of each component. The components are given in reverse topological order, i.e. a component
+        comes after all components reachable from it.
+
+    """
+
+    n_vertices = len(successors)
+    indexes = [None] * n_vertices
+    low_links = [0] * n_vertices
+    on_stack = [False] * n_vertices
+    stack = []
+    components = []
+    counter = 0
+    for root in range(n_vertices):
+        if indexes[root] is not None:
+            continue
+        work = [(root, 0)]
+        while work:
+            vertex, succ_idx = work.pop()
+            if succ_idx == 0:
+                indexes[vertex] = low_links[vertex] = counter
+                counter += 1
+                stack.append(vertex)
+                on_stack[vertex] = True
+            vertex_succs = successors[vertex]
+            descend = False
+            while succ_idx < len(vertex_succs):
+                succ = vertex_succs[succ_idx]
+                succ_idx += 1
+                if indexes[succ] is None:
+                    work.append((vertex, succ_idx))
+                    work.append((succ, 0))
+                    descend = True
+                    break
+                elif on_stack[succ]:
+                    low_links[vertex] = min(low_links[vertex], indexes[succ])
+            if descend:
+                continue
+            if low_links[vertex] == indexes[vertex]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == vertex:
+                        break
+                components.append(component)
+            if work:  # propagate the low link to the calling vertex
+                parent = work[-1][0]
+                low_links[parent] = min(low_links[parent], low_links[vertex])
+    return components
+
+
+def _transitive_closure(successors):
+    """
+    Computes the transitive closure of a directed graph. The vertices reachable from one vertex are encoded as bits of
+    an integer (bitset), i.e. bit j of the i-th entry is set, if vertex j can be reached from vertex i.
+
+    Parameters
+    ----------
+    successors : list of lists
+        Adjacency list, i.e. the i-th entry contains the indexes of all vertices having an incoming edge from vertex i.
+
+    Returns
+    -------
+    list of int
+        Bitset of reachable vertices per vertex. A vertex only reaches itself if it is part of a cycle.
+
+    """
+
+    components = _strongly_connected_components(successors)
+    comp_idxs = [0] * len(successors)
+    for comp_idx, component in enumerate(components):
+        for vertex in component:
+            comp_idxs[vertex] = comp_idx
+    comp_reach = [0] * len(components)
+    reach = [0] * len(successors)
+    for comp_idx, component in enumerate(components):
+        bits = 0
+        cyclic = len(component) > 1
+        for vertex in component:
+            for succ in successors[vertex]:
+                succ_comp_idx = comp_idxs[succ]
+                if succ_comp_idx != comp_idx:
+                    bits |= (1 << succ) | comp_reach[succ_comp_idx]
+                else:
+                    cyclic = True
+        if cyclic:  # all members of a cycle reach each other
+            for vertex in component:
+                bits |= 1 << vertex
+        comp_reach[comp_idx] = bits
+        for vertex in component:
+            reach[vertex] = bits
+    return reach
+
+
 class Node:
     """
     A node of a graph, containing information about its edges, an ID, a name and a sub-graph/dictionary.
     """
+
+    # counts the edges added to any node, used to quickly detect that graph indexes might be outdated
+    _edge_changes = 0
+    # counts the edges added to this node, used to detect outdated indexes of the graphs containing the node
+    _edge_version = 0
+
     def __init__(self, id=None, name=None, content=None, edges=None, depth=None):
         """
         Constructor of `graph.Node`.
@@ -74,6 +279,9 @@ class Node:
         self.content = content
         self.edges = edges
         self.depth = depth
+        self.cost = None
+        self.cumulative_cost = None
+        self.slack = None
 
     def __str__(self):
         """
@@ -110,7 +318,7 @@ class Node:
 
         Returns
         -------
-        graph.Graph
+        graph.GraphView
         """
 
         idx = 1
@@ -127,7 +335,8 @@ class Node:
                 elif link is None:
                     relatives.append(edge.nodes[idx_other])
 
-        return Graph.from_list(relatives)
+        # edges with the same name are unique, so only relatives connected via different links can occur twice
+        return GraphView(relatives, unique=link is not None)
 
     def parent(self, link):
         """
@@ -235,6 +444,8 @@ class Node:
 
         if add_egde:
             self.edges.append(edge)
+            self._edge_version += 1
+            Node._edge_changes += 1
 
         return self
 
@@ -298,9 +509,95 @@ class Edge:
                (self.name == other.name)
 
 
+class _ReachabilityIndex:
+    """ Index of all nodes reachable from each node of a graph along edges with a specific name. """
+
+    def __init__(self, graph, link=None, ancestors=True):
+        """
+        Constructor of `graph._ReachabilityIndex`.
+
+        Parameters
+        ----------
+        graph : graph.Graph
+            Graph to index.
+        link : str, optional
+            Link/edge name connecting two nodes. Default is None, which uses all edges.
+        ancestors : bool, optional
+            If true, the ancestors of each node are indexed (default).
+            If false, the descendants of each node are indexed.
+
+        """
+
+        self.nodes = list(graph.nodes)
+        self.node_idxs = {node.id: i for i, node in enumerate(self.nodes)}
+        self._graph = graph
+        self._link = link
+        self._ancestors = ancestors
+        self._relatives = None
+        self._process_id_masks = None
+        self._lineages = dict()
+
+    @property
+    def relatives(self):
+        """ list of int : Bitsets of all nodes reachable from each node, computed on first access. """
+        if self._relatives is None:
+            successors = [[] for _ in self.nodes]
+            for edge in self._graph._unique_edges():
+                if self._link is None or edge.name == self._link:
+                    idx_from = self.node_idxs[edge.nodes[0].id]
+                    idx_to = self.node_idxs[edge.nodes[1].id]
+                    if self._ancestors:
+                        successors[idx_to].append(idx_from)
+                    else:
+                        successors[idx_from].append(idx_to)
+            self._relatives = _transitive_closure(successors)
+
+        return self._relatives
+
+    def has_relative(self, node, other):
+        """ bool : Checks if `other` is reachable from `node`. """
+        return bool(self.relatives[self.node_idxs[node.id]] >> self.node_idxs[other.id] & 1)
+
+    def process_id_mask(self, process_id):
+        """ int : Bitset of all nodes having the given process ID. """
+        if self._process_id_masks is None:
+            self._process_id_masks = dict()
+            for i, node in enumerate(self.nodes):
+                node_process_id = getattr(node, "process_id", None)
+                self._process_id_masks[node_process_id] = self._process_id_masks.get(node_process_id, 0) | (1 << i)
+
+        return self._process_id_masks.get(process_id, 0)
+
+    def lineage(self, node, lineage_func):
+        """
+        Returns the memoized lineage of a node.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Starting node of lineage search.
+        lineage_func : callable
+            Function computing the lineage of a node if it was not memoized yet.
+
+        Returns
+        -------
+        list of graph.Node
+
+        """
+
+        if node.id not in self._lineages:
+            self._lineages[node.id] = lineage_func(node)
+
+        return self._lineages[node.id]
+
+
 class Graph:
     """ Represents an arbitrary graph containing `graph.Node` instances as nodes. """
 
+    # tracer recording the sortings of the graph, set by `translate.translate_process_graph` if the tracer is meant to
+    # be attached to the graph (see `trace.Tracer.attach_to_graph`)
+    tracer = NULL_TRACER
+
     def __init__(self, nodes):
         """
         Constructor for `Graph` class.
@@ -312,6 +609,9 @@ class Graph:
         """
 
         self._nodes = nodes
+        self._indexes = dict()
+        self._index_stamp = None
+        self._index_edge_version = None
 
     @property
     def nodes(self):
@@ -354,6 +654,11 @@ class Graph:
         """ int : number of nodes in the graph. """
         return len(self.nodes)
 
+    @property
+    def n_edges(self):
+        """ int : number of unique edges connecting nodes of the graph. """
+        return sum(1 for _ in self._unique_edges())
+
     def __getitem__(self, item):
         """
         Returns node for a given node ID, index or name.
@@ -373,7 +678,7 @@ class Graph:
             return self._nodes[item]
         else:
             if isinstance(item, int):
-                return list(self.nodes)[item]
+                return self._index("positions", lambda: list(self.nodes))[item]
             else:
                 node = self.get_node_by_name(item)
                 if node is None:
@@ -406,11 +711,163 @@ class Graph:
         graph.Node
         """
 
-        for node in self.nodes:
-            if node.name == name:
-                return node
+        nodes = self._attribute_index("name").get(name)
+        return nodes[0] if nodes else None
+
+    def _attribute_index(self, attribute):
+        """
+        Returns an index linking the values of a node attribute with all nodes having this value.
+
+        Parameters
+        ----------
+        attribute : str
+            Name of the node attribute, e.g. "name", "process_id" or "depth".
+
+        Returns
+        -------
+        dict
+
+        """
+
+        def build_index():
+            index = dict()
+            for node in self.nodes:
+                index.setdefault(getattr(node, attribute, None), []).append(node)
+            return index
+
+        return self._index(("attribute", attribute), build_index)
+
+    def by_name(self, name):
+        """
+        Returns all nodes with the given name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the node.
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        return GraphView(self._attribute_index("name").get(name, []), unique=True)
+
+    def by_process_id(self, process_id):
+        """
+        Returns all nodes with the given process ID, e.g. all "load_collection" nodes.
+
+        Parameters
+        ----------
+        process_id : str
+            Unique OpenEO process name.
+
+        Returns
+        -------
+        graph.Graph
 
-        return None
+        """
+
+        return GraphView(self._attribute_index("process_id").get(process_id, []), unique=True)
+
+    def by_depth(self, depth):
+        """
+        Returns all nodes at the given depth level.
+
+        Parameters
+        ----------
+        depth : int
+            Depth level of the nodes.
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        return GraphView(self._attribute_index("depth").get(depth, []), unique=True)
+
+    def _index(self, key, build_func):
+        """
+        Returns a lazily built index of the graph. All indexes are rebuilt if nodes or edges were added in between.
+        Edges added to nodes of other graphs do not affect the indexes. Changes of node attributes are not detected,
+        so `Graph.invalidate` needs to be called after modifying them.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the index.
+        build_func : callable
+            Function creating the index if it is not available yet.
+
+        Returns
+        -------
+        object
+
+        """
+
+        index_stamp = (len(self._nodes), Node._edge_changes)
+        if index_stamp != self._index_stamp:
+            # edges were added somewhere, so check if the nodes of this graph got new edges
+            edge_version = sum([node._edge_version for node in self.nodes])
+            if self._index_stamp is None or index_stamp[0] != self._index_stamp[0] or \
+                    edge_version != self._index_edge_version:
+                self._indexes = dict()
+            self._index_stamp = index_stamp
+            self._index_edge_version = edge_version
+
+        if key not in self._indexes:
+            self._indexes[key] = build_func()
+
+        return self._indexes[key]
+
+    def invalidate(self):
+        """ Removes all indexes of the graph, e.g., after the nodes of the graph were modified. """
+        self._indexes = dict()
+        self._index_stamp = None
+        self._index_edge_version = None
+
+    def _reachability(self, link=None, ancestors=True):
+        """ graph._ReachabilityIndex : Reachability index for the given link and direction. """
+        return self._index(("reachability", link, ancestors),
+                           lambda: _ReachabilityIndex(self, link=link, ancestors=ancestors))
+
+    @staticmethod
+    def _search_lineage(node, link=None, ancestors=True):
+        """
+        Breadth-first search of all relatives of a node following a specific link.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Starting node of lineage search.
+        link : str, optional
+            Link/edge name connecting two nodes.
+        ancestors : bool, optional
+            If true, search is proceeded for all ancestors (default).
+            If false, search is proceeded for all descendants.
+
+        Returns
+        -------
+        list of graph.Node
+            Relatives of the node (excluding the node itself) in the order they were found.
+
+        """
+
+        lineage_nodes = OrderedDict()
+        current_nodes = [node]
+        while current_nodes:
+            other_nodes = []
+            for node_current in current_nodes:
+                for node_other in node_current.relatives(link=link, ancestor=ancestors).nodes:
+                    if node_other.id not in lineage_nodes and node_other.id != node.id:
+                        lineage_nodes[node_other.id] = node_other
+                        other_nodes.append(node_other)
+
+            current_nodes = other_nodes
+
+        return list(lineage_nodes.values())
 
     def lineage(self, node, link=None, ancestors=True, include_node=True):
         """
@@ -429,23 +886,64 @@ class Graph:
         Returns
         -------
         graph.Graph
+
+        Notes
+        -----
+        The lineage of a node contained in the graph is memoized until the graph is modified.
+
         """
 
-        lineage_nodes = [node] if include_node else []
-        current_nodes = [node]
-        while True:
-            other_nodes = []
-            for node_current in current_nodes:
-                other_nodes.extend(list(node_current.relatives(link=link, ancestor=ancestors).nodes))
+        if node.id in self._nodes:
+            reachability = self._reachability(link=link, ancestors=ancestors)
+            lineage_nodes = reachability.lineage(node, lambda node: self._search_lineage(node, link, ancestors))
+        else:
+            lineage_nodes = self._search_lineage(node, link=link, ancestors=ancestors)
 
-            if not other_nodes:
-                break
-            else:
-                lineage_nodes.extend(other_nodes)
+        lineage_nodes = [node] + lineage_nodes if include_node else lineage_nodes
 
-            current_nodes = other_nodes
+        return GraphView(lineage_nodes, unique=True)
+
+    def is_ancestor(self, node, other, link=None):
+        """
+        Checks if a node is an ancestor of another node, i.e. if there is a path from `node` to `other`.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Potential ancestor node.
+        other : graph.Node
+            Potential descendant node.
+        link : str, optional
+            Link/edge name connecting two nodes.
+
+        Returns
+        -------
+        bool
+
+        """
+
+        return self._reachability(link=link, ancestors=False).has_relative(node, other)
+
+    def is_descendant(self, node, other, link=None):
+        """
+        Checks if a node is a descendant of another node, i.e. if there is a path from `other` to `node`.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Potential descendant node.
+        other : graph.Node
+            Potential ancestor node.
+        link : str, optional
+            Link/edge name connecting two nodes.
+
+        Returns
+        -------
+        bool
+
+        """
 
-        return Graph.from_list(lineage_nodes)
+        return self._reachability(link=link, ancestors=True).has_relative(node, other)
 
     def find_siblings(self, node, link=None, include_node=True):
         """
@@ -478,7 +976,7 @@ class Graph:
         if include_node:
             nodes.append(node)
 
-        return Graph.from_list(nodes)
+        return GraphView(nodes, unique=True)
 
     def find_partners(self, node, link=None, include_node=True):
         """
@@ -511,88 +1009,130 @@ class Graph:
         if include_node:
             nodes.append(node)
 
-        return Graph.from_list(nodes)
+        return GraphView(nodes, unique=True)
 
-    def _linear_sorting(self, use_in_nodes=True):
+    def _unique_edges(self, ignore_edge_names=None):
         """
-        Internal sorting method for ordering the Node IDs in linear manner corresponding to their call order.
-        A callback node (calling/embedding a sub-process graph) is passed at least two times, once for
-        passing the output of itself to the sub-process (`use_in_nodes=True`) and once for passing the output
-        from the sub-process to the next process (`use_in_nodes=False`).
+        Yields each edge connecting two nodes of the graph only once.
 
         Parameters
         ----------
-        use_in_nodes : bool, optional
-            If true, the node is put into the order, when it is passed/called the first time passing output to the sub-process.
-            If false, the node is put into the order, when it is passed/called the second time passing output of
-            the sub-process to the next process.
+        ignore_edge_names : list of str, optional
+            Names of edges, which should be skipped.
+
+        Yields
+        ------
+        graph.Edge
+
+        """
+
+        ignore_edge_names = ignore_edge_names or []
+        edge_keys = set()
+        for node in self.nodes:
+            for edge in node.edges:
+                if edge.name in ignore_edge_names:
+                    continue
+                node_from, node_to = edge.nodes
+                # ignore nodes, which are not contained in the graph
+                if node_from.id not in self._nodes or node_to.id not in self._nodes:
+                    continue
+                edge_key = (node_from.id, node_to.id, edge.name)
+                if edge_key not in edge_keys:
+                    edge_keys.add(edge_key)
+                    yield edge
+
+    def _dependency_vertices(self):
+        """
+        Creates the vertices and the adjacency list of the call order graph. A callback node (calling/embedding a
+        sub-process graph) is split into an "in" vertex, passing the output of itself to the sub-process, and an "out"
+        vertex, passing the output from the sub-process to the next process. All other nodes are represented by one
+        vertex.
 
         Returns
         -------
-        ordered_node_ids_filt : list
-            List of node IDs sorted by their call order.
+        vertices : list of tuples
+            Each vertex is a tuple containing the node and its tag ("in", "out" or None).
+        successors : list of lists
+            Adjacency list, i.e. the i-th entry contains the indexes of all vertices having an incoming edge from
+            vertex i.
 
         """
-        edges = []
+
+        vertices = []
+        in_vertex_idxs = dict()
+        out_vertex_idxs = dict()
         for node in self.nodes:
-            for edge in node.edges:
-                if edge not in edges and edge.name != "callback":
-                    edges.append(edge)
+            if node.uses_callback:
+                in_vertex_idxs[node.id] = len(vertices)
+                vertices.append((node, "in"))
+                out_vertex_idxs[node.id] = len(vertices)
+                vertices.append((node, "out"))
+            else:
+                in_vertex_idxs[node.id] = out_vertex_idxs[node.id] = len(vertices)
+                vertices.append((node, None))
 
-        tuple_edges = []
-        for edge in edges:
-            first_node = edge.nodes[0]
-            sec_node = edge.nodes[1]
+        successors = [[] for _ in vertices]
+        for edge in self._unique_edges(ignore_edge_names=["callback"]):
+            first_node, sec_node = edge.nodes
             if first_node.depth < sec_node.depth:
                 if edge.name == "data":
-                    if sec_node.uses_callback:
-                        tuple_edges.append((first_node.id + "_in", sec_node.id + "_in"))
-                    else:
-                        tuple_edges.append((first_node.id + "_in", sec_node.id))
+                    successors[in_vertex_idxs[first_node.id]].append(in_vertex_idxs[sec_node.id])
             elif first_node.depth > sec_node.depth:
                 if edge.name == "process":
-                    if first_node.uses_callback:
-                        tuple_edges.append((first_node.id + "_out", sec_node.id + "_out"))
-                    else:
-                        tuple_edges.append((first_node.id, sec_node.id + "_out"))
+                    successors[out_vertex_idxs[first_node.id]].append(out_vertex_idxs[sec_node.id])
             else:
                 if edge.name == "process":
-                    if first_node.uses_callback and sec_node.uses_callback:
-                        tuple_edges.append((first_node.id + "_out", sec_node.id + "_in"))
-                    elif not first_node.uses_callback and sec_node.uses_callback:
-                        tuple_edges.append((first_node.id, sec_node.id + "_in"))
-                    elif first_node.uses_callback and not sec_node.uses_callback:
-                        tuple_edges.append((first_node.id + "_out", sec_node.id))
-                    else:
-                        tuple_edges.append((first_node.id, sec_node.id))
+                    successors[out_vertex_idxs[first_node.id]].append(in_vertex_idxs[sec_node.id])
 
-        ig_graph = ig.Graph.TupleList(tuple_edges, directed=True)
-        node_order = ig_graph.topological_sorting()
-        ordered_node_ids = np.array(ig_graph.vs['name'])[node_order]
+        return vertices, successors
 
-        tag_this = "in" if use_in_nodes else "out"
-        tag_other = "out" if use_in_nodes else "in"
-        ordered_node_ids_filt = []
-        for node_id in ordered_node_ids:
-            if node_id.endswith(tag_this):
-                node_id = node_id.rstrip('_' + tag_this)
-                ordered_node_ids_filt.append(node_id)
-            elif node_id.endswith(tag_other):
-                continue
-            else:
-                ordered_node_ids_filt.append(node_id)
+    @staticmethod
+    def _vertex_labels(vertices):
+        """ list of str : Labels of the call order graph vertices, e.g. used for error messages. """
+        return [node.id if tag is None else "{} ({})".format(node.id, tag) for node, tag in vertices]
 
-        return ordered_node_ids_filt
-
-    def sort(self, by='dependency'):
+    def _linear_sorting(self, use_in_nodes=True):
         """
-        Sorts graph according to sorting strategy.
+        Internal sorting method for ordering the Node IDs in linear manner corresponding to their call order.
+        A callback node (calling/embedding a sub-process graph) is passed at least two times, once for
+        passing the output of itself to the sub-process (`use_in_nodes=True`) and once for passing the output
+        from the sub-process to the next process (`use_in_nodes=False`).
 
         Parameters
         ----------
-        by : str
-            Sorting strategy:
-                - 'dependency': Sorts graph by each processing dependency,
+        use_in_nodes : bool, optional
+            If true, the node is put into the order, when it is passed/called the first time passing output to the sub-process.
+            If false, the node is put into the order, when it is passed/called the second time passing output of
+            the sub-process to the next process.
+
+        Returns
+        -------
+        ordered_node_ids_filt : list
+            List of node IDs sorted by their call order.
+
+        """
+
+        vertices, successors = self._dependency_vertices()
+        vertex_order = topological_sort(successors, labels=self._vertex_labels(vertices))
+
+        tag_other = "out" if use_in_nodes else "in"
+        ordered_node_ids_filt = []
+        for vertex_idx in vertex_order:
+            node, tag = vertices[vertex_idx]
+            if tag != tag_other:
+                ordered_node_ids_filt.append(node.id)
+
+        return ordered_node_ids_filt
+
+    def sort(self, by='dependency'):
+        """
+        Sorts graph according to sorting strategy.
+
+        Parameters
+        ----------
+        by : str
+            Sorting strategy:
+                - 'dependency': Sorts graph by each processing dependency,
                                 i.e., nodes being dependent on another node come after this node.
                 - 'result': Sorts the graph also by processing dependency, but this time it puts the node order
                             following the result data flow.
@@ -605,28 +1145,628 @@ class Graph:
 
         """
 
+        with self.tracer.span("sort", by=by) as span:
+            if by == "dependency":
+                # use internal algo for topological sorting
+                ordered_node_ids = self._linear_sorting()
+                nodes_ordered = [self._nodes[ordered_node_id] for ordered_node_id in ordered_node_ids]
+            elif by == "result":
+                # use internal algo for topological sorting
+                ordered_node_ids = self._linear_sorting(use_in_nodes=False)
+                nodes_ordered = [self._nodes[ordered_node_id] for ordered_node_id in ordered_node_ids]
+            elif by == "depth":
+                nodes_ordered = sorted(self.nodes, key=lambda node: node.depth)
+            else:
+                err_msg = "Sorting strategy '{}' unknown ".format(by)
+                raise ValueError(err_msg)
+            span.set(nodes=len(nodes_ordered))
+
+        sorted_graph = Graph.from_list(nodes_ordered)
+        if self.tracer.enabled:
+            sorted_graph.tracer = self.tracer
+
+        return sorted_graph
+
+    def execution_levels(self, by='dependency'):
+        """
+        Groups the nodes into execution levels/waves. All dependencies of a node are contained in previous levels,
+        so the nodes within one level are independent of each other and can be executed in parallel.
+        The levels respect the call order of callback nodes in the same way as `Graph.sort`.
+
+        Parameters
+        ----------
+        by : str
+            Strategy for placing callback nodes:
+                - 'dependency': A callback node is placed at the level where it passes its output to the sub-process.
+                - 'result': A callback node is placed at the level where it passes the output of the sub-process to
+                            the next process.
+
+        Returns
+        -------
+        list of graph.Graph
+            Nodes per execution level, starting with the nodes without any dependencies.
+
+        """
+
         if by == "dependency":
-            # use internal algo and igraph for topological sorting
-            ordered_node_ids = self._linear_sorting()
-            nodes_ordered = [self[ordered_node_id] for ordered_node_id in ordered_node_ids]
+            tag_other = "out"
         elif by == "result":
-            # use internal algo and igraph for topological sorting
-            ordered_node_ids = self._linear_sorting(use_in_nodes=False)
-            nodes_ordered = [self[ordered_node_id] for ordered_node_id in ordered_node_ids]
-        elif by == "depth":
-            depths = [node.depth for node in self.nodes]
-            node_order = np.argsort(depths)
-            nodes_ordered = np.array(list(self.nodes))[node_order].tolist()
+            tag_other = "in"
         else:
-            err_msg = "Sorting strategy '{}' unknown ".format(by)
+            err_msg = "Strategy '{}' unknown ".format(by)
             raise ValueError(err_msg)
 
-        return Graph.from_list(nodes_ordered)
+        vertices, successors = self._dependency_vertices()
+        vertex_order = topological_sort(successors, labels=self._vertex_labels(vertices))
+
+        # longest path layering: each vertex is placed one level after its latest predecessor
+        vertex_levels = [0] * len(vertices)
+        for vertex_idx in vertex_order:
+            for succ_idx in successors[vertex_idx]:
+                vertex_levels[succ_idx] = max(vertex_levels[succ_idx], vertex_levels[vertex_idx] + 1)
+
+        levels = [[] for _ in range(max(vertex_levels) + 1)] if vertices else []
+        for vertex_idx in vertex_order:
+            node, tag = vertices[vertex_idx]
+            if tag != tag_other:
+                levels[vertex_levels[vertex_idx]].append(node)
+
+        return [Graph.from_list(level) for level in levels if level]
+
+    def critical_path_length(self, by='dependency'):
+        """
+        Returns the length of the critical path, i.e. the minimum number of sequential execution steps needed to
+        execute the whole graph.
+
+        Parameters
+        ----------
+        by : str
+            Strategy for placing callback nodes (see `Graph.execution_levels`).
+
+        Returns
+        -------
+        int
+
+        """
+
+        return len(self.execution_levels(by=by))
+
+    def critical_path(self, cost_model=None):
+        """
+        Computes the critical path of the graph, i.e. the chain of dependent nodes with the highest total cost.
+        Each node of the graph is annotated with:
+            - `cost`: Estimated cost of the node itself.
+            - `cumulative_cost`: Earliest finish time of the node, i.e. its cost plus the highest cumulative cost of
+                                 its dependencies.
+            - `slack`: Time the node can be delayed without delaying the whole graph. Nodes on the critical path have
+                       no slack.
+        The cost of a callback node is assigned to the point in time, where it passes the output of the sub-process to
+        the next process.
+
+        Parameters
+        ----------
+        cost_model : cost.CostModel, optional
+            Model estimating the cost of each node. Default is None, which uses `cost.CostModel()`.
+
+        Returns
+        -------
+        graph.Graph
+            Nodes on the critical path in execution order.
+
+        """
+
+        cost_model = CostModel() if cost_model is None else cost_model
+        vertices, successors = self._dependency_vertices()
+        vertex_order = topological_sort(successors, labels=self._vertex_labels(vertices))
+
+        node_costs = {node.id: cost_model.cost(node) for node in self.nodes}
+        vertex_costs = [0. if tag == "in" else node_costs[node.id] for node, tag in vertices]
+
+        # forward pass: earliest finish time and the predecessor determining it
+        finish_times = list(vertex_costs)
+        critical_preds = [None] * len(vertices)
+        for vertex_idx in vertex_order:
+            for succ_idx in successors[vertex_idx]:
+                finish_time = finish_times[vertex_idx] + vertex_costs[succ_idx]
+                if critical_preds[succ_idx] is None or finish_time > finish_times[succ_idx]:
+                    finish_times[succ_idx] = finish_time
+                    critical_preds[succ_idx] = vertex_idx
+
+        # backward pass: latest finish time without delaying the whole graph
+        total_cost = max(finish_times) if vertices else 0.
+        latest_finish_times = [total_cost] * len(vertices)
+        for vertex_idx in reversed(vertex_order):
+            for succ_idx in successors[vertex_idx]:
+                latest_finish_time = latest_finish_times[succ_idx] - vertex_costs[succ_idx]
+                latest_finish_times[vertex_idx] = min(latest_finish_times[vertex_idx], latest_finish_time)
+
+        for node in self.nodes:
+            node.cost = node_costs[node.id]
+            node.slack = None
+        for vertex_idx, (node, tag) in enumerate(vertices):
+            slack = latest_finish_times[vertex_idx] - finish_times[vertex_idx]
+            node.slack = slack if node.slack is None else min(node.slack, slack)
+            if tag != "in":
+                node.cumulative_cost = finish_times[vertex_idx]
+
+        critical_nodes = []
+        vertex_idx = finish_times.index(total_cost) if vertices else None
+        while vertex_idx is not None:
+            critical_nodes.append(vertices[vertex_idx][0])
+            vertex_idx = critical_preds[vertex_idx]
+
+        return Graph.from_list(critical_nodes[::-1])
+
+    def subgraph(self, node_ids):
+        """
+        Creates an independent copy of a part of the graph. The nodes and their content are copied and only edges
+        between the given nodes are kept.
+
+        Parameters
+        ----------
+        node_ids : list of str
+            IDs of the nodes to copy. The order of the nodes in the graph is preserved.
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        node_ids = set(node_ids)
+        nodes_copied = OrderedDict()
+        for node in self.nodes:
+            if node.id in node_ids:
+                node_copied = copy.copy(node)
+                node_copied.content = copy.deepcopy(node.content)
+                node_copied.edges = []
+                nodes_copied[node.id] = node_copied
+
+        edges_copied = dict()
+        for node_id, node_copied in nodes_copied.items():
+            for edge in self._nodes[node_id].edges:
+                if edge.nodes[0].id not in nodes_copied or edge.nodes[1].id not in nodes_copied:
+                    continue
+                if id(edge) not in edges_copied:
+                    edge_nodes = [nodes_copied[edge.nodes[0].id], nodes_copied[edge.nodes[1].id]]
+                    edges_copied[id(edge)] = Edge(id=edge.id, name=edge.name, nodes=edge_nodes, hidden=edge.hidden)
+                node_copied.add_edge(edges_copied[id(edge)])
+
+        return self.__class__(nodes_copied)
+
+    def prune(self, targets=None):
+        """
+        Removes all nodes, which do not contribute to the result node(s) or the given target nodes, i.e. only nodes
+        from which the targets can be reached via "process" or "data" edges are kept together with their embedded
+        process graphs (callbacks).
+
+        Parameters
+        ----------
+        targets : list of graph.Node or str, optional
+            Target nodes or node IDs of the top level process graph. Default is None, which uses the result nodes of
+            the top level process graph. If none of the remaining top level nodes is a result node, the last target
+            node in dependency order is marked as the result node, since a process graph has exactly one result
+            node. Nodes of embedded process graphs (callbacks) cannot be targets, since they cannot become the result
+            of the pruned process graph.
+
+        Returns
+        -------
+        graph.Graph
+            Pruned copy of the graph.
+        list of str
+            IDs of the removed nodes.
+
+        """
+
+        if targets is None:
+            target_nodes = [node for node in self.nodes if getattr(node, "is_result", False) and
+                            node.parent_process is None]
+        else:
+            target_nodes = [self[target] if isinstance(target, str) else self[target.id] for target in targets]
+            for target_node in target_nodes:
+                if getattr(target_node, "parent_process", None) is not None:
+                    err_msg = "Target node '{}' is part of the process graph embedded in '{}'. Only top level " \
+                              "nodes can be targets.".format(target_node.id, target_node.parent_process.id)
+                    raise ValueError(err_msg)
+
+        kept_ids = OrderedDict()
+        current_nodes = target_nodes
+        while current_nodes:
+            other_nodes = []
+            for node in current_nodes:
+                if node.id in kept_ids or node.id not in self._nodes:
+                    continue
+                kept_ids[node.id] = None
+                for link in ("process", "data", "callback"):
+                    other_nodes.extend(node.ancestors(link).nodes)
+            current_nodes = other_nodes
+
+        pruned_graph = self.subgraph(kept_ids.keys())
+        top_nodes = [node for node in pruned_graph.nodes if node.parent_process is None]
+        if targets is not None and target_nodes and not any([node.is_result for node in top_nodes]):
+            target_ids = {target_node.id for target_node in target_nodes}
+            result_id = [node_id for node_id in pruned_graph.sort(by='dependency').ids if node_id in target_ids][-1]
+            pruned_graph[result_id].content['result'] = True
+
+        removed_ids = [node_id for node_id in self.ids if node_id not in kept_ids]
+
+        return pruned_graph, removed_ids
 
-    def update(self):
+    def compute_structural_hashes(self, hashes=None):
+        """
+        Computes a Merkle-style hash for each node, which identifies the computation rooted at this node independently
+        of node names and IDs. The hash of a node covers its process ID, namespace and canonicalised arguments (incl.
+        default values), where 'from_node' references are replaced by the hashes of the referenced nodes and embedded
+        process graphs by the hashes of their result nodes. The hashes are computed in one bottom-up pass over the
+        graph sorted by 'result' (i.e. dependency order, but with callback nodes after their embedded process graphs)
+        and are stored in `node.structural_hash`.
+
+        Parameters
+        ----------
+        hashes : dict, optional
+            Dictionary linking IDs of nodes, which are not contained in the graph, with their structural hash, e.g.
+            of already hashed nodes referenced by the nodes of the graph.
+
+        Returns
+        -------
+        dict
+            Dictionary linking node IDs with their structural hash.
+
+        Notes
+        -----
+        'from_node' references to nodes, which are neither contained in the graph nor in `hashes`, are hashed by
+        the node ID.
+
+        """
+
+        hashes = dict() if hashes is None else dict(hashes)
+
+        def canonicalise(value, callback_ids):
+            if isinstance(value, dict):
+                if "from_node" in value:
+                    node_id = value["from_node"]
+                    link = "process_graph" if node_id in callback_ids else "from_node"
+                    return {link: hashes.get(node_id, node_id)}
+                return {k: canonicalise(v, callback_ids) for k, v in value.items()}
+            elif isinstance(value, list):
+                return [canonicalise(v, callback_ids) for v in value]
+            else:
+                return value
+
+        for node in self.sort(by='result').nodes:
+            callback_ids = set(node.result_processes.ids)
+            node_repr = {"process_id": node.process_id, "namespace": node.namespace,
+                         "arguments": canonicalise(node.arguments, callback_ids)}
+            node.structural_hash = fingerprint(node_repr)
+            hashes[node.id] = node.structural_hash
+
+        return {node_id: hashes[node_id] for node_id in self.ids}
+
+    def to_process_graph(self, use_ids=False):
+        """
+        Converts the graph back to an openEO process graph dictionary. Embedded process graphs are reconstructed from
+        the "callback" edges and the 'from_node' and 'from_parameter' references replaced during the translation are
+        restored.
+
+        Parameters
+        ----------
+        use_ids : bool, optional
+            If true, node IDs are used as node names instead of the original node names (defaults to False).
+            'from_node' references to nodes, which are not contained in the graph, always keep the node ID.
+
+        Returns
+        -------
+        dict
+            openEO process graph wrapped in a 'process_graph' layer.
+
+        """
+
+        def node_name(node_id):
+            if use_ids or node_id not in self._nodes:
+                return node_id
+            return self._nodes[node_id].name
+
+        top_nodes = []
+        children = dict()
+        for node in self.nodes:
+            parent_node = node.parent_process
+            if parent_node is None or parent_node.id not in self._nodes:
+                top_nodes.append(node)
+            else:
+                children.setdefault(parent_node.id, []).append(node)
+
+        def node_to_dict(node):
+            node_dict = copy.deepcopy(node.content)
+            arguments = node_dict['arguments']
+            for keys, parameter_name, _ in node.parameter_refs:
+                set_obj_elem_from_keys(arguments, keys, {"from_parameter": parameter_name})
+
+            # group child processes by the argument they are embedded in
+            callbacks = OrderedDict()
+            for child_node in children.get(node.id, []):
+                callback_keys = tuple(child_node.keys[len(node.keys):-2])
+                callbacks.setdefault(callback_keys, OrderedDict())[node_name(child_node.id)] = \
+                    node_to_dict(child_node)
+
+            for keys in list(iter_key_paths(arguments, break_points=["process_graph"], leaf_key="from_node")):
+                if ("arguments",) + keys[:-1] not in callbacks:
+                    set_obj_elem_from_keys(arguments, keys, node_name(get_obj_elem_from_keys(arguments, keys)))
+
+            callback_extras = {tuple(keys): extras for keys, extras in node.callback_extras}
+            for callback_keys, sub_process_graph in callbacks.items():
+                callback = OrderedDict([("process_graph", sub_process_graph)])
+                callback.update(copy.deepcopy(callback_extras.get(callback_keys, dict())))
+                set_obj_elem_from_keys(node_dict, list(callback_keys), callback)
+
+            return node_dict
+
+        process_graph = OrderedDict()
+        for node in top_nodes:
+            process_graph[node_name(node.id)] = node_to_dict(node)
+
+        return {"process_graph": process_graph}
+
+    def to_arrays(self):
+        """
+        Converts the graph to a compact array representation. Nodes are referenced by their integer index, i.e. their
+        position in the graph, and the edges of each edge type are stored as an adjacency matrix in CSR format, i.e.
+        the targets of all edges starting at node `i` are `indices[indptr[i]:indptr[i + 1]]`.
+
+        Returns
+        -------
+        dict
+            Dictionary with the following keys:
+                - "ids": node IDs (object array).
+                - "names": node names (object array).
+                - "depth": depth level of each node (int array, -1 if not set).
+                - "process_ids": unique process IDs (object array).
+                - "process_codes": index of the process ID of each node in "process_ids" (int array, -1 if not set).
+                - "edges": dictionary linking edge names (e.g. "process", "data", "callback") with a dictionary
+                           containing the CSR arrays "indptr" and "indices".
+
+        """
+
+        nodes = list(self.nodes)
+        node_idxs = {node.id: i for i, node in enumerate(nodes)}
+        n_nodes = len(nodes)
+
+        ids = np.empty(n_nodes, dtype=object)
+        ids[:] = [node.id for node in nodes]
+        names = np.empty(n_nodes, dtype=object)
+        names[:] = [node.name for node in nodes]
+        depth = np.array([-1 if node.depth is None else node.depth for node in nodes], dtype=np.int64)
+
+        process_id_codes = OrderedDict()
+        process_codes = np.full(n_nodes, -1, dtype=np.int32)
+        for i, node in enumerate(nodes):
+            process_id = getattr(node, "process_id", None)
+            if process_id is not None:
+                process_codes[i] = process_id_codes.setdefault(process_id, len(process_id_codes))
+        process_ids = np.empty(len(process_id_codes), dtype=object)
+        process_ids[:] = list(process_id_codes.keys())
+
+        edge_idxs = OrderedDict()
+        for edge in self._unique_edges():
+            edge_idxs.setdefault(edge.name, []).append((node_idxs[edge.nodes[0].id], node_idxs[edge.nodes[1].id]))
+
+        edges = OrderedDict()
+        for edge_name, edge_pairs in edge_idxs.items():
+            edge_pairs = np.array(edge_pairs, dtype=np.int64)
+            order = np.argsort(edge_pairs[:, 0], kind="stable")
+            indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum(np.bincount(edge_pairs[:, 0], minlength=n_nodes))
+            edges[edge_name] = {"indptr": indptr, "indices": edge_pairs[order, 1]}
+
+        return {"ids": ids, "names": names, "depth": depth, "process_ids": process_ids,
+                "process_codes": process_codes, "edges": edges}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Creates a graph from its array representation (see `Graph.to_arrays`). Only the structure of the graph is
+        restored, i.e. the nodes are of type `graph.Node` without any content and their process IDs are stored in the
+        node attribute `process_id`.
+
+        Parameters
+        ----------
+        arrays : dict
+            Array representation of a graph.
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        process_ids = arrays["process_ids"]
+        nodes = []
+        for node_id, name, depth, process_code in zip(arrays["ids"], arrays["names"], arrays["depth"],
+                                                      arrays["process_codes"]):
+            node = Node(id=node_id, name=name, edges=[], depth=None if depth < 0 else int(depth))
+            node.process_id = process_ids[process_code] if process_code >= 0 else None
+            nodes.append(node)
+
+        for edge_name, csr in arrays["edges"].items():
+            indptr, indices = csr["indptr"], csr["indices"]
+            for i, node in enumerate(nodes):
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    create_edge(node, nodes[j], name=edge_name)
+
+        return cls.from_list(nodes)
+
+    def dumps(self):
+        """
+        Serialises the graph to a compact, versioned binary representation. Each edge is only stored once and
+        process definitions are referenced by their namespace, ID and fingerprint (see `utils.fingerprint`).
+
+        Returns
+        -------
+        bytes
+
+        """
+
+        node_idxs = {node_id: i for i, node_id in enumerate(self.ids)}
+        edge_idxs = dict()
+        edges = []
+        nodes = []
+        process_fingerprints = dict()
+        for node in self.nodes:
+            node_state = {attribute: getattr(node, attribute, None) for attribute in SERIALISED_NODE_ATTRIBUTES}
+            process = getattr(node, "process", None)
+            if process is not None:
+                process_fingerprint = process_fingerprints.get(id(process.definition))
+                if process_fingerprint is None:
+                    process_fingerprint = fingerprint(process.definition)
+                    process_fingerprints[id(process.definition)] = process_fingerprint
+                node_state["process"] = [node.namespace, node.process_id, process_fingerprint]
+            else:
+                node_state["process"] = None
+
+            node_edge_idxs = []
+            for edge in node.edges:
+                # ignore nodes, which are not contained in the graph
+                if edge.nodes[0].id not in node_idxs or edge.nodes[1].id not in node_idxs:
+                    continue
+                edge_idx = edge_idxs.get(id(edge))
+                if edge_idx is None:
+                    edge_idx = len(edges)
+                    edge_idxs[id(edge)] = edge_idx
+                    edges.append([edge.id, edge.name, node_idxs[edge.nodes[0].id], node_idxs[edge.nodes[1].id],
+                                  edge.hidden])
+                node_edge_idxs.append(edge_idx)
+            node_state["edges"] = node_edge_idxs
+            nodes.append(node_state)
+
+        payload = json.dumps({"nodes": nodes, "edges": edges}, separators=(',', ':')).encode('utf-8')
+        return SERIALISATION_MAGIC + struct.pack(">H", SERIALISATION_VERSION) + zlib.compress(payload)
+
+    def dump(self, filepath):
+        """
+        Writes the binary representation of the graph (see `Graph.dumps`) to a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the output file.
+
+        """
+
+        with open(filepath, 'wb') as file:
+            file.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data, process_defs=None, check_fingerprints=True):
+        """
+        Restores a graph from its binary representation (see `Graph.dumps`) without translating it again.
+        The process definitions are taken from the given process catalog.
+
+        Parameters
+        ----------
+        data : bytes
+            Binary representation of a graph.
+        process_defs : dict or str or list, optional
+            It can be:
+                - dictionary of loaded process definitions (keys are the process ID's)
+                - directory path to processes (.json)
+                - URL of the remote process endpoint (e.g., "https://earthengine.openeo.org/v1.0/processes")
+                - list of loaded process definitions
+            Default is None, which uses the standard process directory. It is only loaded if the graph contains
+            openEO nodes.
+        check_fingerprints : bool, optional
+            If true, a `ValueError` is raised if a process definition in the catalog differs from the one used when
+            serialising the graph (default).
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        header_length = len(SERIALISATION_MAGIC) + 2
+        if data[:len(SERIALISATION_MAGIC)] != SERIALISATION_MAGIC:
+            err_msg = "Data does not contain a serialised graph."
+            raise ValueError(err_msg)
+        version = struct.unpack(">H", data[len(SERIALISATION_MAGIC):header_length])[0]
+        if version != SERIALISATION_VERSION:
+            err_msg = "Serialisation version {} is not supported (expected {}).".format(version,
+                                                                                      SERIALISATION_VERSION)
+            raise ValueError(err_msg)
+        payload = json.loads(zlib.decompress(data[header_length:]).decode('utf-8'))
+
+        processes = None
+        process_objs = dict()
+        nodes = []
+        for node_state in payload["nodes"]:
+            process_ref = node_state.pop("process")
+            if process_ref is None:
+                node = Node.__new__(Node)
+            else:
+                if processes is None:
+                    if process_defs is None:
+                        process_defs = DEFAULT_PROCESSES_SRC
+                    processes = load_processes(process_defs)
+                namespace, process_id, process_fingerprint = process_ref
+                process = process_objs.get(process_id)
+                if process is None:
+                    if process_id not in processes:
+                        err_msg = "Process '{}' could not be found in the list of processes.".format(process_id)
+                        raise ValueError(err_msg)
+                    process = OpenEOProcess(processes[process_id])
+                    if check_fingerprints and fingerprint(process.definition) != process_fingerprint:
+                        err_msg = "Definition of process '{}' differs from the one used when serialising " \
+                                  "the graph.".format(process_id)
+                        raise ValueError(err_msg)
+                    process_objs[process_id] = process
+                node = OpenEONode.__new__(OpenEONode)
+                node.process = process
+            edge_idxs = node_state.pop("edges")
+            for attribute, value in node_state.items():
+                setattr(node, attribute, value)
+            node.edges = edge_idxs
+            nodes.append(node)
+
+        edges = [Edge(id=edge_id, name=name, nodes=[nodes[idx_from], nodes[idx_to]], hidden=hidden)
+                 for edge_id, name, idx_from, idx_to, hidden in payload["edges"]]
+        for node in nodes:
+            node.edges = [edges[edge_idx] for edge_idx in node.edges]
+            node._edge_version += 1
+        Node._edge_changes += 1
+
+        return cls.from_list(nodes)
+
+    @classmethod
+    def load(cls, filepath, process_defs=None, check_fingerprints=True):
+        """
+        Restores a graph from a file written by `Graph.dump`.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+        process_defs : dict or str or list, optional
+            Process catalog (see `Graph.loads`).
+        check_fingerprints : bool, optional
+            If true, a `ValueError` is raised if a process definition in the catalog differs from the one used when
+            serialising the graph (default).
+
+        Returns
+        -------
+        graph.Graph
+
+        """
+
+        with open(filepath, 'rb') as file:
+            return cls.loads(file.read(), process_defs=process_defs, check_fingerprints=check_fingerprints)
+
+    def update(self, visitor=None):
         """
         Updates all edges and their nodes in a graph.
 
+        Parameters
+        ----------
+        visitor : callable, optional
+            Function called with each node, e.g. checking memory limits (see `trace.MemoryTracer`).
+
         Returns
         -------
         graph.Graph
@@ -634,11 +1774,15 @@ class Graph:
         """
 
         for node in self.nodes:
+            if visitor is not None:
+                visitor(node)
             for edge in node.edges:
                 for i, edge_node in enumerate(edge.nodes):
                     if edge_node.id != node.id:
                         edge_node.add_edge(edge)
 
+        self.invalidate()
+
         return self
 
     def plot(self, layout="kamada_kawai", edge_name=None, margin=100, bbox=(0, 0, 600, 600), node_size=20):
@@ -679,9 +1823,12 @@ class Graph:
             igraph plot.
 
         """
+        import igraph as ig
+
         ig_graph = self.to_igraph(edge_name=edge_name)
         ig_layout = ig_graph.layout(layout)
-        ig_graph.vs["label"] = [self[node_id].name for node_id in ig_graph.vs["name"]]
+        # the vertices of the igraph graph have the same order as the nodes
+        ig_graph.vs["label"] = [node.name for node in self.nodes]
         if "name" in ig_graph.es.attribute_names():
             ig_graph.es["label"] = ig_graph.es["name"]
         ig_graph.vs["label_dist"] = [1.5]
@@ -690,14 +1837,71 @@ class Graph:
         if max_depth is not None:
             n_colours = max_depth + 1
             colours = [list(np.random.random(size=3)) for i in range(n_colours)]
-            ig_graph.vs["color"] = [colours[self[node_id].depth] for node_id in ig_graph.vs["name"]]
+            ig_graph.vs["color"] = [colours[node.depth] for node in self.nodes]
 
         return ig.plot(ig_graph, layout=ig_layout, margin=margin, bbox=bbox, vertex_size=node_size)
 
+    @staticmethod
+    def _export_edge_names(edge_name=None):
+        """
+        Returns the names of the edges to ignore when exporting a graph.
+
+        Parameters
+        ----------
+        edge_name : str, optional
+            Name of the edges to export. This can either be "data" or "process".
+            Default is None, which uses both.
+
+        Returns
+        -------
+        list of str
+
+        """
+
+        available_edge_names = ["process", "data"]
+        ignore_edge_names = ["callback"]
+        if edge_name is not None and edge_name in available_edge_names:
+            available_edge_names.remove(edge_name)
+            ignore_edge_names.extend(available_edge_names)
+
+        return ignore_edge_names
+
+    def _iter_out_edges(self, node, ignore_edge_names=None):
+        """
+        Yields each outgoing edge of a node connecting it with another node of the graph only once.
+
+        Parameters
+        ----------
+        node : graph.Node
+            Start node of the edges.
+        ignore_edge_names : list of str, optional
+            Names of edges, which should be skipped.
+
+        Yields
+        ------
+        graph.Edge
+
+        """
+
+        ignore_edge_names = ignore_edge_names or []
+        edge_keys = set()
+        for edge in node.edges:
+            node_from, node_to = edge.nodes
+            if node_from.id != node.id or edge.name in ignore_edge_names:
+                continue
+            # ignore nodes, which are not contained in the graph
+            if node_to.id not in self._nodes:
+                continue
+            edge_key = (node_to.id, edge.name)
+            if edge_key not in edge_keys:
+                edge_keys.add(edge_key)
+                yield edge
+
     def to_igraph(self, edge_name=None):
         """
         Converts a graph.Graph into an ig.Graph.
-        The ig.Graph object contains nodes with their ID's and edges with their respective names.
+        The ig.Graph object contains all nodes with their ID's in the same order and edges with their respective
+        names.
 
         Parameters
         ----------
@@ -712,34 +1916,208 @@ class Graph:
 
         Notes
         -----
-        The ig.Graph object only contains callback edges originating from a result node.
+        The ig.Graph object does not contain callback edges.
 
         """
-        edges = []
-        available_edge_names = ["process", "data"]
-        ignore_edge_names = ["callback"]
-        if edge_name is not None and edge_name in available_edge_names:
-            available_edge_names.remove(edge_name)
-            ignore_edge_names.extend(available_edge_names)
+        import igraph as ig
+
+        ignore_edge_names = self._export_edge_names(edge_name)
+        node_idxs = {node_id: i for i, node_id in enumerate(self.ids)}
+        edge_idxs = []
+        edge_names = []
         for node in self.nodes:
-            for edge in node.edges:
-                if edge not in edges:
-                    # ignore nodes, which are not contained in the graph
-                    if edge.nodes[0].id not in self.ids or edge.nodes[1].id not in self.ids:
-                        continue
-                    if edge.name in ignore_edge_names:
-                        continue
-                    edges.append(edge)
+            for edge in self._iter_out_edges(node, ignore_edge_names):
+                edge_idxs.append((node_idxs[node.id], node_idxs[edge.nodes[1].id]))
+                edge_names.append(edge.name)
 
-        if edges:
-            tuple_edges = [(edge.nodes[0].id, edge.nodes[1].id) for edge in edges]
-            ig_graph = ig.Graph.TupleList(tuple_edges, directed=True)
-            ig_graph.es["name"] = [edge.name for edge in edges]
-        else:
-            ig_graph = ig.Graph.DictList([{'name': node.id} for node in self.nodes], [])
+        ig_graph = ig.Graph(n=len(node_idxs), edges=edge_idxs, directed=True)
+        ig_graph.vs["name"] = list(node_idxs.keys())
+        if edge_names:
+            ig_graph.es["name"] = edge_names
 
         return ig_graph
 
+    def iter_edge_list(self, edge_name=None):
+        """
+        Yields all edges of the graph as (source ID, target ID, attributes) tuples, which can be directly passed to
+        `networkx.DiGraph.add_edges_from`.
+
+        Parameters
+        ----------
+        edge_name : str, optional
+            Name of the edges to export. This can either be "data" or "process".
+            Default is None, which uses both.
+
+        Yields
+        ------
+        tuple
+
+        """
+
+        ignore_edge_names = self._export_edge_names(edge_name)
+        for node in self.nodes:
+            for edge in self._iter_out_edges(node, ignore_edge_names):
+                yield node.id, edge.nodes[1].id, {"name": edge.name}
+
+    def iter_adjacency(self, edge_name=None):
+        """
+        Yields the IDs of all successors of each node, i.e. `dict(graph.iter_adjacency())` returns a dict-of-lists
+        adjacency representation of the graph.
+
+        Parameters
+        ----------
+        edge_name : str, optional
+            Name of the edges to export. This can either be "data" or "process".
+            Default is None, which uses both.
+
+        Yields
+        ------
+        node_id : str
+            ID of the node.
+        successor_ids : list of str
+            IDs of all successors of the node.
+
+        """
+
+        ignore_edge_names = self._export_edge_names(edge_name)
+        for node in self.nodes:
+            successor_ids = OrderedDict()
+            for edge in self._iter_out_edges(node, ignore_edge_names):
+                successor_ids[edge.nodes[1].id] = None
+            yield node.id, list(successor_ids.keys())
+
+    def iter_dot(self, edge_name=None):
+        """
+        Yields the lines of a DOT (Graphviz) representation of the graph. Node names are used as labels.
+
+        Parameters
+        ----------
+        edge_name : str, optional
+            Name of the edges to export. This can either be "data" or "process".
+            Default is None, which uses both.
+
+        Yields
+        ------
+        str
+
+        """
+
+        def quote(value):
+            return '"{}"'.format(str(value).replace('\\', '\\\\').replace('"', '\\"'))
+
+        ignore_edge_names = self._export_edge_names(edge_name)
+        yield "digraph {"
+        for node in self.nodes:
+            yield "  {} [label={}];".format(quote(node.id), quote(node.name))
+        for node in self.nodes:
+            for edge in self._iter_out_edges(node, ignore_edge_names):
+                yield "  {} -> {} [label={}];".format(quote(node.id), quote(edge.nodes[1].id), quote(edge.name))
+        yield "}"
+
+    def write_dot(self, filepath, edge_name=None):
+        """
+        Writes the DOT (Graphviz) representation of the graph line by line to a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the output file.
+        edge_name : str, optional
+            Name of the edges to export. This can either be "data" or "process".
+            Default is None, which uses both.
+
+        """
+
+        with open(filepath, 'w') as file:
+            for line in self.iter_dot(edge_name=edge_name):
+                file.write(line + "\n")
+
+
+class GraphView(Graph):
+    """
+    Lazy, read-only view on a sequence of nodes, e.g. the relatives of a node. It offers the same interface as
+    `Graph`, but the node dictionary is only created if it is needed, i.e. iterating over the nodes, counting them
+    or accessing a node by its ID or index works directly on the node sequence.
+    """
+
+    def __init__(self, nodes, unique=False):
+        """
+        Constructor for `GraphView` class.
+
+        Parameters
+        ----------
+        nodes : list of graph.Node or collections.OrderedDict
+            Sequence of nodes or a dictionary containing node ID's as keys and `graph.Node` objects as values.
+        unique : bool, optional
+            True if each node ID occurs only once in the sequence of nodes (defaults to False).
+            Otherwise, the node dictionary is created when accessing the nodes.
+
+        """
+
+        if isinstance(nodes, dict):
+            self._node_dict = nodes
+            self._node_seq = None
+        else:
+            self._node_dict = None
+            self._node_seq = tuple(nodes)
+        self._unique = unique
+        self._indexes = dict()
+        self._index_stamp = None
+        self._index_edge_version = None
+
+    @property
+    def _is_lazy(self):
+        """ bool : True if the node sequence can be used without creating the node dictionary. """
+        return self._node_dict is None and self._unique
+
+    @property
+    def _nodes(self):
+        """ collections.OrderedDict : Dictionary containing all nodes, created on first access. """
+        if self._node_dict is None:
+            nodes = OrderedDict()
+            for node in self._node_seq:
+                nodes[node.id] = node
+            self._node_dict = nodes
+
+        return self._node_dict
+
+    @property
+    def nodes(self):
+        """ tuple or view : Returns all nodes in the graph. """
+        return self._node_seq if self._is_lazy else self._nodes.values()
+
+    @property
+    def ids(self):
+        """ list or view : Node ID's. """
+        return [node.id for node in self._node_seq] if self._is_lazy else self._nodes.keys()
+
+    def __getitem__(self, item):
+        """
+        Returns node for a given node ID, index or name.
+        If an indexing by name yields multiple results, only the first matching node is returned.
+
+        Parameters
+        ----------
+        item : str or int
+            Node ID or node name.
+
+        Returns
+        -------
+        graph.Node
+        """
+
+        if self._is_lazy:
+            for node in self._node_seq:
+                if node.id == item:
+                    return node
+            if isinstance(item, int):
+                return self._node_seq[item]
+            for node in self._node_seq:
+                if node.name == item:
+                    return node
+
+        return super().__getitem__(item)
+
 
 class OpenEONode(Node):
     """
@@ -748,6 +2126,11 @@ class OpenEONode(Node):
 
     """
 
+    # cached structural hash, see `OpenEONode.structural_hash`
+    _structural_hash = None
+    # compiled key paths per location in the content, see `OpenEONode.key_path`
+    _key_paths = None
+
     def __init__(self, id=None, name=None, content=None, edges=None, depth=None, processes_src=None,
                  keys=None):
         """
@@ -780,6 +2163,69 @@ class OpenEONode(Node):
 
         self.process = OpenEOProcess.from_name(self.process_id, src=processes_src)
         self.keys = keys
+        # original references replaced during the translation, see `Graph.to_process_graph`, i.e. the keys pointing
+        # to the reference, the parameter name and if it was resolved by the globally defined parameters
+        self.parameter_refs = []
+        self.callback_extras = []
+
+    def key_path(self, keys):
+        """
+        Returns the compiled key path pointing to a location in the content of the node. The key paths are cached per
+        node and location and cache the container holding the location, so all translation steps and later
+        operations accessing the same location only resolve its keys once.
+
+        Parameters
+        ----------
+        keys : list or tuple
+            Keys pointing from the content of the node to the location, e.g. starting with 'arguments'.
+
+        Returns
+        -------
+        utils.KeyPath
+
+        """
+
+        keys = tuple(keys)
+        if self._key_paths is None:
+            self._key_paths = dict()
+        key_path = self._key_paths.get(keys)
+        if key_path is None:
+            key_path = KeyPath(keys, cache_parent=True)
+            self._key_paths[keys] = key_path
+
+        return key_path
+
+    @property
+    def structural_hash(self):
+        """
+        str : Merkle-style hash identifying the computation rooted at this node (see
+        `Graph.compute_structural_hashes`). It is computed on first access together with the hashes of all nodes it
+        depends on, which have not been hashed yet.
+        """
+
+        if self._structural_hash is None:
+            nodes = OrderedDict()
+            hashes = dict()
+            current_nodes = [self]
+            while current_nodes:
+                other_nodes = []
+                for node in current_nodes:
+                    if node.id in nodes or node.id in hashes:
+                        continue
+                    if node is not self and node._structural_hash is not None:
+                        hashes[node.id] = node._structural_hash
+                        continue
+                    nodes[node.id] = node
+                    other_nodes.extend(node.ancestors("process").nodes)
+                    other_nodes.extend(node.child_processes.nodes)
+                current_nodes = other_nodes
+            Graph(nodes).compute_structural_hashes(hashes=hashes)
+
+        return self._structural_hash
+
+    @structural_hash.setter
+    def structural_hash(self, structural_hash):
+        self._structural_hash = structural_hash
 
     @property
     def process_id(self):
@@ -883,8 +2329,8 @@ class OpenEONode(Node):
 
         """
 
-        result_processes = [node for node in self.child_processes if node.is_result]
-        return Graph.from_list(result_processes)
+        result_processes = [node for node in self.child_processes.nodes if node.is_result]
+        return GraphView(result_processes, unique=True)
 
     @property
     def input_data_processes(self):
@@ -913,8 +2359,15 @@ class OpenEONode(Node):
             True if the process was found, false if not.
 
         """
-        descendant_pids = [node.process_id for node in graph.lineage(self, link='process', ancestors=False)]
-        return process_id in descendant_pids
+        if self.process_id == process_id:
+            return True
+        elif self.id not in graph.ids:
+            descendant_pids = [node.process_id for node in graph.lineage(self, link='process', ancestors=False)]
+            return process_id in descendant_pids
+
+        reachability = graph._reachability(link='process', ancestors=False)
+        descendants = reachability.relatives[reachability.node_idxs[self.id]]
+        return bool(descendants & reachability.process_id_mask(process_id))
 
     @property
     def description(self):
@@ -0,0 +1,247 @@
+import time
+import threading
+import contextlib
+import contextvars
+from collections import OrderedDict
+
+# names, types and descriptions of all metrics
+METRICS = OrderedDict([
+    ("openeo_pg_parser_loader_calls_total",
+     ("counter", "Calls of the catalog loaders loading a catalog by loader and source type.")),
+    ("openeo_pg_parser_catalog_reuses_total",
+     ("counter", "Calls of the catalog loaders with an already loaded catalog, which is passed through.")),
+    ("openeo_pg_parser_loader_seconds_total",
+     ("counter", "Wall time spent in the catalog loaders.")),
+    ("openeo_pg_parser_loader_cpu_seconds_total",
+     ("counter", "CPU time of the process spent in the catalog loaders.")),
+    ("openeo_pg_parser_http_requests_total",
+     ("counter", "HTTP requests sent by the catalog loaders by loader and status code.")),
+    ("openeo_pg_parser_http_response_bytes_total",
+     ("counter", "Bytes of the HTTP response bodies received by the catalog loaders.")),
+    ("openeo_pg_parser_http_wait_seconds_total",
+     ("counter", "Wall time spent waiting for HTTP responses.")),
+    ("openeo_pg_parser_cache_requests_total",
+     ("counter", "Cache lookups by cache and result (hit or miss).")),
+])
+
+
+class MetricsRegistry:
+    """
+    Collection of counters, each identified by a metric name (see `METRICS`) and its labels. The counters can be
+    exported in the Prometheus text exposition format. Incrementing a counter is thread-safe.
+    """
+
+    def __init__(self):
+        """ Constructor of `MetricsRegistry`. """
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """
+        Increments a counter.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+        value : int or float, optional
+            Increment (defaults to 1).
+        **labels
+            Labels of the counter.
+
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, name, **labels):
+        """
+        Returns the value of a counter or, if only some of its labels are given, the sum of all matching counters.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric.
+        **labels
+            Labels of the counter.
+
+        Returns
+        -------
+        int or float
+
+        """
+        labels = set(labels.items())
+        with self._lock:
+            values = list(self._values.items())
+        return sum([value for (value_name, value_labels), value in values
+                    if value_name == name and labels.issubset(value_labels)])
+
+    def to_dict(self):
+        """
+        Returns all counters.
+
+        Returns
+        -------
+        dict
+            Dictionary linking metric names with lists of (labels, value) tuples.
+
+        """
+        metrics = OrderedDict()
+        with self._lock:
+            values = list(self._values.items())
+        for (name, labels), value in values:
+            metrics.setdefault(name, []).append((dict(labels), value))
+        return metrics
+
+    def to_prometheus(self):
+        """
+        Exports all counters in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+
+        """
+        lines = []
+        metrics = self.to_dict()
+        for name in sorted(metrics.keys()):
+            metric_type, description = METRICS.get(name, ("untyped", ""))
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            for labels, value in metrics[name]:
+                labels_str = ",".join(['{}="{}"'.format(label, _escape_label_value(label_value))
+                                       for label, label_value in labels.items()])
+                lines.append("{}{} {}".format(name, "{" + labels_str + "}" if labels_str else "", value))
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def reset(self):
+        """ Removes all counters. """
+        with self._lock:
+            self._values.clear()
+
+
+def _escape_label_value(value):
+    """ str : Escapes a label value for the Prometheus text exposition format. """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# process wide registry
+REGISTRY = MetricsRegistry()
+# registries of the currently active scopes (see `scope`)
+_SCOPES = contextvars.ContextVar("openeo_pg_parser_metrics_scopes", default=())
+
+
+def inc(name, value=1, **labels):
+    """
+    Increments a counter of the process wide registry and of all active scopes (see `MetricsRegistry.inc`).
+
+    Parameters
+    ----------
+    name : str
+        Name of the metric.
+    value : int or float, optional
+        Increment (defaults to 1).
+    **labels
+        Labels of the counter.
+
+    """
+    REGISTRY.inc(name, value, **labels)
+    for registry in _SCOPES.get():
+        registry.inc(name, value, **labels)
+
+
+@contextlib.contextmanager
+def scope():
+    """
+    Context manager collecting the metrics recorded within its context, e.g. for a single request, in a separate
+    registry. The metrics are still recorded in the process wide registry `REGISTRY` as well. Scopes can be nested and
+    are specific to the current thread or asynchronous task.
+
+    Yields
+    ------
+    MetricsRegistry
+
+    """
+    registry = MetricsRegistry()
+    token = _SCOPES.set(_SCOPES.get() + (registry,))
+    try:
+        yield registry
+    finally:
+        _SCOPES.reset(token)
+
+
+@contextlib.contextmanager
+def measure_loader(loader, source):
+    """
+    Context manager counting a call of a catalog loader and measuring its wall and CPU time.
+
+    Parameters
+    ----------
+    loader : str
+        Name of the loader, e.g. "load_processes".
+    source : str
+        Type of the source, e.g. "url" or "directory".
+
+    """
+    inc("openeo_pg_parser_loader_calls_total", loader=loader, source=source)
+    start_time = time.perf_counter()
+    start_cpu_time = time.process_time()
+    try:
+        yield
+    finally:
+        inc("openeo_pg_parser_loader_seconds_total", time.perf_counter() - start_time, loader=loader)
+        inc("openeo_pg_parser_loader_cpu_seconds_total", time.process_time() - start_cpu_time, loader=loader)
+
+
+def record_http_request(loader, status_code, n_bytes, wait_time):
+    """
+    Records an HTTP request of a catalog loader.
+
+    Parameters
+    ----------
+    loader : str
+        Name of the loader, e.g. "load_processes".
+    status_code : int or str
+        HTTP status code of the response or "error" if no response was received.
+    n_bytes : int
+        Size of the response body in bytes.
+    wait_time : float
+        Wall time in seconds spent waiting for the response.
+
+    """
+    inc("openeo_pg_parser_http_requests_total", loader=loader, status=str(status_code))
+    inc("openeo_pg_parser_http_response_bytes_total", n_bytes, loader=loader)
+    inc("openeo_pg_parser_http_wait_seconds_total", wait_time, loader=loader)
+
+
+def record_catalog_reuse(loader):
+    """
+    Records a call of a catalog loader with an already loaded catalog, which is passed through without loading it.
+
+    Parameters
+    ----------
+    loader : str
+        Name of the loader, e.g. "load_processes".
+
+    """
+    inc("openeo_pg_parser_catalog_reuses_total", loader=loader)
+
+
+def record_cache_lookup(cache, hit):
+    """
+    Records a cache lookup.
+
+    Parameters
+    ----------
+    cache : str
+        Name of the cache.
+    hit : bool
+        True if the value was cached.
+
+    """
+    inc("openeo_pg_parser_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from openeo_pg_parser.cost import CostModel
+
+
+def _replace_from_nodes(value, node_ids):
+    """
+    Replaces 'from_node' references to the given node IDs with 'from_parameter' references named by the node ID.
+
+    Parameters
+    ----------
+    value : object
+        Argument value.
+    node_ids : set
+        Node IDs, which are not available anymore.
+
+    Returns
+    -------
+    object
+
+    """
+
+    if isinstance(value, dict):
+        if value.get("from_node") in node_ids:
+            return {"from_parameter": value["from_node"]}
+        return {k: _replace_from_nodes(v, node_ids) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_replace_from_nodes(v, node_ids) for v in value]
+    else:
+        return value
+
+
+def partition_graph(process_graph, n_partitions, cost_model=None, imbalance=0.1, max_iterations=10):
+    """
+    Splits a translated process graph into balanced partitions, e.g. for distributing them across several workers.
+    A partition unit is a node of the top level process graph together with all its embedded process graphs
+    (callbacks), which are never split. The units are first assigned to partitions in dependency order, which is
+    afterwards refined by moving units between neighbouring partitions if this reduces the weight of the data edges
+    crossing partitions. All data flows from lower to higher partition indexes, so the partitions can be executed
+    one after the other.
+
+    Parameters
+    ----------
+    process_graph : graph.Graph
+        Translated openEO process graph.
+    n_partitions : int
+        Number of partitions. It is limited to the number of top level nodes.
+    cost_model : cost.CostModel, optional
+        Model estimating the cost of each node. The weight of a unit is the sum of the costs of its nodes and the
+        weight of a data edge is the weight of its source unit. By default, each node has a weight of 1 and each
+        data edge a weight of 1.
+    imbalance : float, optional
+        Allowed relative excess of a partition weight over the mean partition weight during refinement
+        (defaults to 0.1).
+    max_iterations : int, optional
+        Maximum number of refinement passes (defaults to 10).
+
+    Returns
+    -------
+    process_graphs : list of dict
+        Standalone openEO process graph per partition. Data received from other partitions is referenced with
+        'from_parameter' and declared in the 'parameters' of the process graph. Parameters of the original process
+        graph are declared as well, with the values used during the translation as default values.
+    manifest : dict
+        Dictionary containing the partition index of each node ("assignment") and a list of all data transfers
+        between partitions ("transfers"), each with the keys "node_id", "from_partition", "to_partition" and
+        "parameter".
+
+    """
+
+    if n_partitions < 1:
+        err_msg = "At least one partition is needed ({} given).".format(n_partitions)
+        raise ValueError(err_msg)
+
+    top_nodes = [node for node in process_graph.sort(by='dependency').nodes if node.parent_process is None]
+    children = dict()
+    for node in process_graph.nodes:
+        parent_node = node.parent_process
+        if parent_node is not None:
+            children.setdefault(parent_node.id, []).append(node)
+
+    def unit_nodes(node):
+        nodes = [node]
+        for child_node in children.get(node.id, []):
+            nodes.extend(unit_nodes(child_node))
+        return nodes
+
+    unit_cost_model = cost_model if cost_model is not None else CostModel(default_cost=1., use_defaults=False)
+    weights = {node.id: sum([unit_cost_model.cost(unit_node) for unit_node in unit_nodes(node)])
+               for node in top_nodes}
+    top_node_ids = set(weights.keys())
+    preds = {node.id: [pred.id for pred in node.input_data_processes.nodes if pred.id in top_node_ids]
+             for node in top_nodes}
+    succs = {node.id: [] for node in top_nodes}
+    for node_id, pred_ids in preds.items():
+        for pred_id in pred_ids:
+            succs[pred_id].append(node_id)
+    edge_weight = (lambda node_id: weights[node_id]) if cost_model is not None else (lambda node_id: 1.)
+
+    # initial assignment: split the units in dependency order into chunks with similar weights
+    n_partitions = max(min(n_partitions, len(top_nodes)), 1)
+    total_weight = sum(weights.values())
+    mean_weight = total_weight / n_partitions if total_weight > 0 else 1.
+    assignment = dict()
+    cum_weight = 0.
+    prev_partition_idx = -1
+    for i, node in enumerate(top_nodes):
+        partition_idx = int((cum_weight + weights[node.id] / 2.) / mean_weight)
+        # do not skip a partition and leave enough units for the remaining partitions
+        partition_idx = min(partition_idx, prev_partition_idx + 1, n_partitions - 1)
+        partition_idx = max(partition_idx, prev_partition_idx, n_partitions - (len(top_nodes) - i), 0)
+        assignment[node.id] = partition_idx
+        prev_partition_idx = partition_idx
+        cum_weight += weights[node.id]
+
+    partition_weights = [0.] * n_partitions
+    partition_sizes = [0] * n_partitions
+    for node_id, partition_idx in assignment.items():
+        partition_weights[partition_idx] += weights[node_id]
+        partition_sizes[partition_idx] += 1
+
+    # refinement: move units to neighbouring partitions if this reduces the cut
+    max_weight = mean_weight * (1. + imbalance)
+    for _ in range(max_iterations):
+        moved = False
+        for node in top_nodes:
+            node_id = node.id
+            partition_idx = assignment[node_id]
+            if partition_sizes[partition_idx] == 1:
+                continue
+            for other_idx in (partition_idx - 1, partition_idx + 1):
+                if not 0 <= other_idx < n_partitions:
+                    continue
+                if partition_weights[other_idx] + weights[node_id] > max_weight:
+                    continue
+                if any([assignment[pred_id] > other_idx for pred_id in preds[node_id]]) or \
+                        any([assignment[succ_id] < other_idx for succ_id in succs[node_id]]):
+                    continue
+                gain = 0.
+                for pred_id in preds[node_id]:
+                    gain += edge_weight(pred_id) * ((assignment[pred_id] == other_idx) -
+                                                    (assignment[pred_id] == partition_idx))
+                for succ_id in succs[node_id]:
+                    gain += edge_weight(node_id) * ((assignment[succ_id] == other_idx) -
+                                                    (assignment[succ_id] == partition_idx))
+                if gain > 0:
+                    assignment[node_id] = other_idx
+                    partition_weights[partition_idx] -= weights[node_id]
+                    partition_weights[other_idx] += weights[node_id]
+                    partition_sizes[partition_idx] -= 1
+                    partition_sizes[other_idx] += 1
+                    moved = True
+                    break
+        if not moved:
+            break
+
+    # create a standalone process graph for each partition
+    node_dicts = process_graph.to_process_graph(use_ids=True)["process_graph"]
+    transfers = []
+    process_graphs = []
+    for partition_idx in range(n_partitions):
+        partition_nodes = [node for node in top_nodes if assignment[node.id] == partition_idx]
+        input_node_ids = []
+        for node in partition_nodes:
+            for pred_id in preds[node.id]:
+                if assignment[pred_id] != partition_idx and pred_id not in input_node_ids:
+                    input_node_ids.append(pred_id)
+                    transfers.append({"node_id": pred_id, "from_partition": assignment[pred_id],
+                                      "to_partition": partition_idx, "parameter": pred_id})
+
+        result_node_ids = [node.id for node in partition_nodes if node.is_result]
+        result_node_id = result_node_ids[0] if result_node_ids else partition_nodes[-1].id
+        sub_process_graph = OrderedDict()
+        parameters = [{"name": node_id, "description": "Output of node '{}'.".format(node_id), "schema": {}}
+                      for node_id in input_node_ids]
+        parameter_names = set(input_node_ids)
+        for node in partition_nodes:
+            node_dict = node_dicts[node.id]
+            node_dict["arguments"] = _replace_from_nodes(node_dict["arguments"], set(input_node_ids))
+            node_dict.pop("result", None)
+            if node.id == result_node_id:
+                node_dict["result"] = True
+            sub_process_graph[node.id] = node_dict
+
+            # declare parameters of the original process graph with the values used during the translation, also
+            # if they are referenced in embedded process graphs, apart from the parameters of these process graphs
+            for unit_node in unit_nodes(node):
+                for keys, parameter_name, is_global in unit_node.parameter_refs:
+                    if not is_global or parameter_name in parameter_names:
+                        continue
+                    parameter_names.add(parameter_name)
+                    parameter = {"name": parameter_name, "description": "Parameter of the original process graph.",
+                                 "schema": {}}
+                    value = unit_node.key_path(["arguments"] + list(keys)).get(unit_node.content)
+                    if not (isinstance(value, dict) and "from_parameter" in value):
+                        parameter["default"] = value
+                    parameters.append(parameter)
+
+        process_graphs.append({"process_graph": sub_process_graph, "parameters": parameters})
+
+    node_assignment = dict()
+    for node in top_nodes:
+        for unit_node in unit_nodes(node):
+            node_assignment[unit_node.id] = assignment[node.id]
+    manifest = {"assignment": node_assignment, "transfers": transfers}
+
+    return process_graphs, manifest
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,526 @@
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+
+class Span:
+    """ Timed phase of the parsing, e.g. the traversal of the process graph. """
+
+    __slots__ = ("name", "span_id", "parent_span_id", "attributes", "start_time", "end_time", "wall_time",
+                 "_start_counter")
+
+    def __init__(self, name, span_id, parent_span_id=None, attributes=None):
+        """
+        Constructor of `Span`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase.
+        span_id : str
+            Hexadecimal ID of the span.
+        parent_span_id : str, optional
+            Hexadecimal ID of the enclosing span.
+        attributes : dict, optional
+            Attributes of the span, e.g. the number of nodes and edges.
+
+        """
+        self.name = name
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.attributes = attributes or dict()
+        self.start_time = None
+        self.end_time = None
+        self.wall_time = None
+        self._start_counter = None
+
+    def set(self, **attributes):
+        """ Sets attributes of the span. """
+        self.attributes.update(attributes)
+
+    def start(self):
+        """ Starts measuring the wall time. """
+        self.start_time = time.time_ns()
+        self._start_counter = time.perf_counter()
+
+    def stop(self):
+        """ Stops measuring the wall time. """
+        self.wall_time = time.perf_counter() - self._start_counter
+        self.end_time = time.time_ns()
+
+    def to_dict(self, trace_id=None):
+        """
+        Converts the span to a dictionary with the keys used by OpenTelemetry (OTLP/JSON).
+
+        Parameters
+        ----------
+        trace_id : str, optional
+            Hexadecimal ID of the trace the span belongs to.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {"trace_id": trace_id, "span_id": self.span_id, "parent_span_id": self.parent_span_id,
+                "name": self.name, "start_time_unix_nano": self.start_time, "end_time_unix_nano": self.end_time,
+                "attributes": dict(self.attributes)}
+
+
+class _NullSpan:
+    """ Span of a disabled tracer, which does not measure anything. """
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class _SpanContext:
+    """ Context manager starting and stopping a span of a tracer. """
+
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self):
+        self.tracer._enter(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tracer._exit(self.span, exc_type)
+        return False
+
+
+class NullTracer:
+    """
+    Tracer, which does not record anything. It is used if no tracer is given, so instrumented code only pays for a
+    method call per phase.
+    """
+
+    enabled = False
+    visitor = None
+    attach_to_graph = False
+    _null_span = _NullSpan()
+
+    def span(self, name, **attributes):
+        """ Returns a span context manager doing nothing (see `Tracer.span`). """
+        return self._null_span
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """
+    Records the wall time, the number of calls and attributes like the number of nodes and edges of each phase of
+    parsing a process graph, e.g. loading the process catalog, traversing the process graph or sorting the graph.
+    The phases are recorded as nested spans, which can be exported as a dictionary with statistics per phase or as
+    OpenTelemetry-style spans. A tracer is not thread-safe.
+    """
+
+    enabled = True
+    # function called with each node while traversing the process graph and linking the nodes (see
+    # `translate.walk_process_graph` and `translate.link_nodes`)
+    visitor = None
+    # if true, the tracer is attached to the translated graph and records its later sortings (see `graph.Graph.sort`)
+    attach_to_graph = True
+
+    def __init__(self, trace_id=None, parent_span_id=None):
+        """
+        Constructor of `Tracer`.
+
+        Parameters
+        ----------
+        trace_id : str, optional
+            Hexadecimal ID (32 characters) of the trace the spans belong to, e.g. of a request trace. By default, a
+            random ID is created.
+        parent_span_id : str, optional
+            Hexadecimal ID of the span enclosing all top level spans of this tracer, e.g. of a request span.
+
+        """
+        self.trace_id = trace_id if trace_id is not None else os.urandom(16).hex()
+        self.parent_span_id = parent_span_id
+        self.spans = []
+        self._stats = OrderedDict()
+        self._stack = []
+
+    def span(self, name, **attributes):
+        """
+        Creates a context manager measuring a phase. Spans opened within the context are nested into this span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase.
+        **attributes
+            Attributes of the span. Further attributes can be set with `Span.set`.
+
+        Returns
+        -------
+        context manager
+            It returns the `Span` when entering the context.
+
+        """
+        parent_span_id = self._stack[-1].span_id if self._stack else self.parent_span_id
+        span = Span(name, os.urandom(8).hex(), parent_span_id=parent_span_id, attributes=attributes)
+        return _SpanContext(self, span)
+
+    def _enter(self, span):
+        """ Opens a span. """
+        self._stack.append(span)
+        span.start()
+
+    def _exit(self, span, exc_type=None):
+        """ Closes a span and records it. """
+        span.stop()
+        if exc_type is not None:
+            span.set(error=exc_type.__name__)
+        self._stack.pop()
+        self._record(span)
+
+    def _record(self, span):
+        """ Adds a finished span to the recorded spans and to the statistics of its phase. """
+        self.spans.append(span)
+        stats = self._stats.get(span.name)
+        if stats is None:
+            stats = {"calls": 0, "wall_time": 0.}
+            self._stats[span.name] = stats
+        stats["calls"] += 1
+        stats["wall_time"] += span.wall_time
+        for key, value in span.attributes.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                stats[key] = stats.get(key, 0) + value
+
+    def to_dict(self):
+        """
+        Returns statistics per phase.
+
+        Returns
+        -------
+        dict
+            Dictionary linking phase names with the number of calls ("calls"), the total wall time in seconds
+            ("wall_time") and the sum of each numeric span attribute, e.g. "nodes" and "edges". The phases are
+            ordered by the end of their first call.
+
+        """
+        return OrderedDict([(name, dict(stats)) for name, stats in self._stats.items()])
+
+    def to_spans(self):
+        """
+        Returns the recorded spans as OpenTelemetry-style dictionaries (see `Span.to_dict`), ordered by their end
+        time.
+
+        Returns
+        -------
+        list of dict
+
+        """
+        return [span.to_dict(trace_id=self.trace_id) for span in self.spans]
+
+    def reset(self):
+        """ Removes all recorded spans and statistics. """
+        self.spans = []
+        self._stats = OrderedDict()
+
+
+class MemoryLimitExceeded(MemoryError):
+    """ Raised if a memory limit of a `MemoryTracer` is exceeded. """
+
+    def __init__(self, phase, limit, size, msg):
+        """
+        Constructor of `MemoryLimitExceeded`.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase, in which the limit was exceeded.
+        limit : int
+            Memory limit in bytes.
+        size : int
+            Memory in bytes exceeding the limit.
+        msg : str
+            Error message.
+
+        """
+        super().__init__(msg)
+        self.phase = phase
+        self.limit = limit
+        self.size = size
+
+
+class MemoryTracer(Tracer):
+    """
+    Tracer, which additionally measures the memory allocated by Python in each phase with `tracemalloc`. Each span
+    gets the attributes "allocated_bytes" (memory allocated and not released during the phase) and "peak_bytes"
+    (highest memory usage during the phase above its usage at the start). The top allocation sites of each phase are
+    available in `MemoryTracer.allocations`. Optional limits abort the translation with a `MemoryLimitExceeded`
+    error; they are checked when a phase starts or ends and every `check_interval` nodes while traversing the
+    process graph and linking the nodes. Unlike other tracers, a memory tracer is not attached to the translated
+    graph, so later operations on the graph do not trace memory allocations.
+    Tracing memory allocations slows down the translation considerably, so this tracer should only be used for
+    investigating the memory consumption. Most of the time is spent for taking the snapshots needed for the top
+    allocation sites, which is not included in the wall time of a phase, but in the wall time of enclosing phases.
+    Set `top_n` to 0 for large graphs.
+    """
+
+    attach_to_graph = False
+
+    def __init__(self, trace_id=None, parent_span_id=None, max_bytes=None, max_phase_bytes=None, top_n=10,
+                 check_interval=100, n_frames=1):
+        """
+        Constructor of `MemoryTracer`.
+
+        Parameters
+        ----------
+        trace_id : str, optional
+            Hexadecimal ID of the trace the spans belong to (see `Tracer`).
+        parent_span_id : str, optional
+            Hexadecimal ID of the span enclosing all top level spans of this tracer (see `Tracer`).
+        max_bytes : int, optional
+            Maximum memory in bytes traced by `tracemalloc`, i.e. allocated since tracing started.
+        max_phase_bytes : int, optional
+            Maximum memory in bytes allocated within a single phase, including its nested phases.
+        top_n : int, optional
+            Number of top allocation sites recorded per phase (defaults to 10). If it is 0, no snapshots are taken,
+            which is considerably faster.
+        check_interval : int, optional
+            Number of visited nodes after which the limits are checked (defaults to 100).
+        n_frames : int, optional
+            Number of frames stored per allocation if `tracemalloc` is started by this tracer (defaults to 1).
+
+        """
+        super().__init__(trace_id=trace_id, parent_span_id=parent_span_id)
+        self.max_bytes = max_bytes
+        self.max_phase_bytes = max_phase_bytes
+        self.top_n = top_n
+        self.check_interval = check_interval
+        self.n_frames = n_frames
+        self.allocations = OrderedDict()
+        if max_bytes is not None or max_phase_bytes is not None:
+            self.visitor = self._visit
+        self._started = False
+        self._n_visited = 0
+        self._start_sizes = dict()
+        self._peaks = dict()
+        self._snapshots = dict()
+        self._snapshot_bytes = 0
+
+    def _traced_size(self):
+        """ int : Memory currently traced by `tracemalloc`, without the snapshots kept by this tracer. """
+        return tracemalloc.get_traced_memory()[0] - self._snapshot_bytes
+
+    def _update_peaks(self):
+        """ Updates the peak memory of all open spans and returns the currently traced memory. """
+        size, peak = tracemalloc.get_traced_memory()
+        for span in self._stack:
+            self._peaks[span.span_id] = max(self._peaks[span.span_id], peak - self._snapshot_bytes)
+        tracemalloc.reset_peak()
+        return size - self._snapshot_bytes
+
+    def _take_snapshot(self):
+        """
+        Takes a snapshot of the current allocations, ignoring the ones of `tracemalloc`. The memory used by the
+        snapshot itself is excluded from the traced memory as long as it is kept.
+
+        Returns
+        -------
+        snapshot : tracemalloc.Snapshot
+        snapshot_bytes : int
+            Memory used by the snapshot.
+
+        """
+        size = tracemalloc.get_traced_memory()[0]
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        snapshot_bytes = tracemalloc.get_traced_memory()[0] - size
+        tracemalloc.reset_peak()
+        return snapshot, snapshot_bytes
+
+    def _enter(self, span):
+        """ Starts tracing memory allocations if needed and opens a span. """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.n_frames)
+            self._started = True
+        try:
+            self.check(size=self._update_peaks())
+        except MemoryLimitExceeded:
+            if not self._stack and self._started:
+                tracemalloc.stop()
+                self._started = False
+            raise
+        if self.top_n:
+            snapshot, snapshot_bytes = self._take_snapshot()
+            self._snapshot_bytes += snapshot_bytes
+            self._snapshots[span.span_id] = (snapshot, snapshot_bytes)
+        size = self._traced_size()
+        self._start_sizes[span.span_id] = size
+        self._peaks[span.span_id] = size
+        super()._enter(span)
+
+    def _exit(self, span, exc_type=None):
+        """ Closes a span, records its memory usage and stops tracing memory allocations if needed. """
+        size = self._update_peaks()
+        start_size = self._start_sizes.pop(span.span_id)
+        span.set(allocated_bytes=size - start_size, peak_bytes=self._peaks.pop(span.span_id) - start_size)
+        super()._exit(span, exc_type=exc_type)
+        if span.span_id in self._snapshots:
+            start_snapshot, snapshot_bytes = self._snapshots.pop(span.span_id)
+            end_snapshot, _ = self._take_snapshot()
+            stats = end_snapshot.compare_to(start_snapshot, "lineno")[:self.top_n]
+            self.allocations[span.name] = [{"location": "{}:{}".format(stat.traceback[0].filename,
+                                                                       stat.traceback[0].lineno),
+                                            "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                                           for stat in stats]
+            del start_snapshot, end_snapshot, stats
+            self._snapshot_bytes -= snapshot_bytes
+            tracemalloc.reset_peak()
+        if not self._stack and self._started:
+            tracemalloc.stop()
+            self._started = False
+            self._snapshot_bytes = 0
+        if exc_type is None:
+            self.check(size=size, phase=span.name, phase_size=size - start_size)
+
+    def _visit(self, node):
+        """ Checks the memory limits every `check_interval` nodes. """
+        self._n_visited += 1
+        if self._n_visited % self.check_interval == 0:
+            self.check()
+
+    def _record(self, span):
+        """ Adds a finished span to the recorded spans, keeping the highest peak memory per phase. """
+        peak_bytes = self._stats[span.name]["peak_bytes"] if span.name in self._stats else 0
+        super()._record(span)
+        self._stats[span.name]["peak_bytes"] = max(peak_bytes, span.attributes["peak_bytes"])
+
+    def check(self, size=None, phase=None, phase_size=None):
+        """
+        Checks the memory limits.
+
+        Parameters
+        ----------
+        size : int, optional
+            Currently traced memory in bytes. By default, it is retrieved from `tracemalloc`.
+        phase : str, optional
+            Name of the phase. Defaults to the innermost open span.
+        phase_size : int, optional
+            Memory in bytes allocated in the phase. Defaults to the allocations since the innermost open span started.
+
+        Raises
+        ------
+        MemoryLimitExceeded
+
+        """
+        if self.max_bytes is None and self.max_phase_bytes is None:
+            return
+        if size is None:
+            size = self._traced_size() if tracemalloc.is_tracing() else 0
+        if phase is None and self._stack:
+            phase = self._stack[-1].name
+            phase_size = size - self._start_sizes[self._stack[-1].span_id]
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            err_msg = "Memory limit of {} bytes exceeded in phase '{}': {} bytes allocated in total."
+            raise MemoryLimitExceeded(phase, self.max_bytes, size, err_msg.format(self.max_bytes, phase, size))
+        if self.max_phase_bytes is not None and phase_size is not None and phase_size > self.max_phase_bytes:
+            err_msg = "Memory limit of {} bytes per phase exceeded in phase '{}': {} bytes allocated in the phase."
+            raise MemoryLimitExceeded(phase, self.max_phase_bytes, phase_size,
+                                      err_msg.format(self.max_phase_bytes, phase, phase_size))
+
+    def report(self, graph=None):
+        """
+        Summarises the memory usage.
+
+        Parameters
+        ----------
+        graph : graph.Graph, optional
+            Translated graph, whose footprint should be reported (see `graph_footprint`).
+
+        Returns
+        -------
+        dict
+            Dictionary containing the statistics per phase ("phases", see `Tracer.to_dict`), the top allocation
+            sites per phase ("allocations") and, if a graph is given, its footprint ("footprint").
+
+        """
+        report = {"phases": self.to_dict(), "allocations": OrderedDict(self.allocations)}
+        if graph is not None:
+            report["footprint"] = graph_footprint(graph)
+        return report
+
+    def reset(self):
+        """ Removes all recorded spans, statistics and allocation sites. """
+        super().reset()
+        self.allocations = OrderedDict()
+        self._n_visited = 0
+
+
+def _deep_sizeof(obj, seen):
+    """ Returns the size of an object and all containers and values it contains, which were not seen before. """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum([_deep_sizeof(key, seen) + _deep_sizeof(value, seen) for key, value in obj.items()])
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum([_deep_sizeof(value, seen) for value in obj])
+    return size
+
+
+def graph_footprint(graph):
+    """
+    Estimates the memory footprint of the nodes and edges of a graph. The size of a node includes its attributes and
+    content, apart from the related nodes, edges and the shared process definitions. The size of an edge includes its
+    attributes. Objects shared by several nodes or edges are only counted once.
+
+    Parameters
+    ----------
+    graph : graph.Graph
+        Graph to measure.
+
+    Returns
+    -------
+    dict
+        Dictionary with the number of nodes ("nodes") and edges ("edges"), their total sizes in bytes ("node_bytes",
+        "edge_bytes") and the average sizes per node and edge ("bytes_per_node", "bytes_per_edge").
+
+    """
+    seen = set()
+    node_bytes = 0
+    for node in graph.nodes:
+        seen.add(id(node))
+        node_bytes += sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+        for key, value in node.__dict__.items():
+            if key == "edges":
+                node_bytes += sys.getsizeof(value)
+            elif key == "process":
+                node_bytes += sys.getsizeof(value) + sys.getsizeof(getattr(value, "__dict__", None))
+            else:
+                node_bytes += _deep_sizeof(value, seen)
+
+    edge_bytes = 0
+    edges = list(graph._unique_edges())
+    for edge in edges:
+        edge_bytes += sys.getsizeof(edge) + sys.getsizeof(edge.__dict__) + sys.getsizeof(edge.nodes)
+        edge_bytes += _deep_sizeof(edge.id, seen) + _deep_sizeof(edge.name, seen)
+
+    n_nodes = len(graph)
+    n_edges = len(edges)
+    return {"nodes": n_nodes, "edges": n_edges, "node_bytes": node_bytes, "edge_bytes": edge_bytes,
+            "bytes_per_node": node_bytes / n_nodes if n_nodes else 0.,
+            "bytes_per_edge": edge_bytes / n_edges if n_edges else 0.}
+
+
+if __name__ == '__main__':
+    pass
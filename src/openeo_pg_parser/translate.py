@@ -1,16 +1,16 @@
-import os
 import copy
 from collections import OrderedDict
 from openeo_pg_parser.graph import OpenEONode, Graph, create_edge
-from openeo_pg_parser.utils import set_obj_elem_from_keys
-from openeo_pg_parser.utils import get_obj_elem_from_keys
+from openeo_pg_parser.utils import DEFAULT_PROCESSES_SRC
 from openeo_pg_parser.utils import load_processes
 from openeo_pg_parser.utils import load_json_file
 from openeo_pg_parser.utils import find_node_inputs
 from openeo_pg_parser.definitions import OpenEOParameter
+from openeo_pg_parser.trace import NULL_TRACER
 
 
-def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=0, keys=None, global_parameters=None):
+def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=0, keys=None, global_parameters=None,
+                       visitors=None):
     """
     Recursively walks through an openEO process graph dictionary and transforms the dictionary into a list of graph
     nodes.
@@ -36,6 +36,9 @@ def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=
         List of process graph dictionary keys pointing to the current node.
     global_parameters : dict, optional
         Globally defined parameters, which can be used in 'from_parameter'.
+    visitors : list of callable, optional
+        Functions, which are called with each node as soon as it is created and its 'from_parameter' arguments are
+        resolved, e.g. for validating the node.
 
     Returns
     -------
@@ -85,6 +88,10 @@ def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=
                     for data_parent_node in data_parent_nodes:
                         create_edge(data_parent_node, node, name="data")
 
+                if visitors:
+                    for visitor in visitors:
+                        visitor(node)
+
                 nodes[node_id] = node
             else:
                 node_id = None
@@ -94,7 +101,8 @@ def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=
             node_ids.append(node_id)
             level += 1
             nodes, node_ids, level, keys = walk_process_graph(value, nodes, process_defs, node_ids=node_ids, level=level,
-                                                              keys=keys, global_parameters=global_parameters)
+                                                              keys=keys, global_parameters=global_parameters,
+                                                              visitors=visitors)
 
     level += -1
     if node_ids:
@@ -105,7 +113,7 @@ def walk_process_graph(process_graph, nodes, process_defs, node_ids=None, level=
     return nodes, node_ids, level, keys
 
 
-def adjust_from_nodes(process_graph):
+def adjust_from_nodes(process_graph, visitor=None):
     """
     Resets 'from_node' content with corresponding Node IDs.
 
@@ -113,6 +121,8 @@ def adjust_from_nodes(process_graph):
     ----------
     process_graph : graph.Graph
         openEO process graph as a graph object.
+    visitor : callable, optional
+        Function called with each node, e.g. checking memory limits (see `trace.MemoryTracer`).
 
     Returns
     -------
@@ -120,14 +130,25 @@ def adjust_from_nodes(process_graph):
 
     """
 
+    # index the node names per process graph level, i.e. per callback child node (see `Graph.find_partners`)
+    names_per_level = dict()
+    for node in process_graph.nodes:
+        child_node = node.child("callback")
+        level_names = names_per_level.setdefault(None if child_node is None else child_node.id, dict())
+        level_names.setdefault(node.name, node)
+
     for node in process_graph.nodes:
-        pg_same_level = process_graph.find_partners(node, link="callback", include_node=True)
+        if visitor is not None:
+            visitor(node)
+        child_node = node.child("callback")
+        level_names = names_per_level[None if child_node is None else child_node.id]
         keys_lineage = find_node_inputs(node, "from_node")
         for key_lineage in keys_lineage:
-            data_entry = get_obj_elem_from_keys(node.content['arguments'], key_lineage)
-            node_other = pg_same_level.get_node_by_name(data_entry)
+            key_path = node.key_path(["arguments"] + list(key_lineage))
+            data_entry = key_path.get(node.content)
+            node_other = level_names.get(data_entry)
             if node_other:
-                set_obj_elem_from_keys(node.content['arguments'], key_lineage, node_other.id)
+                key_path.set(node.content, node_other.id)
                 create_edge(node_other, node, name="process")
                 create_edge(node_other, node, name="data")
             else:
@@ -161,35 +182,41 @@ def resolve_from_parameter(node, process_graph, global_parameters=None):
     keys_lineage = find_node_inputs(node, "from_parameter")
     parent_nodes_found = []
     for key_lineage in keys_lineage:
-        from_parameter_name = get_obj_elem_from_keys(node.content['arguments'], key_lineage)
+        # compiled key path pointing to the dictionary containing 'from_parameter'
+        key_path = node.key_path(["arguments"] + list(key_lineage[:-1]))
+        from_parameter_name = key_path.get(node.content)[key_lineage[-1]]
+        # keep the original reference, since it might be replaced by a parameter value
+        parameter_ref = [list(key_lineage[:-1]), from_parameter_name, False]
+        node.parameter_refs.append(parameter_ref)
         # get all higher level process-graphs, starting from the embedded one
         parent_nodes = process_graph.lineage(node, link="callback", ancestors=False, include_node=False)
-        for parent_node in parent_nodes:  # backtrace as long a parent process exists
+        for parent_node in parent_nodes.nodes:  # backtrace as long a parent process exists
             process = parent_node.process
             # First, check if parameter is contained in the parameters of the sub-process
             sub_parameters = process.sub_parameters
             if sub_parameters is not None and from_parameter_name in sub_parameters.keys():
                 parameter = process.sub_parameters[from_parameter_name]
                 if parameter.default_value is not None:
-                    set_obj_elem_from_keys(node.content['arguments'], key_lineage[:-1], parameter.default_value)
+                    key_path.set(node.content, parameter.default_value)
                 parent_nodes_found.append(parent_node)
             # Second, check if parameter is contained in process (take the default values)
             elif from_parameter_name in process.parameters.keys():
                 parameter = process.parameters[from_parameter_name]
                 if parameter.default_value is not None:
-                    set_obj_elem_from_keys(node.content['arguments'], key_lineage[:-1], parameter.default_value)
+                    key_path.set(node.content, parameter.default_value)
                 parent_nodes_found.append(parent_node)
             # Third, check if parameter is contained in parameter definition at the same level
             elif parent_node.parameters:
                 for parameter in parent_node.parameters:
                     if from_parameter_name == parameter.name:
                         if parameter.default_value is not None:
-                            set_obj_elem_from_keys(node.content['arguments'], key_lineage[:-1], parameter.default_value)
+                            key_path.set(node.content, parameter.default_value)
                         parent_nodes_found.append(parent_node)
 
         # if the parameter name is still not available, try to look into the globally defined parameters
         if global_parameters and global_parameters.get(from_parameter_name):
-            set_obj_elem_from_keys(node.content['arguments'], key_lineage[:-1], global_parameters[from_parameter_name])
+            key_path.set(node.content, global_parameters[from_parameter_name])
+            parameter_ref[2] = True
         else:
             if not parent_nodes_found:  # parameter seems not to be available, raise an error
                 err_msg = "'from_parameter' reference name '{}' " \
@@ -199,7 +226,7 @@ def resolve_from_parameter(node, process_graph, global_parameters=None):
     return node, parent_nodes_found
 
 
-def adjust_callbacks(process_graph):
+def adjust_callbacks(process_graph, visitor=None):
     """
     Resets embedded process graphs with their respective callback node ID.
 
@@ -207,6 +234,8 @@ def adjust_callbacks(process_graph):
     ----------
     process_graph : graph.Graph
         openEO process graph as a graph object.
+    visitor : callable, optional
+        Function called with each node, e.g. checking memory limits (see `trace.MemoryTracer`).
 
     Returns
     -------
@@ -215,15 +244,25 @@ def adjust_callbacks(process_graph):
     """
 
     for node in process_graph.nodes:
+        if visitor is not None:
+            visitor(node)
         # set parent node process graph content with child node ID if 'result' is true
         if node.is_result and node.parent_process is not None:
-            keys = node.keys[len(node.parent_process.keys):-2]  # exclude "process_graph" and node id at the end
-            set_obj_elem_from_keys(node.parent_process.content, keys, {"from_node": node.id})
+            parent_node = node.parent_process
+            keys = node.keys[len(parent_node.keys):-2]  # exclude "process_graph" and node id at the end
+            key_path = parent_node.key_path(keys)
+            # keep further entries of the embedded process graph, e.g. its parameters
+            callback = key_path.get(parent_node.content)
+            if isinstance(callback, dict):
+                callback_extras = {key: value for key, value in callback.items() if key != "process_graph"}
+                if callback_extras:
+                    parent_node.callback_extras.append([list(keys), callback_extras])
+            key_path.set(parent_node.content, {"from_node": node.id})
 
     return process_graph
 
 
-def link_nodes(process_graph):
+def link_nodes(process_graph, tracer=None):
     """
     Links all nodes in the graph, i.e. links 'from_node', 'from_argument' and 'callback' with the corresponding
     Node IDs.
@@ -233,6 +272,9 @@ def link_nodes(process_graph):
     ----------
     process_graph : graph.Graph
         Process graph to connect the nodes within.
+    tracer : trace.Tracer, optional
+        Tracer recording the phases 'adjust_from_nodes', 'update' and 'adjust_callbacks'. Its visitor is called with
+        each node in all of these phases.
 
     Returns
     -------
@@ -240,26 +282,35 @@ def link_nodes(process_graph):
 
     """
 
+    tracer = tracer if tracer is not None else NULL_TRACER
+
     # fill in all from_node parameters and create edges
-    process_graph = adjust_from_nodes(process_graph)
+    with tracer.span("adjust_from_nodes") as span:
+        process_graph = adjust_from_nodes(process_graph, visitor=tracer.visitor)
+        if tracer.enabled:
+            span.set(nodes=len(process_graph), edges=process_graph.n_edges)
 
     # update the edges of the graph
-    process_graph.update()
+    with tracer.span("update"):
+        process_graph.update(visitor=tracer.visitor)
 
     # replace all embedded process graphs with the respective node IDs
-    process_graph = adjust_callbacks(process_graph)
+    with tracer.span("adjust_callbacks"):
+        process_graph = adjust_callbacks(process_graph, visitor=tracer.visitor)
 
     return process_graph
 
 
-def translate_process_graph(pg_filepath, process_defs=None, parameters=None):
+def translate_process_graph(pg_filepath, process_defs=None, parameters=None, visitors=None, tracer=None):
     """
     Translates an openEO process graph into a graph.Graph object.
 
     Parameters
     ----------
     pg_filepath : str or dict
-        openEO process graph given as full file path or a stacked dictionary.
+        openEO process graph given as full file path or a stacked dictionary. A given dictionary is modified in
+        place, i.e. the node contents of the returned graph refer to it and the 'from_node', 'from_parameter' and
+        callback references are rewritten during the translation. Pass a copy if the original is needed afterwards.
     process_defs : dict or str or list, optional
         It can be:
             - dictionary of loaded process definitions (keys are the process ID's)
@@ -268,7 +319,14 @@ def translate_process_graph(pg_filepath, process_defs=None, parameters=None):
             - list of loaded process definitions
         The default value points to the "processes" repository of the parser.
     parameters : dict, optional
-        Globally defined parameters, which can be used in 'from_parameter'.
+        Globally defined parameters, which can be used in 'from_parameter'. The dictionary is not modified.
+    visitors : list of callable, optional
+        Functions, which are called with each node during the traversal of the process graph as soon as it is
+        created (see `walk_process_graph`).
+    tracer : trace.Tracer, optional
+        Tracer recording the wall time, the number of calls and the number of nodes and edges of each phase of the
+        translation. It is attached to the returned graph, so later sortings of the graph are recorded as well.
+        A `trace.MemoryTracer` additionally records the memory allocated in each phase and enforces memory limits.
 
     Returns
     -------
@@ -277,40 +335,55 @@ def translate_process_graph(pg_filepath, process_defs=None, parameters=None):
 
     """
 
-    if isinstance(pg_filepath, str):
-        process_graph = load_json_file(pg_filepath)
-    elif isinstance(pg_filepath, dict):
-        process_graph = pg_filepath
-    else:
-        raise ValueError("'pg_filepath must either be file path to a JSON file or a dictionary.'")
-
-    # remove first layer of the process graph
-    parameters = {} if parameters is None else parameters
-    if process_graph.get("parameters"):
-        for parameter_def in process_graph['parameters']:
-            parameter = OpenEOParameter(parameter_def)
-            parameters.update({parameter.name: parameter.default_value})
-
-    if "process_graph" in process_graph.keys():
-        process_graph = process_graph['process_graph']
-    else:
-        err_msg = "Process graph structure is invalid: " \
-                  "Processes need to be declared/wrapped inside 'process_graph' layer."
-        raise Exception(err_msg)
-
-    # define source of process definitions
-    process_defs = os.path.join(os.path.dirname(__file__), "processes") \
-        if process_defs is None else process_defs
-
-    # traverse process graph
-    nodes = OrderedDict()
-    nodes, _, _, _ = walk_process_graph(process_graph, nodes, process_defs, global_parameters=parameters)
-
-    # create graph object
-    process_graph = Graph(nodes)
-
-    # link all nodes and fill in from_node and from_argument
-    process_graph = link_nodes(process_graph)
+    tracer = tracer if tracer is not None else NULL_TRACER
+    with tracer.span("translate_process_graph") as translation_span:
+        if isinstance(pg_filepath, str):
+            process_graph = load_json_file(pg_filepath)
+        elif isinstance(pg_filepath, dict):
+            process_graph = pg_filepath
+        else:
+            raise ValueError("'pg_filepath must either be file path to a JSON file or a dictionary.'")
+
+        # remove first layer of the process graph
+        # explicitly given parameters take precedence over default values of the process graph parameters
+        parameters = {} if parameters is None else dict(parameters)
+        if process_graph.get("parameters"):
+            for parameter_def in process_graph['parameters']:
+                parameter = OpenEOParameter(parameter_def)
+                if parameters.get(parameter.name) is None:
+                    parameters[parameter.name] = parameter.default_value
+
+        if "process_graph" in process_graph.keys():
+            process_graph = process_graph['process_graph']
+        else:
+            err_msg = "Process graph structure is invalid: " \
+                      "Processes need to be declared/wrapped inside 'process_graph' layer."
+            raise Exception(err_msg)
+
+        # define source of process definitions
+        process_defs = DEFAULT_PROCESSES_SRC if process_defs is None else process_defs
+        # load the process definitions only once for the whole traversal
+        with tracer.span("load_processes"):
+            process_defs = load_processes(process_defs)
+
+        # traverse process graph
+        if tracer.visitor is not None:
+            visitors = list(visitors or []) + [tracer.visitor]
+        with tracer.span("walk_process_graph") as span:
+            nodes = OrderedDict()
+            nodes, _, _, _ = walk_process_graph(process_graph, nodes, process_defs, global_parameters=parameters,
+                                                visitors=visitors)
+            span.set(nodes=len(nodes))
+
+        # create graph object
+        process_graph = Graph(nodes)
+        if tracer.enabled and tracer.attach_to_graph:
+            process_graph.tracer = tracer
+
+        # link all nodes and fill in from_node and from_argument
+        process_graph = link_nodes(process_graph, tracer=tracer)
+        if tracer.enabled:
+            translation_span.set(nodes=len(process_graph), edges=process_graph.n_edges)
 
     return process_graph
 
@@ -1,7 +1,52 @@
 import os
 import glob
+import json
+import time
+import hashlib
 import requests
 from json import load
+from collections import OrderedDict
+from openeo_pg_parser import metrics
+
+# standard source of the process definitions, i.e. the "processes" directory of the parser
+DEFAULT_PROCESSES_SRC = os.path.join(os.path.dirname(__file__), "processes")
+
+
+def _http_get(url, loader):
+    """
+    Sends a GET request and records it in the metrics (see `metrics.record_http_request`).
+
+    Parameters
+    ----------
+    url : str
+        URL to request.
+    loader : str
+        Name of the loader sending the request.
+
+    Returns
+    -------
+    requests.Response
+
+    """
+    start_time = time.perf_counter()
+    try:
+        r = requests.get(url=url)
+    except Exception:
+        metrics.record_http_request(loader, "error", 0, time.perf_counter() - start_time)
+        raise
+    metrics.record_http_request(loader, r.status_code, len(r.content), time.perf_counter() - start_time)
+    return r
+
+
+def _source_type(src):
+    """ str : Type of a catalog source, i.e. "directory", "url", "list" or "unknown". """
+    if isinstance(src, str):
+        return "directory" if os.path.isdir(src) else "url"
+    elif isinstance(src, list):
+        return "list"
+    else:
+        return "unknown"
+
 
 def url_is_valid(url):
     """
@@ -18,7 +63,8 @@ def url_is_valid(url):
 
     """
     try:
-        r = requests.get(url=url)
+        with metrics.measure_loader("url_is_valid", "url"):
+            r = _http_get(url, "url_is_valid")
         if r.status_code != 200:
             return False
         return True
@@ -69,28 +115,31 @@ def load_processes(src):
     """
 
     if isinstance(src, dict):
+        # an already loaded catalog is reused, e.g. by each node of a process graph
+        metrics.record_catalog_reuse("load_processes")
         processes = src
     else:
-        if isinstance(src, str) and os.path.isdir(src):
-            filepaths = glob.glob(os.path.join(src, "*.json"))
-            process_list = [load_json_file(filepath) for filepath in filepaths]
-        elif isinstance(src, str) and url_is_valid(src):
-            # Is it the URL of a JSON file or a /processes endpoint?
-            r = requests.get(url=src)
-            data = r.json()
-            if 'processes' in data:
-                process_list = data['processes']
+        with metrics.measure_loader("load_processes", _source_type(src)):
+            if isinstance(src, str) and os.path.isdir(src):
+                filepaths = glob.glob(os.path.join(src, "*.json"))
+                process_list = [load_json_file(filepath) for filepath in filepaths]
+            elif isinstance(src, str) and url_is_valid(src):
+                # Is it the URL of a JSON file or a /processes endpoint?
+                r = _http_get(src, "load_processes")
+                data = r.json()
+                if 'processes' in data:
+                    process_list = data['processes']
+                else:
+                    process_list = data
+            elif isinstance(src, list):
+                process_list = src
             else:
-                process_list = data
-        elif isinstance(src, list):
-            process_list = src
-        else:
-            err_msg = "Either a processes URL or a local directory path must be specified."
-            raise ValueError(err_msg)
+                err_msg = "Either a processes URL or a local directory path must be specified."
+                raise ValueError(err_msg)
 
-        processes = {}
-        for process in process_list:
-            processes[process['id']] = process
+            processes = {}
+            for process in process_list:
+                processes[process['id']] = process
 
     return processes
 
@@ -124,56 +173,126 @@ def load_collections(src, collection_ids=None):
     """
 
     if isinstance(src, dict):
+        metrics.record_catalog_reuse("load_collections")
         collections = src
     else:
-        if isinstance(src, str) and os.path.isdir(src):
-            filepaths = glob.glob(os.path.join(src, "*.json"))
-            collection_list = [load_json_file(filepath) for filepath in filepaths]
-        elif isinstance(src, str) and url_is_valid(src):
-            if not collection_ids:
-                r = requests.get(url=src)
-                data = r.json()
-                collection_ids = [collection['id'] for collection in data['collections']]
-            collection_list = []
-            for collection_id in collection_ids:
-                collection_url = src + "/" + collection_id
-                r = requests.get(url=collection_url)
-                collection_list.append(r.json())
-        elif isinstance(src, list):
-            collection_list = src
-        else:
-            err_msg = "Either a collections URL or a local directory path must be specified."
-            raise ValueError(err_msg)
+        with metrics.measure_loader("load_collections", _source_type(src)):
+            if isinstance(src, str) and os.path.isdir(src):
+                filepaths = glob.glob(os.path.join(src, "*.json"))
+                collection_list = [load_json_file(filepath) for filepath in filepaths]
+            elif isinstance(src, str) and url_is_valid(src):
+                if not collection_ids:
+                    r = _http_get(src, "load_collections")
+                    data = r.json()
+                    collection_ids = [collection['id'] for collection in data['collections']]
+                collection_list = []
+                for collection_id in collection_ids:
+                    collection_url = src + "/" + collection_id
+                    r = _http_get(collection_url, "load_collections")
+                    collection_list.append(r.json())
+            elif isinstance(src, list):
+                collection_list = src
+            else:
+                err_msg = "Either a collections URL or a local directory path must be specified."
+                raise ValueError(err_msg)
 
-        collections = {}
-        for collection in collection_list:
-            collections[collection['id']] = collection
+            collections = {}
+            for collection in collection_list:
+                collections[collection['id']] = collection
 
     return collections
 
 
+def fingerprint(obj):
+    """
+    Computes a fingerprint of a JSON-serialisable object, which does not depend on the order of dictionary keys.
+
+    Parameters
+    ----------
+    obj : object
+        JSON-serialisable object, e.g. a process definition.
+
+    Returns
+    -------
+    str
+        SHA-256 hash of the canonical JSON representation as a hex string.
+
+    """
+
+    canonical_json = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+
+
+def iter_key_paths(obj, break_points=None, leaf_key=None):
+    """
+    Lazily walks through a nested dictionary/list structure and yields the key paths of all its leaves.
+    A leaf is a value, which is neither a dictionary nor a list, an empty dictionary/list or a dictionary whose first
+    key is a break point.
+
+    Parameters
+    ----------
+    obj : dict or list
+        Dictionary/list to walk through.
+    break_points : list, optional
+        List of strings/keys in the dictionary, where the walk should stop, i.e. the break point key and all keys
+        following it in the same dictionary are ignored.
+    leaf_key : str or int, optional
+        If given, only key paths ending with this key are yielded.
+
+    Yields
+    ------
+    tuple
+        Keys necessary to get from `obj` to a leaf.
+
+    Notes
+    -----
+    The walk uses an explicit stack instead of recursion, so the depth of `obj` is not limited by the recursion limit
+    and no intermediate list of all key paths is created.
+
+    """
+
+    break_points = frozenset(break_points) if break_points else frozenset()
+    stack = [((), obj)]
+    while stack:
+        keys, elem = stack.pop()
+        if isinstance(elem, dict):
+            children = []
+            for key, value in elem.items():
+                if key in break_points:  # ignore further arguments
+                    break
+                children.append((keys + (key,), value))
+        elif isinstance(elem, list):
+            children = [(keys + (i,), value) for i, value in enumerate(elem)]
+        else:
+            children = None
+
+        if children:
+            # reverse children to preserve the order of the keys when popping from the stack
+            stack.extend(reversed(children))
+        elif keys and (leaf_key is None or keys[-1] == leaf_key):
+            yield keys
+
+
 def walk_process_dictionary(proc_dict, keys_lineage=None, key_lineage=None, level=0, prev_level=0,
                             break_points=None):
     """
-    Recursively walks through a dictionary until the specified key is reached and collects the keys lineage/the keys.
+    Walks through a dictionary until the specified key is reached and collects the keys lineage/the keys.
+    This function is kept for backwards compatibility, please use `iter_key_paths` instead.
 
     Parameters
     ----------
     proc_dict : dict
         Dictionary to walk through.
     keys_lineage : list of lists, optional
-        List of key lineages. (only internally used in the recursive process, can be ignored).
+        List of key lineages, which should be extended.
     key_lineage: list of str, optional
-        Keys necessary to get the name of the input process id (only internally used in the recursive process,
-        can be ignored)
+        Keys prepended to each key lineage.
     level : int, optional
-        Current level/deepness in the dictionary (default is 0,
-        only internally used in the recursive process, can be ignored).
+        Current level/deepness in the dictionary (default is 0, can be ignored).
     prev_level : int, optional
-        Previous level/deepness in the dictionary (default is 0,
-        only internally used in the recursive process, can be ignored)).
+        Previous level/deepness in the dictionary (default is 0, can be ignored).
     break_points : list, optional
-        List of strings/keys in the dictionary, where the recursive process should stop.
+        List of strings/keys in the dictionary, where the walk should stop.
 
     Returns
     -------
@@ -190,36 +309,240 @@ def walk_process_dictionary(proc_dict, keys_lineage=None, key_lineage=None, leve
     if keys_lineage is None:
         keys_lineage = []
 
-    if isinstance(proc_dict, dict):
-        for k, v in proc_dict.items():
-            if break_points and k in break_points:  # ignore further arguments
-                break
-            key_lineage.append(k)
-            sub_pg_graph = proc_dict[k]
-            level += 1
-            prev_level = level
-            keys_lineage, key_lineage, level, prev_level = walk_process_dictionary(sub_pg_graph, keys_lineage=keys_lineage,
-                                                                                   key_lineage=key_lineage, level=level,
-                                                                                   prev_level=prev_level,
-                                                                                   break_points=break_points)
-    elif isinstance(proc_dict, list):
-        for i, elem in enumerate(proc_dict):
-            key_lineage.append(i)
-            sub_pg_graph = proc_dict[i]
-            level += 1
-            prev_level = level
-            keys_lineage, key_lineage, level, prev_level = walk_process_dictionary(sub_pg_graph, keys_lineage=keys_lineage,
-                                                                                   key_lineage=key_lineage, level=level,
-                                                                                   prev_level=prev_level,
-                                                                                   break_points=break_points)
-
-    level -= 1
-    if key_lineage and (key_lineage not in keys_lineage):
-        if (level - prev_level) == -1:
-            keys_lineage.append(key_lineage)
-        key_lineage = key_lineage[:-1]
-
-    return keys_lineage, key_lineage, level, prev_level
+    for keys in iter_key_paths(proc_dict, break_points=break_points):
+        keys_lineage.append(key_lineage + list(keys))
+
+    return keys_lineage, key_lineage, level - 1, prev_level
+
+
+class KeyPath:
+    """
+    Compiled key path pointing to one location in a nested Python object, e.g. a dictionary.
+    Repeatedly reading or writing the same location only requires to resolve the key path once, if the parent
+    container is cached.
+    """
+
+    def __init__(self, keys, cache_parent=False):
+        """
+        Constructor of `KeyPath`.
+
+        Parameters
+        ----------
+        keys : list or tuple
+            Keys for indexing.
+        cache_parent : bool, optional
+            If true, the container holding the last key is cached for the last object the key path was applied to
+            (defaults to False). The cache assumes that none of the intermediate containers is replaced in between.
+
+        """
+
+        self.keys = tuple(keys)
+        if not self.keys:
+            err_msg = "A key path needs at least one key."
+            raise ValueError(err_msg)
+        self.cache_parent = cache_parent
+        self._parent_keys = self.keys[:-1]
+        self._last_key = self.keys[-1]
+        self._obj = None
+        self._parent = None
+
+    def parent(self, obj):
+        """
+        Returns the container of `obj` holding the last key of the key path.
+
+        Parameters
+        ----------
+        obj : object
+            Python object offering indexing, e.g., a dictionary.
+
+        Returns
+        -------
+        object
+
+        """
+
+        if self.cache_parent and self._obj is obj:
+            return self._parent
+
+        parent = obj
+        for key in self._parent_keys:
+            parent = parent[key]
+
+        if self.cache_parent:
+            self._obj = obj
+            self._parent = parent
+
+        return parent
+
+    def get(self, obj):
+        """
+        Returns value stored in `obj` at the location of the key path.
+
+        Parameters
+        ----------
+        obj : object
+            Python object offering indexing, e.g., a dictionary.
+
+        Returns
+        -------
+        object
+
+        """
+
+        return self.parent(obj)[self._last_key]
+
+    def set(self, obj, value):
+        """
+        Sets value in `obj` at the location of the key path.
+
+        Parameters
+        ----------
+        obj : object
+            Python object offering indexing, e.g., a dictionary.
+        value : object
+            Python object to store in `obj`.
+
+        """
+
+        self.parent(obj)[self._last_key] = value
+
+    def invalidate(self):
+        """ Resets the cached parent container. """
+        self._obj = None
+        self._parent = None
+
+    def __len__(self):
+        """ int : Number of keys. """
+        return len(self.keys)
+
+    def __repr__(self):
+        """ str : String representation of the key path. """
+        return "KeyPath({})".format(list(self.keys))
+
+
+class LRUCache:
+    """
+    Least recently used cache, whose keys are compared by equality, e.g. for storing data derived from a catalog
+    identified by its source (a directory path or URL).
+    """
+
+    def __init__(self, maxsize=8, name=None):
+        """
+        Constructor of `LRUCache`.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of cached keys (defaults to 8).
+        name : str, optional
+            Name of the cache. If given, hits and misses are recorded in the metrics (see `metrics`).
+
+        """
+
+        self.maxsize = maxsize
+        self.name = name
+        self._entries = OrderedDict()
+
+    def get(self, key, factory):
+        """
+        Returns the value cached for a key or creates it if it is not cached yet.
+
+        Parameters
+        ----------
+        key : object
+            Hashable key to look up.
+        factory : callable
+            Function taking the key and returning the value to cache.
+
+        Returns
+        -------
+        object
+
+        """
+
+        hit = key in self._entries
+        if self.name is not None:
+            metrics.record_cache_lookup(self.name, hit)
+        if hit:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        value = factory(key)
+        self._entries[key] = value
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        """ Removes all cached values. """
+        self._entries.clear()
+
+
+class IdentityCache:
+    """
+    Least recently used cache, whose keys are compared by identity, e.g. for storing data derived from a loaded
+    catalog as long as the same catalog object is used. A reference to each key is kept, so its identity stays valid
+    while it is cached.
+    """
+
+    def __init__(self, maxsize=8, name=None):
+        """
+        Constructor of `IdentityCache`.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of cached keys (defaults to 8).
+        name : str, optional
+            Name of the cache. If given, hits and misses are recorded in the metrics (see `metrics`).
+
+        """
+
+        self.maxsize = maxsize
+        self.name = name
+        self._entries = OrderedDict()
+
+    def get(self, key, factory):
+        """
+        Returns the value cached for an object or creates it if it is not cached yet.
+
+        Parameters
+        ----------
+        key : object
+            Object to look up.
+        factory : callable
+            Function taking the object and returning the value to cache.
+
+        Returns
+        -------
+        object
+
+        """
+
+        entry = self._entries.get(id(key))
+        hit = entry is not None and entry[0] is key
+        if self.name is not None:
+            metrics.record_cache_lookup(self.name, hit)
+        if hit:
+            self._entries.move_to_end(id(key))
+            return entry[1]
+
+        value = factory(key)
+        self._entries[id(key)] = (key, value)
+        self._entries.move_to_end(id(key))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        """ Removes all cached values. """
+        self._entries.clear()
+
+    def __len__(self):
+        """ int : Number of cached keys. """
+        return len(self._entries)
 
 
 def get_obj_elem_from_keys(obj, keys):
@@ -239,10 +562,11 @@ def get_obj_elem_from_keys(obj, keys):
         Values of the indexed object.
     """
 
-    if len(keys) > 1:
-        return get_obj_elem_from_keys(obj[keys[0]], keys[1:])
-    else:
-        return obj[keys[0]]
+    last_idx = len(keys) - 1
+    for i in range(last_idx):
+        obj = obj[keys[i]]
+
+    return obj[keys[last_idx]]
 
 
 def set_obj_elem_from_keys(obj, keys, value):
@@ -258,16 +582,13 @@ def set_obj_elem_from_keys(obj, keys, value):
     value : object
         Python object to store in `obj`.
 
-    Returns
-    -------
-    object
-        Reset object including the given `value`.
     """
 
-    if len(keys) > 1:
-        return set_obj_elem_from_keys(obj[keys[0]], keys[1:], value)
-    else:
-        obj[keys[0]] = value
+    last_idx = len(keys) - 1
+    for i in range(last_idx):
+        obj = obj[keys[i]]
+
+    obj[keys[last_idx]] = value
 
 
 def find_node_inputs(node, data_link):
@@ -289,9 +610,8 @@ def find_node_inputs(node, data_link):
 
     keys_lineage = []
     for key, value in node.arguments.items():
-        keys_lineage_arg, _, _, _ = walk_process_dictionary(value, break_points=["process_graph"])
-        if keys_lineage_arg:
-            keys_lineage.extend([[key] + elem for elem in keys_lineage_arg if elem[-1] == data_link])
+        for keys in iter_key_paths(value, break_points=["process_graph"], leaf_key=data_link):
+            keys_lineage.append([key] + list(keys))
 
     return keys_lineage
 
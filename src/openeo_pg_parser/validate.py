@@ -1,7 +1,511 @@
 import os
+import abc
+import copy
+import glob
+import json
+from collections import OrderedDict
+from openeo_pg_parser import metrics
 from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.trace import NULL_TRACER
+from openeo_pg_parser.utils import LRUCache
+from openeo_pg_parser.utils import IdentityCache
+from openeo_pg_parser.utils import DEFAULT_PROCESSES_SRC
+from openeo_pg_parser.utils import fingerprint
+from openeo_pg_parser.utils import load_json_file
 from openeo_pg_parser.utils import load_processes
 from openeo_pg_parser.utils import load_collections
+from openeo_pg_parser.utils import _source_type
+from openeo_pg_parser.definitions import OpenEOProcess
+from openeo_pg_parser.definitions import OpenEOCollection
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+# compiled schema validators per source of a process catalog, i.e. per directory path or URL
+_SCHEMA_VALIDATORS = LRUCache(maxsize=8, name="schema_validators")
+# compiled schema validators per loaded process catalog
+_CATALOG_SCHEMA_VALIDATORS = IdentityCache(maxsize=8, name="schema_validators")
+# indexed collections per loaded collection definition
+_COLLECTIONS = IdentityCache(maxsize=256, name="collections")
+# fingerprints per loaded process or collection catalog
+_CATALOG_FINGERPRINTS = IdentityCache(maxsize=8, name="catalog_fingerprints")
+# keys of placeholders, which are resolved during the execution and cannot be validated
+PLACEHOLDER_KEYS = ("from_node", "from_parameter", "process_graph")
+
+
+def contains_placeholder(value):
+    """
+    Checks if an argument value is or contains a placeholder, i.e. a reference to a node ('from_node'), a parameter
+    ('from_parameter') or an embedded process graph ('process_graph').
+
+    Parameters
+    ----------
+    value : object
+        Argument value.
+
+    Returns
+    -------
+    bool
+
+    """
+
+    stack = [value]
+    while stack:
+        elem = stack.pop()
+        if isinstance(elem, dict):
+            if any([key in elem for key in PLACEHOLDER_KEYS]):
+                return True
+            stack.extend(elem.values())
+        elif isinstance(elem, list):
+            stack.extend(elem)
+
+    return False
+
+
+def compile_schema(schema):
+    """
+    Compiles the JSON schema of an openEO parameter to a validator.
+
+    Parameters
+    ----------
+    schema : dict or list of dict
+        JSON schema of the parameter. A list of schemas means that one of them needs to match.
+
+    Returns
+    -------
+    jsonschema.protocols.Validator
+        Compiled validator or None, if no schema is given.
+
+    """
+
+    if not schema:
+        return None
+    if isinstance(schema, list):
+        schema = {"anyOf": schema}
+    validator_cls = jsonschema.validators.validator_for(schema)
+    return validator_cls(schema)
+
+
+# message templates of all validation error codes
+ERROR_MESSAGES = {
+    "process_unknown": "'{process_id}' is not in the current set of process definitions.",
+    "parameter_missing": "Parameter '{parameter}' is required for process '{process_id}'",
+    "argument_schema": "Argument '{parameter}' of process '{process_id}' does not match its schema: {reason}",
+    "collection_unknown": "'{collection_id}' is not in the current set of collections.",
+    "band_invalid": "'{band}' is not a valid band name for collection '{collection_id}' "
+                    "with the following bands: {available_bands}."
+}
+
+
+class ValidationError:
+    """
+    Structured validation error of a node. The error message is only formatted when it is accessed, e.g. when
+    converting the error to a string.
+    """
+
+    __slots__ = ("node_id", "keys", "code", "params")
+
+    def __init__(self, node_id, keys, code, **params):
+        """
+        Constructor of `ValidationError`.
+
+        Parameters
+        ----------
+        node_id : str
+            ID of the invalid node.
+        keys : list
+            Process graph dictionary keys pointing to the invalid entry.
+        code : str
+            Error code, i.e. one of the keys of `ERROR_MESSAGES`.
+        **params
+            Values filled into the message template. Callables are only called when the message is formatted.
+
+        """
+
+        self.node_id = node_id
+        self.keys = keys
+        self.code = code
+        self.params = params
+
+    @property
+    def message(self):
+        """ str : Formatted error message. """
+        params = {key: value() if callable(value) else value for key, value in self.params.items()}
+        return ERROR_MESSAGES[self.code].format(**params)
+
+    def to_dict(self):
+        """ dict : Dictionary representation of the error, including the formatted parameters and message. """
+        params = {key: value() if callable(value) else value for key, value in self.params.items()}
+        return {"node_id": self.node_id, "keys": self.keys, "code": self.code, "params": params,
+                "message": ERROR_MESSAGES[self.code].format(**params)}
+
+    @classmethod
+    def from_dict(cls, error_dict):
+        """
+        Creates a validation error from its dictionary representation (see `ValidationError.to_dict`).
+
+        Parameters
+        ----------
+        error_dict : dict
+            Dictionary representation of a validation error.
+
+        Returns
+        -------
+        ValidationError
+
+        """
+        return cls(error_dict["node_id"], error_dict["keys"], error_dict["code"], **error_dict["params"])
+
+    def __str__(self):
+        """ str : Formatted error message. """
+        return self.message
+
+    def __repr__(self):
+        """ str : String representation of the error without formatting its message. """
+        return "ValidationError(node_id={!r}, keys={!r}, code={!r})".format(self.node_id, self.keys, self.code)
+
+
+class ValidationAborted(Exception):
+    """ Raised by an `ErrorCollector` if the maximum number of errors is reached. """
+    pass
+
+
+class ErrorCollector:
+    """ Collects validation errors, possibly shared by several validators, and stops at a maximum number of errors. """
+
+    def __init__(self, max_errors=None):
+        """
+        Constructor of `ErrorCollector`.
+
+        Parameters
+        ----------
+        max_errors : int, optional
+            Maximum number of errors. If it is reached, `ValidationAborted` is raised. Default is None, which collects
+            all errors.
+
+        """
+
+        if max_errors is not None and max_errors < 1:
+            err_msg = "The maximum number of errors must be at least 1 ({} given).".format(max_errors)
+            raise ValueError(err_msg)
+
+        self.max_errors = max_errors
+        self.errors = []
+
+    def add(self, error):
+        """
+        Adds an error.
+
+        Parameters
+        ----------
+        error : ValidationError
+            Error to add.
+
+        Raises
+        ------
+        ValidationAborted
+            If the maximum number of errors is reached.
+
+        """
+
+        self.errors.append(error)
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            raise ValidationAborted("Maximum number of {} validation errors reached.".format(self.max_errors))
+
+    def __len__(self):
+        """ int : Number of collected errors. """
+        return len(self.errors)
+
+
+class NodeValidator(abc.ABC):
+    """
+    Abstract base class of all node visitors validating nodes. Validators can be passed to `translate_process_graph`
+    to validate the nodes while they are created. Subclasses need to implement `__call__`.
+    """
+
+    def __init__(self, errors=None):
+        """
+        Constructor of `NodeValidator`.
+
+        Parameters
+        ----------
+        errors : ErrorCollector, optional
+            Collector of the validation errors, which can be shared with other validators.
+            By default, each validator collects all errors on its own.
+
+        """
+
+        self.errors = errors if errors is not None else ErrorCollector()
+
+    @property
+    def valid(self):
+        """ bool : True if all visited nodes are valid. """
+        return len(self.errors) == 0
+
+    @property
+    def err_msgs(self):
+        """ list of ValidationError : All collected validation errors. """
+        return self.errors.errors
+
+    def add_error(self, node, keys, code, **params):
+        """
+        Adds a validation error.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Invalid node.
+        keys : list
+            Keys pointing from the node to the invalid entry.
+        code : str
+            Error code, i.e. one of the keys of `ERROR_MESSAGES`.
+        **params
+            Values filled into the message template.
+
+        """
+
+        node_keys = list(node.keys) if node.keys is not None else []
+        self.errors.add(ValidationError(node.id, node_keys + list(keys), code, **params))
+
+    @abc.abstractmethod
+    def __call__(self, node):
+        """
+        Validates one node.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Node to validate.
+
+        """
+
+
+class ProcessValidator(NodeValidator):
+    """ Node visitor validating each node according to the given process definitions. """
+
+    def __init__(self, processes_src, errors=None):
+        """
+        Constructor of `ProcessValidator`.
+
+        Parameters
+        ----------
+        processes_src : dict or str or list
+            It can be:
+                - dictionary of loaded process definitions (keys are the process ID's)
+                - directory path to processes (.json)
+                - URL of the remote process endpoint (e.g., "https://earthengine.openeo.org/v1.0/processes")
+                - list of loaded process definitions
+        errors : ErrorCollector, optional
+            Collector of the validation errors, which can be shared with other validators.
+
+        """
+
+        super().__init__(errors=errors)
+        self.process_defs = load_processes(processes_src)
+
+    def __call__(self, node):
+        """
+        Validates one node.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Node to validate.
+
+        """
+
+        if node.process_id not in self.process_defs.keys():
+            self.add_error(node, ["process_id"], "process_unknown", process_id=node.process_id)
+        else:
+            # First, check if required parameter is set in the process graph
+            arguments = node.arguments
+            for parameter in node.process.parameters.values():
+                if not parameter.is_required:
+                    if parameter.name not in arguments.keys():
+                        self.add_error(node, ["arguments", parameter.name], "parameter_missing",
+                                       parameter=parameter.name, process_id=node.process_id)
+
+
+class ArgumentValidator(NodeValidator):
+    """
+    Node visitor validating the argument values of each node against the JSON schemas of the process parameters.
+    The schema validators are compiled once per process and parameter and cached for the source of the process
+    catalog, i.e. per directory path or URL or, for loaded catalogs, per catalog object. Arguments containing
+    placeholders ('from_node', 'from_parameter' or embedded process graphs) are skipped.
+
+    Notes
+    -----
+    This validator requires the optional dependency `jsonschema`.
+
+    """
+
+    def __init__(self, processes_src, errors=None, process_defs=None):
+        """
+        Constructor of `ArgumentValidator`.
+
+        Parameters
+        ----------
+        processes_src : dict or str or list
+            It can be:
+                - dictionary of loaded process definitions (keys are the process ID's)
+                - directory path to processes (.json)
+                - URL of the remote process endpoint (e.g., "https://earthengine.openeo.org/v1.0/processes")
+                - list of loaded process definitions
+        errors : ErrorCollector, optional
+            Collector of the validation errors, which can be shared with other validators.
+        process_defs : dict, optional
+            Process definitions already loaded from `processes_src`, which are used instead of loading them again.
+
+        """
+
+        if jsonschema is None:
+            err_msg = "Validating arguments requires 'jsonschema', please install it, e.g. " \
+                      "'pip install openeo-pg-parser[jsonschema]'."
+            raise ImportError(err_msg)
+
+        super().__init__(errors=errors)
+        self.process_defs = load_processes(processes_src) if process_defs is None else process_defs
+        # a loaded catalog is recreated when it is loaded again, so the validators are cached per source string
+        if isinstance(processes_src, str):
+            self._validators = _SCHEMA_VALIDATORS.get(processes_src, lambda src: dict())
+        else:
+            self._validators = _CATALOG_SCHEMA_VALIDATORS.get(processes_src, lambda src: dict())
+
+    def get_validator(self, process_id, parameter_name):
+        """
+        Returns the compiled schema validator of a process parameter.
+
+        Parameters
+        ----------
+        process_id : str
+            Unique OpenEO process name.
+        parameter_name : str
+            Name of the parameter.
+
+        Returns
+        -------
+        jsonschema.protocols.Validator
+            Compiled validator or None, if the process, the parameter or its schema is unknown.
+
+        """
+
+        key = (process_id, parameter_name)
+        if key not in self._validators:
+            validator = None
+            if process_id in self.process_defs:
+                parameters = OpenEOProcess(self.process_defs[process_id]).parameters
+                if parameter_name in parameters:
+                    validator = compile_schema(parameters[parameter_name].schema)
+            self._validators[key] = validator
+
+        return self._validators[key]
+
+    def __call__(self, node):
+        """
+        Validates one node.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Node to validate.
+
+        """
+
+        for parameter_name, value in node.content['arguments'].items():
+            validator = self.get_validator(node.process_id, parameter_name)
+            if validator is None or contains_placeholder(value):
+                continue
+            if not validator.is_valid(value):
+                def reason(validator=validator, value=value):
+                    return jsonschema.exceptions.best_match(validator.iter_errors(value)).message
+                self.add_error(node, ["arguments", parameter_name], "argument_schema", parameter=parameter_name,
+                               process_id=node.process_id, reason=reason)
+
+
+class CollectionValidator(NodeValidator):
+    """
+    Node visitor validating the collection and the bands of each 'load_collection' node according to the given
+    collection definitions. Each collection definition is only loaded once and its band index is cached as long as
+    the same collection definition is used, i.e. across validations with an already loaded collection catalog.
+    Band names are compared ignoring the case, and the names and common names of the 'eo:bands' summary are
+    accepted as aliases.
+    """
+
+    def __init__(self, collections_src, errors=None):
+        """
+        Constructor of `CollectionValidator`.
+
+        Parameters
+        ----------
+        collections_src : dict or str or list
+            It can be:
+                - dictionary of loaded collection definitions (keys are the collection ID's)
+                - directory path to collections (.json)
+                - URL of the remote collection endpoint (e.g., "https://earthengine.openeo.org/v1.0/collections")
+                - list of loaded collection definitions
+        errors : ErrorCollector, optional
+            Collector of the validation errors, which can be shared with other validators.
+
+        """
+
+        super().__init__(errors=errors)
+        self.collections_src = collections_src
+        self._collection_defs = dict()
+
+    def get_collection(self, collection_id):
+        """
+        Returns a collection definition, which is loaded on first access.
+
+        Parameters
+        ----------
+        collection_id : str
+            ID of the collection.
+
+        Returns
+        -------
+        dict
+            Collection definition or None, if the collection is not available.
+
+        """
+
+        if collection_id not in self._collection_defs:
+            collection_defs = load_collections(self.collections_src, collection_ids=[collection_id])
+            self._collection_defs.update(collection_defs)
+            self._collection_defs.setdefault(collection_id, None)
+
+        return self._collection_defs[collection_id]
+
+    def __call__(self, node):
+        """
+        Validates one node.
+
+        Parameters
+        ----------
+        node : graph.OpenEONode
+            Node to validate.
+
+        """
+
+        if node.process_id != 'load_collection':
+            return
+
+        arguments = node.arguments
+        collection_id = arguments['id']
+        collection_def = self.get_collection(collection_id)
+        if collection_def is None:
+            self.add_error(node, ["arguments", "id"], "collection_unknown", collection_id=collection_id)
+        else:
+            collection = _COLLECTIONS.get(collection_def, OpenEOCollection)
+            # check bands
+            if arguments.get('bands') is not None and collection.band_names:
+                for i, node_band in enumerate(arguments['bands']):
+                    if not collection.has_band(node_band):
+                        def available_bands_str(available_bands=collection.band_names):
+                            return ', '.join(["'{}'".format(available_band) for available_band in available_bands])
+                        self.add_error(node, ["arguments", "bands", i], "band_invalid", band=node_band.casefold(),
+                                       collection_id=collection_id, available_bands=available_bands_str)
 
 
 def validate_processes(process_graph, processes_src):
@@ -23,29 +527,16 @@ def validate_processes(process_graph, processes_src):
     -------
     valid : bool
         If True, the given process graph is valid with respect to the given process definitions.
-    err_msgs : list
-        List of strings containing error or user information messages if `valid` is False.
+    err_msgs : list of ValidationError
+        Structured validation errors if `valid` is False. Converting an error to a string formats its message.
 
     """
 
-    process_defs = load_processes(processes_src)
-
-    err_msgs = []
+    validator = ProcessValidator(processes_src)
     for node in process_graph.nodes:
-        if node.process_id not in process_defs.keys():
-            err_msg = "'{}' is not in the current set of process definitions.".format(node.process_id)
-            err_msgs.append(err_msg)
-        else:
-            # First, check if required parameter is set in the process graph
-            for parameter in node.process.parameters.values():
-                if not parameter.is_required:
-                    if parameter.name not in node.arguments.keys():
-                        err_msg = "Parameter '{}' is required for process '{}'".format(parameter.name,
-                                                                                       node.process_id)
-                        err_msgs.append(err_msg)
+        validator(node)
 
-    valid = len(err_msgs) == 0
-    return valid, err_msgs
+    return validator.valid, validator.err_msgs
 
 
 def validate_collections(process_graph, collections_src):
@@ -67,50 +558,28 @@ def validate_collections(process_graph, collections_src):
     -------
     valid : bool
         If True, the given process graph is valid with respect to the given collection definitions.
-    err_msgs : list
-        List of strings containing error or user information messages if `valid` is False.
+    err_msgs : list of ValidationError
+        Structured validation errors if `valid` is False. Converting an error to a string formats its message.
 
     """
 
-    err_msgs = []
+    validator = CollectionValidator(collections_src)
     for node in process_graph.nodes:
-        if node.process_id == 'load_collection':
-            collection_id = node.arguments['id']
-            collection_defs = load_collections(collections_src, collection_ids=[collection_id])
-            if node.arguments['id'] not in collection_defs.keys():
-                err_msg = "'{}' is not in the current set of collections.".format(collection_id)
-                err_msgs.append(err_msg)
-            else:
-                collection = collection_defs[collection_id]
-                collection_dims = collection['cube:dimensions']
-                available_bands = []
-                for _, collection_dim in collection_dims.items():
-                    if collection_dim['type'] == 'bands':
-                        available_bands.extend([band.lower() for band in collection_dim['values']])
-
-                # check bands
-                if node.arguments.get('bands') is not None and available_bands:
-                    node_bands = [band.lower() for band in node.arguments['bands']]
-                    for node_band in node_bands:
-                        if node_band not in available_bands:
-                            available_bands_str = ', '.join(["'{}'".format(available_band)
-                                                             for available_band in available_bands])
-                            err_msg = "'{}' is not a valid band name for collection '{}' " \
-                                      "with the following bands: {}.".format(node_band,
-                                                                             collection_id,
-                                                                             available_bands_str)
-                            err_msgs.append(err_msg)
-
-    valid = len(err_msgs) == 0
-    return valid, err_msgs
-
-
-def validate_process_graph(pg_filepath, collections_src, processes_src=None, parameters=None):
+        validator(node)
+
+    return validator.valid, validator.err_msgs
+
+
+def validate_process_graph(pg_filepath, collections_src, processes_src=None, parameters=None,
+                           validate_arguments=False, mode="full", max_errors=None, cache=None, tracer=None):
     """
     Validate the input process graph with respect to:
         - processes
         - collections
         - node names
+        - argument schemas (optional)
+
+    The nodes are validated in a single pass while the process graph is translated.
 
     Parameters
     ----------
@@ -131,28 +600,325 @@ def validate_process_graph(pg_filepath, collections_src, processes_src=None, par
         The default value points to the "processes" repository of the parser.
     parameters : dict, optional
         Globally defined parameters, which can be used in 'from_parameter'.
+    validate_arguments : bool, optional
+        If true, the argument values are validated against the JSON schemas of the process parameters, which
+        requires the optional dependency `jsonschema` (defaults to False).
+    mode : str, optional
+        Validation mode:
+            - "full": all nodes are validated and all errors are collected (default).
+            - "fail_fast": the validation stops at the first error.
+    max_errors : int, optional
+        Maximum number of errors, after which the validation stops. The traversal of the process graph and the
+        loading of collections are not continued then.
+    cache : ValidationCache, optional
+        Cache of validation results. If given, the result of a previous validation of the same process graph with
+        the same parameters, options and catalogs is returned. Remote collection catalogs can only be cached by
+        calling `ValidationCache.validate` with a fingerprint of the catalog.
+    tracer : trace.Tracer, optional
+        Tracer recording the phases of the validation and the translation (see `translate_process_graph`).
 
     Returns
     -------
     valid : bool
         If True, the given process graph is valid.
-    err_msgs : list
-        List of strings containing error or user information messages if `valid` is False.
+    err_msgs : list of ValidationError
+        Structured validation errors if `valid` is False. Converting an error to a string formats its message.
 
     """
     # define source of process definitions
-    process_defs = os.path.join(os.path.dirname(__file__), "processes") \
-        if processes_src is None else processes_src
+    processes_src = DEFAULT_PROCESSES_SRC if processes_src is None else processes_src
+
+    if cache is not None:
+        return cache.validate(pg_filepath, collections_src, processes_src=processes_src, parameters=parameters,
+                              validate_arguments=validate_arguments, mode=mode, max_errors=max_errors,
+                              tracer=tracer)
+
+    if mode == "fail_fast":
+        max_errors = 1
+    elif mode != "full":
+        err_msg = "Validation mode '{}' unknown.".format(mode)
+        raise ValueError(err_msg)
+
+    tracer = tracer if tracer is not None else NULL_TRACER
+    with tracer.span("validate_process_graph") as span:
+        # all validators share the same errors, which are collected in the order of the nodes
+        errors = ErrorCollector(max_errors=max_errors)
+        # the process catalog is loaded once and shared by the translation and the validation
+        with tracer.span("load_processes"):
+            process_validator = ProcessValidator(processes_src, errors=errors)
+        validators = [process_validator, CollectionValidator(collections_src, errors=errors)]
+        if validate_arguments:
+            validators.append(ArgumentValidator(processes_src, errors=errors,
+                                                process_defs=process_validator.process_defs))
+        try:
+            translate_process_graph(pg_filepath, process_defs=process_validator.process_defs, parameters=parameters,
+                                    visitors=validators, tracer=tracer)
+        except ValidationAborted:
+            pass
+        span.set(errors=len(errors))
+
+    return len(errors) == 0, errors.errors
+
+
+def _directory_fingerprint(dirpath):
+    """ str : Fingerprint of a catalog directory based on the names, modification times and sizes of its files. """
+    file_stats = []
+    for filepath in sorted(glob.glob(os.path.join(dirpath, "*.json"))):
+        file_stat = os.stat(filepath)
+        file_stats.append([os.path.basename(filepath), file_stat.st_mtime_ns, file_stat.st_size])
+    return fingerprint(file_stats)
+
+
+class ValidationCache:
+    """
+    Least recently used cache of validation results. The results are keyed on a canonical hash of the process graph,
+    its parameters, the validation options and the identities of the process and the collection catalog. A catalog
+    is identified without loading it (see `ValidationCache.catalog_key`). Results obtained with other catalogs are
+    never returned, i.e. changing a catalog invalidates all entries; they are evicted by the least recently used
+    policy. The cache can optionally be backed by a JSON file, which is written by `save` or when leaving the context
+    of the cache. Results depending on a remote catalog without an explicit fingerprint are not written to the file,
+    since changes of the catalog cannot be detected.
+    """
+
+    def __init__(self, maxsize=128, filepath=None):
+        """
+        Constructor of `ValidationCache`.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of cached validation results (defaults to 128).
+        filepath : str, optional
+            Path to a JSON file storing the cache. If it exists, the cached results are loaded from it.
+
+        """
+
+        self.maxsize = maxsize
+        self.filepath = filepath
+        self.hits = 0
+        self.misses = 0
+        # validity and validation errors per key, the error messages are only formatted when saving the cache
+        self._entries = OrderedDict()
+        # keys of the results, which are not written to the backing file
+        self._volatile_keys = set()
+        if filepath is not None and os.path.exists(filepath):
+            for key, entry in load_json_file(filepath).items():
+                self._entries[key] = (entry["valid"], [ValidationError.from_dict(error_dict)
+                                                       for error_dict in entry["errors"]])
+
+    def save(self):
+        """ Writes all cached results apart from volatile ones to the backing file, if one is given. """
+        if self.filepath is None:
+            return
+        entries = OrderedDict([(key, {"valid": valid, "errors": [error.to_dict() for error in errors]})
+                               for key, (valid, errors) in self._entries.items() if key not in self._volatile_keys])
+        tmp_filepath = self.filepath + ".tmp"
+        with open(tmp_filepath, 'w') as file:
+            json.dump(entries, file)
+        os.replace(tmp_filepath, self.filepath)
+
+    def __enter__(self):
+        """ ValidationCache : Returns the cache itself. """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """ Writes the cached results to the backing file when leaving the context. """
+        self.save()
+
+    def get(self, key):
+        """
+        Returns a cached validation result.
+
+        Parameters
+        ----------
+        key : str
+            Cache key (see `ValidationCache.key`).
+
+        Returns
+        -------
+        tuple
+            Validity and list of validation errors or None, if no result is cached.
+
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        valid, errors = entry
+
+        return valid, list(errors)
+
+    def put(self, key, valid, errors, persistent=True):
+        """
+        Caches a validation result.
+
+        Parameters
+        ----------
+        key : str
+            Cache key (see `ValidationCache.key`).
+        valid : bool
+            Validity of the process graph.
+        errors : list of ValidationError
+            Validation errors.
+        persistent : bool, optional
+            If false, the result is not written to the backing file (defaults to True).
+
+        """
+
+        self._entries[key] = (valid, list(errors))
+        self._entries.move_to_end(key)
+        if persistent:
+            self._volatile_keys.discard(key)
+        else:
+            self._volatile_keys.add(key)
+        while len(self._entries) > self.maxsize:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._volatile_keys.discard(evicted_key)
+
+    def clear(self):
+        """ Removes all cached results. """
+        self._entries.clear()
+        self._volatile_keys.clear()
+
+    def __len__(self):
+        """ int : Number of cached results. """
+        return len(self._entries)
+
+    @staticmethod
+    def key(process_graph, parameters, processes_key, collections_key, **options):
+        """
+        Computes the cache key of a validation.
+
+        Parameters
+        ----------
+        process_graph : dict
+            openEO process graph.
+        parameters : dict
+            Globally defined parameters.
+        processes_key : object
+            JSON serialisable identity of the process catalog (see `ValidationCache.catalog_key`).
+        collections_key : object
+            JSON serialisable identity of the collection catalog (see `ValidationCache.catalog_key`).
+        **options
+            Further validation options.
+
+        Returns
+        -------
+        str
+
+        """
+
+        return fingerprint({"process_graph": process_graph, "parameters": parameters or dict(),
+                            "processes": processes_key, "collections": collections_key, "options": options})
+
+    @staticmethod
+    def catalog_key(src, catalog_fingerprint=None):
+        """
+        Identifies a catalog without loading it. A source string (directory path or URL) is combined with the given
+        fingerprint or, for a local directory, with a fingerprint of the names, modification times and sizes of its
+        files. A loaded catalog is identified by the given fingerprint or by the fingerprint of its definitions.
+
+        Parameters
+        ----------
+        src : dict or str or list
+            Source of the catalog (see `validate_process_graph`).
+        catalog_fingerprint : str, optional
+            Explicitly given fingerprint of the catalog, e.g. based on its version.
+
+        Returns
+        -------
+        object
+            JSON serialisable identity of the catalog.
+
+        Notes
+        -----
+        The fingerprint of a loaded catalog is cached per catalog object, so changes of a catalog modified in place
+        are not detected. Pass a new object or an explicit fingerprint after modifying a catalog.
+
+        """
+
+        if isinstance(src, str):
+            if catalog_fingerprint is None and os.path.isdir(src):
+                catalog_fingerprint = _directory_fingerprint(src)
+            return [src, catalog_fingerprint]
+        elif catalog_fingerprint is not None:
+            return catalog_fingerprint
+        else:
+            return _CATALOG_FINGERPRINTS.get(src, fingerprint)
+
+    def validate(self, pg_filepath, collections_src, processes_src=None, parameters=None, validate_arguments=False,
+                 mode="full", max_errors=None, processes_fingerprint=None, collections_fingerprint=None, tracer=None):
+        """
+        Validates a process graph (see `validate_process_graph`) or returns the cached result.
+
+        Parameters
+        ----------
+        pg_filepath : str or dict
+            File path to process graph (json file) or parsed file as a dictionary.
+        collections_src : dict or str or list
+            Collection catalog (see `validate_process_graph`).
+        processes_src : dict or str or list, optional
+            Process catalog (see `validate_process_graph`).
+        parameters : dict, optional
+            Globally defined parameters, which can be used in 'from_parameter'.
+        validate_arguments : bool, optional
+            If true, the argument values are validated against the JSON schemas of the process parameters.
+        mode : str, optional
+            Validation mode, "full" (default) or "fail_fast".
+        max_errors : int, optional
+            Maximum number of errors, after which the validation stops.
+        processes_fingerprint : str, optional
+            Fingerprint of the process catalog, e.g. based on its version. By default, it is derived as described in
+            `ValidationCache.catalog_key`. Results for a remote catalog without a fingerprint are only cached in
+            memory, but not written to the backing file.
+        collections_fingerprint : str, optional
+            Fingerprint of the collection catalog, e.g. based on its version. It is required for remote catalogs,
+            since fingerprinting them would require to download all collections. Otherwise, it is derived as for the
+            process catalog.
+        tracer : trace.Tracer, optional
+            Tracer recording the phases of the validation, if no cached result is available.
+
+        Returns
+        -------
+        valid : bool
+            If True, the given process graph is valid.
+        err_msgs : list of ValidationError
+            Structured validation errors if `valid` is False.
+
+        Notes
+        -----
+        The catalogs are only loaded if no cached result is available. A remote process catalog without a
+        fingerprint is assumed not to change as long as the cache is in memory.
+
+        """
 
-    process_graph = translate_process_graph(pg_filepath, process_defs=process_defs, parameters=parameters)
+        if collections_fingerprint is None and _source_type(collections_src) == "url":
+            err_msg = "A fingerprint of the remote collection catalog '{}' is required for caching validation " \
+                      "results, e.g. based on its version.".format(collections_src)
+            raise ValueError(err_msg)
 
-    proc_valid, proc_err_msgs = validate_processes(process_graph, process_defs)
-    coll_valid, coll_err_msgs = validate_collections(process_graph, collections_src)
+        process_graph = load_json_file(pg_filepath) if isinstance(pg_filepath, str) else pg_filepath
+        processes_src = DEFAULT_PROCESSES_SRC if processes_src is None else processes_src
+        key = self.key(process_graph, parameters, self.catalog_key(processes_src, processes_fingerprint),
+                       self.catalog_key(collections_src, collections_fingerprint),
+                       validate_arguments=validate_arguments, mode=mode, max_errors=max_errors)
+        result = self.get(key)
+        metrics.record_cache_lookup("validation_results", result is not None)
+        if result is not None:
+            self.hits += 1
+            return result
 
-    pg_err_msgs = proc_err_msgs + coll_err_msgs
-    pg_valid = proc_valid & coll_valid
+        self.misses += 1
+        # the translation modifies the process graph, so a copy is validated
+        valid, errors = validate_process_graph(copy.deepcopy(process_graph), collections_src,
+                                               processes_src=processes_src, parameters=parameters,
+                                               validate_arguments=validate_arguments, mode=mode,
+                                               max_errors=max_errors, tracer=tracer)
+        self.put(key, valid, errors,
+                 persistent=processes_fingerprint is not None or _source_type(processes_src) != "url")
 
-    return pg_valid, pg_err_msgs
+        return valid, errors
 
 
 if __name__ == '__main__':
@@ -0,0 +1,123 @@
+import os
+import time
+import unittest
+import threading
+from openeo_pg_parser.cost import CostModel
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.execute import GraphExecutor
+from openeo_pg_parser.execute import ExecutionError
+from openeo_pg_parser.execute import ExecutionCancelled
+from openeo_pg_parser.execute import execute_process_graph
+
+OPENEO_PROCESSES_ENDPOINT = "https://processes.openeo.org/1.2.0/processes.json"
+
+
+def load_collection(bands=None, **kwargs):
+    return [{"B4": 0.1, "B8": 0.5}, {"B4": 0.2, "B8": 0.4}, {"B4": 0.3, "B8": 0.3}]
+
+
+def reduce_dimension(data, reducer, dimension, context=None):
+    if dimension == "bands":
+        return [reducer(data=timestep, context=context) for timestep in data]
+    else:
+        return reducer(data=data, context=context)
+
+
+def apply(data, process, context=None):
+    return process(x=data, context=context)
+
+
+IMPLEMENTATIONS = {
+    "load_collection": load_collection,
+    "reduce_dimension": reduce_dimension,
+    "apply": apply,
+    "array_element": lambda data, label=None, **kwargs: data[label],
+    "normalized_difference": lambda x, y: (x - y) / (x + y),
+    "max": lambda data, **kwargs: max(data),
+    "linear_scale_range": lambda x, inputMin, inputMax, outputMin=0, outputMax=1:
+        (x - inputMin) / (inputMax - inputMin) * (outputMax - outputMin) + outputMin,
+    "save_result": lambda data, format, options=None: data,
+}
+
+
+class ExecuteTester(unittest.TestCase):
+    """  Testing the module `execute` for executing translated process graphs. """
+
+    def setUp(self):
+        """ Setting up variables for one test. """
+        pg_filepath = os.path.join(os.path.dirname(__file__), 'process_graphs', "s2_max_ndvi.json")
+        self.graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+    def test_execute_process_graph(self):
+        """ Tests execution of a process graph including callbacks. """
+        results = execute_process_graph(self.graph, IMPLEMENTATIONS)
+
+        assert set(results.keys()) == {"load_collection_2", "reduce_bands_3", "reduce_time_7", "apply_0", "save_9"}
+        assert results["reduce_time_7"] == (0.5 - 0.1) / (0.5 + 0.1)
+        assert results["save_9"] == (results["reduce_time_7"] + 1) / 2 * 255
+
+    def test_timings(self):
+        """ Tests that the execution time of each node is recorded. """
+        executor = GraphExecutor(self.graph, IMPLEMENTATIONS, max_workers=2)
+        results = executor.run()
+
+        # nodes of embedded process graphs are timed as well
+        assert set(executor.timings.keys()) == set(self.graph.ids)
+        assert set(results.keys()) < set(executor.timings.keys())
+
+    def test_cost_model_priority(self):
+        """ Tests execution with nodes being prioritised by a cost model. """
+        executor = GraphExecutor(self.graph, IMPLEMENTATIONS, cost_model=CostModel())
+        results = executor.run()
+
+        assert results["save_9"] == (results["reduce_time_7"] + 1) / 2 * 255
+
+    def test_missing_implementation(self):
+        """ Tests that missing process implementations are reported before the execution. """
+        implementations = dict(IMPLEMENTATIONS)
+        del implementations["max"]
+
+        with self.assertRaises(ValueError):
+            GraphExecutor(self.graph, implementations)
+
+    def test_error_propagation(self):
+        """ Tests that an error of a process implementation is raised together with the node ID. """
+        def failing_apply(**kwargs):
+            raise RuntimeError("apply failed")
+        implementations = dict(IMPLEMENTATIONS, apply=failing_apply)
+
+        with self.assertRaises(ExecutionError) as context:
+            execute_process_graph(self.graph, implementations)
+        assert context.exception.node_id == "apply_0"
+
+    def test_cancel(self):
+        """ Tests cancellation of a running execution. """
+        started = threading.Event()
+
+        def slow_load_collection(**kwargs):
+            started.set()
+            time.sleep(0.2)
+            return load_collection()
+        implementations = dict(IMPLEMENTATIONS, load_collection=slow_load_collection)
+        executor = GraphExecutor(self.graph, implementations)
+
+        def cancel():
+            started.wait()
+            executor.cancel()
+        threading.Thread(target=cancel).start()
+
+        with self.assertRaises(ExecutionCancelled):
+            executor.run(poll_interval=0.01)
+
+    def test_cancel_before_run(self):
+        """ Tests that a cancellation before the execution cancels the next execution only. """
+        executor = GraphExecutor(self.graph, IMPLEMENTATIONS)
+        executor.cancel()
+
+        with self.assertRaises(ExecutionCancelled):
+            executor.run()
+        assert executor.run()["save_9"] is not None
+
+
+if __name__ == '__main__':
+    unittest.main()
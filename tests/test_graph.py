@@ -1,5 +1,13 @@
 import os
+import copy
+import struct
 import unittest
+from openeo_pg_parser.cost import CostModel
+from openeo_pg_parser.graph import Graph
+from openeo_pg_parser.graph import create_edge
+from openeo_pg_parser.graph import SERIALISATION_MAGIC
+from openeo_pg_parser.utils import load_processes
+from openeo_pg_parser.utils import load_json_file
 from openeo_pg_parser.translate import translate_process_graph
 
 OPENEO_PROCESSES_ENDPOINT = "https://processes.openeo.org/1.2.0/processes.json"
@@ -23,6 +31,45 @@ class GraphTester(unittest.TestCase):
         assert list(sorted_graph.ids) == ["load_collection_2", "reduce_bands_3", "red_4", "nir_5", "ndvi_6",
                                           "reduce_time_7", "max_8", "apply_0", "linear_scale_range_1", "save_9"]
 
+    def test_execution_levels(self):
+        """ Tests grouping of independent nodes into execution levels. """
+        pg_filepath = os.path.join(os.path.dirname(self.max_ndvi_pg_filepath), "s1_uc1_temporal.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        levels = graph.execution_levels(by='dependency')
+        assert list(levels[0].ids) == ["march_0", "april_1", "may_2"]
+        assert sum([len(level) for level in levels]) == len(graph)
+        assert graph.critical_path_length() == len(levels)
+
+    def test_critical_path(self):
+        """ Tests computation of the critical path and the slack of each node. """
+        pg_filepath = os.path.join(os.path.dirname(self.max_ndvi_pg_filepath), "s1_uc1_temporal.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        critical_path = graph.critical_path(CostModel({'mean': lambda node: 5.}))
+        assert list(critical_path.ids)[:3] == ["march_0", "mean_march_3", "mean_4"]
+        assert list(critical_path.ids)[-1] == "save_result_16"
+        assert all([node.slack == 0 for node in critical_path.nodes])
+        assert graph['april_1'].cost == 30.
+        assert graph['april_1'].slack == 1.
+        assert graph['save_result_16'].cumulative_cost == 43.
+
+    def test_sort_single_node(self):
+        """ Tests sorting of a process graph consisting of only one node without any edges. """
+        pg_filepath = os.path.join(os.path.dirname(self.max_ndvi_pg_filepath), "s2_missing_bands.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        assert list(graph.sort(by='dependency').ids) == ["loadco1_0"]
+
+    def test_sort_cycle(self):
+        """ Tests that sorting a cyclic graph raises an error naming the nodes of the cycle. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        create_edge(graph['save_9'], graph['load_collection_2'], name="process")
+
+        with self.assertRaises(ValueError) as context:
+            graph.sort(by='dependency')
+        assert "save_9 -> load_collection_2" in str(context.exception)
+
     def test_get_parent_process(self):
         """ Tests to retrieve the parent process of an embedded process graph. """
         graph = translate_process_graph(self.max_ndvi_pg_filepath,process_defs=OPENEO_PROCESSES_ENDPOINT)
@@ -67,6 +114,169 @@ class GraphTester(unittest.TestCase):
         apply_node = graph['apply']
         assert apply_node.id == 'apply_0'
 
+    def test_get_node_by_index(self):
+        """ Tests node access in a graph by positional index. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        assert graph[0].id == 'apply_0'
+        assert graph[-1].id == 'save_9'
+
+    def test_secondary_indexes(self):
+        """ Tests node queries by name, process ID and depth. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        assert list(graph.by_process_id('reduce_dimension').ids) == ['reduce_bands_3', 'reduce_time_7']
+        assert list(graph.by_name('max').ids) == ['max_8']
+        assert list(graph.by_depth(1).ids) == ['linear_scale_range_1', 'red_4', 'nir_5', 'ndvi_6', 'max_8']
+        assert len(graph.by_process_id('filter_bands')) == 0
+
+    def test_index_invalidation(self):
+        """ Tests that indexes are only rebuilt if edges are added to nodes of the same graph. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        graph_other = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        name_index = graph._attribute_index("name")
+
+        create_edge(graph_other['red_4'], graph_other['nir_5'], name="test")
+        assert graph._attribute_index("name") is name_index
+
+        create_edge(graph['red_4'], graph['nir_5'], name="test")
+        assert graph._attribute_index("name") is not name_index
+        assert graph.is_descendant(graph['nir_5'], graph['red_4'], link="test")
+
+    def test_array_conversion(self):
+        """ Tests the conversion of a graph to CSR arrays and back. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        arrays = graph.to_arrays()
+
+        assert list(arrays['ids']) == list(graph.ids)
+        assert sorted(arrays['edges'].keys()) == ['callback', 'data', 'process']
+        assert list(arrays['depth']) == [node.depth for node in graph.nodes]
+        assert [arrays['process_ids'][code] for code in arrays['process_codes']] == \
+               [node.process_id for node in graph.nodes]
+        data_csr = arrays['edges']['data']
+        dc_idx = list(graph.ids).index('load_collection_2')
+        successor_ids = {arrays['ids'][j] for j in data_csr['indices'][data_csr['indptr'][dc_idx]:
+                                                                        data_csr['indptr'][dc_idx + 1]]}
+        assert successor_ids == set(graph['load_collection_2'].descendants('data').ids)
+
+        graph_restored = Graph.from_arrays(arrays)
+        assert list(graph_restored.ids) == list(graph.ids)
+        for node in graph.nodes:
+            node_restored = graph_restored[node.id]
+            assert node_restored.process_id == node.process_id
+            for link in ('process', 'data', 'callback'):
+                assert sorted(node_restored.descendants(link).ids) == sorted(node.descendants(link).ids)
+
+    def test_to_process_graph(self):
+        """ Tests that converting translated graphs back to process graphs restores the original process graphs. """
+        pg_dirpath = os.path.dirname(self.max_ndvi_pg_filepath)
+        parameters = {'s2_max_ndvi_global_parameter.json': {'test_from_parameter': 3}}
+        for filename in sorted(os.listdir(pg_dirpath)):
+            pg_filepath = os.path.join(pg_dirpath, filename)
+            graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT,
+                                            parameters=parameters.get(filename))
+            assert graph.to_process_graph()['process_graph'] == load_json_file(pg_filepath)['process_graph'], \
+                filename
+
+    def test_to_process_graph_ids(self):
+        """ Tests conversion of a graph to a process graph using node IDs as node names. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        process_graph = graph.to_process_graph(use_ids=True)['process_graph']
+
+        assert list(process_graph.keys()) == ['apply_0', 'load_collection_2', 'reduce_bands_3', 'reduce_time_7',
+                                              'save_9']
+        assert process_graph['reduce_time_7']['arguments']['data'] == {'from_node': 'reduce_bands_3'}
+        assert list(process_graph['reduce_time_7']['arguments']['reducer']['process_graph'].keys()) == ['max_8']
+
+    def test_structural_hashes(self):
+        """ Tests that structural hashes do not depend on node names, but on the computation of each node. """
+        process_graph = load_json_file(self.max_ndvi_pg_filepath)
+        graph = translate_process_graph(copy.deepcopy(process_graph), process_defs=OPENEO_PROCESSES_ENDPOINT)
+        # the hashes are computed on first access, only for the node and the nodes it depends on
+        assert graph['reduce_bands_3'].structural_hash is not None
+        assert graph['save_9']._structural_hash is None
+        hashes = {node.id: node.structural_hash for node in graph.nodes}
+        assert graph.compute_structural_hashes() == hashes
+
+        # rename the NDVI node
+        process_graph_renamed = copy.deepcopy(process_graph)
+        reducer_pg = process_graph_renamed['process_graph']['reduce_bands']['arguments']['reducer']['process_graph']
+        reducer_pg['ndvi_renamed'] = reducer_pg.pop('ndvi')
+        graph_renamed = translate_process_graph(process_graph_renamed, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        assert [node.structural_hash for node in graph.nodes] == [node.structural_hash for node in graph_renamed.nodes]
+
+        # change the temporal extent
+        process_graph['process_graph']['load_collection']['arguments']['temporal_extent'][0] = "2018-01-02"
+        graph_changed = translate_process_graph(process_graph, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        changed_ids = {node.id for node in graph.nodes
+                       if node.structural_hash != graph_changed[node.id].structural_hash}
+        assert changed_ids == {'load_collection_2', 'reduce_bands_3', 'reduce_time_7', 'apply_0', 'save_9'}
+
+    def test_key_paths(self):
+        """ Tests that the key paths of a node are compiled once and shared by the translation steps. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        node = graph['reduce_bands_3']
+
+        key_path = node.key_path(["arguments", "data", "from_node"])
+        assert key_path is node.key_path(("arguments", "data", "from_node"))
+        assert key_path.get(node.content) == 'load_collection_2'
+        # the embedded process graph was replaced using the cached key path of its location
+        assert node.key_path(["arguments", "reducer"]).get(node.content) == {"from_node": "ndvi_6"}
+
+    def test_graph_view(self):
+        """ Tests that relatives are returned as lazy views with the same interface as a graph. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        node = graph['reduce_bands_3']
+
+        children = node.child_processes
+        assert len(children) == 3
+        assert children[0].id == 'red_4'
+        assert children['ndvi_6'] is graph['ndvi_6']
+        assert children['ndvi'] is graph['ndvi_6']
+        assert list(children.ids) == ['red_4', 'nir_5', 'ndvi_6']
+        assert children._node_dict is None
+
+        # relatives connected via several links are only contained once
+        dependencies = node.dependencies
+        assert sorted(dependencies.ids) == ['load_collection_2', 'ndvi_6']
+        assert len(node.relatives(ancestor=False)) == len(set(node.relatives(ancestor=False).ids))
+
+    def test_serialisation(self):
+        """ Tests serialisation of a translated graph and restoring it from a process catalog. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        processes = load_processes(OPENEO_PROCESSES_ENDPOINT)
+        structural_hash = graph['reduce_bands_3'].structural_hash
+        graph_restored = Graph.loads(graph.dumps(), process_defs=processes)
+        # only the structural hashes computed before are stored, the others are computed when needed
+        assert graph['save_9']._structural_hash is None
+        assert graph_restored['reduce_bands_3']._structural_hash == structural_hash
+        assert graph_restored['save_9']._structural_hash is None
+        assert graph_restored['save_9'].structural_hash == graph['save_9'].structural_hash
+
+        assert list(graph_restored.ids) == list(graph.ids)
+        assert list(graph_restored.sort(by='dependency').ids) == list(graph.sort(by='dependency').ids)
+        for node in graph.nodes:
+            node_restored = graph_restored[node.id]
+            assert node_restored.content == node.content
+            assert node_restored.keys == node.keys
+            assert node_restored.process.definition is processes[node.process_id]
+            assert len(node_restored.edges) == len(node.edges)
+        # edges are shared by both of their nodes
+        edge = graph_restored['load_collection_2'].edges[0]
+        assert any([other_edge is edge for other_edge in edge.nodes[1].edges])
+
+        processes_changed = dict(processes)
+        processes_changed['max'] = dict(processes['max'], description="changed")
+        with self.assertRaises(ValueError):
+            Graph.loads(graph.dumps(), process_defs=processes_changed)
+        with self.assertRaises(ValueError):
+            Graph.loads(b"no graph", process_defs=processes)
+        # graphs serialised with other format versions are rejected
+        data = graph.dumps()
+        data_v1 = SERIALISATION_MAGIC + struct.pack(">H", 1) + data[len(SERIALISATION_MAGIC) + 2:]
+        with self.assertRaises(ValueError):
+            Graph.loads(data_v1, process_defs=processes)
+
     def test_has_descendant_process(self):
         """ Tests if a node has a descendant process. """
         graph = translate_process_graph(self.max_ndvi_pg_filepath,process_defs=OPENEO_PROCESSES_ENDPOINT)
@@ -74,12 +284,75 @@ class GraphTester(unittest.TestCase):
         dc_node = graph['load_collection_2']
         assert dc_node.has_descendant_process(graph, 'save_result')
 
+    def test_is_ancestor(self):
+        """ Tests reachability queries between two nodes. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        dc_node = graph['load_collection_2']
+        save_node = graph['save_9']
+        assert graph.is_ancestor(dc_node, save_node, link='process')
+        assert not graph.is_ancestor(save_node, dc_node, link='process')
+        assert graph.is_descendant(save_node, dc_node, link='process')
+        assert not dc_node.has_descendant_process(graph, 'array_element')
+
+    def test_lineage_update(self):
+        """ Tests that the memoized lineage of a node is updated after adding an edge. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        ndvi_node = graph['ndvi_6']
+        assert 'max_8' not in graph.lineage(ndvi_node, link='data', ancestors=False).ids
+        create_edge(ndvi_node, graph['max_8'], name="data")
+        assert 'max_8' in graph.lineage(ndvi_node, link='data', ancestors=False).ids
+
+    def test_prune(self):
+        """ Tests removal of all nodes, which do not contribute to a target node. """
+        pg_filepath = os.path.join(os.path.dirname(self.max_ndvi_pg_filepath), "s1_uc1_temporal.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        pruned_graph, removed_ids = graph.prune()
+        assert len(pruned_graph) == len(graph)
+        assert removed_ids == []
+
+        pruned_graph, removed_ids = graph.prune(targets=['mean_march_3'])
+        assert list(pruned_graph.ids) == ["march_0", "mean_march_3", "mean_4"]
+        assert len(removed_ids) == len(graph) - 3
+        assert pruned_graph['mean_march_3'].is_result
+        assert not graph['mean_march_3'].is_result
+        assert pruned_graph['mean_4'].parent_process is pruned_graph['mean_march_3']
+
+        # only the last of several targets becomes the result node
+        pruned_graph, _ = graph.prune(targets=['mean_march_3', 'march_0', 'mean_april_5'])
+        result_ids = [node.id for node in pruned_graph.nodes if node.is_result and node.parent_process is None]
+        assert result_ids == ['mean_april_5']
+        process_graph = pruned_graph.to_process_graph()
+        translate_process_graph(process_graph, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        # nodes of embedded process graphs cannot become the result of the pruned graph
+        with self.assertRaises(ValueError):
+            graph.prune(targets=['mean_4'])
+
     def test_to_igraph(self):
         """ Tests conversion of internal graph to an iGraph object. """
         graph = translate_process_graph(self.max_ndvi_pg_filepath,process_defs=OPENEO_PROCESSES_ENDPOINT)
         graph.to_igraph(edge_name="process")
         assert True
 
+    def test_exporters(self):
+        """ Tests the conversion of a graph to an edge list, an adjacency dictionary and DOT. """
+        graph = translate_process_graph(self.max_ndvi_pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        ig_graph = graph.to_igraph()
+        edge_list = list(graph.iter_edge_list())
+        adjacency = dict(graph.iter_adjacency(edge_name="data"))
+        dot_lines = list(graph.iter_dot())
+
+        assert ig_graph.vs["name"] == list(graph.ids)
+        assert ig_graph.ecount() == len(edge_list)
+        assert ('load_collection_2', 'reduce_bands_3', {'name': 'data'}) in edge_list
+        assert list(adjacency.keys()) == list(graph.ids)
+        assert adjacency['reduce_bands_3'] == ['red_4', 'nir_5', 'reduce_time_7']
+        assert dot_lines[0] == "digraph {" and dot_lines[-1] == "}"
+        assert len(dot_lines) == len(graph) + len(edge_list) + 2
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import os
+import unittest
+import threading
+from openeo_pg_parser import metrics
+from openeo_pg_parser.metrics import MetricsRegistry
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.utils import IdentityCache
+
+OPENEO_PROCESSES_ENDPOINT = "https://processes.openeo.org/1.2.0/processes.json"
+
+class MetricsTester(unittest.TestCase):
+    """  Tests the metrics of the catalog loaders recorded with the module `metrics`. """
+
+    def setUp(self):
+        """ Setting up variables for one test. """
+        self.pg_dirpath = os.path.join(os.path.dirname(__file__), 'process_graphs')
+
+    def test_prometheus_format(self):
+        """ Tests the export of counters in the Prometheus text exposition format. """
+        registry = MetricsRegistry()
+        registry.inc("openeo_pg_parser_http_requests_total", loader="load_processes", status="200")
+        registry.inc("openeo_pg_parser_http_requests_total", 2, loader="load_collections", status="200")
+        registry.inc("openeo_pg_parser_cache_requests_total", cache='a "b"', result="hit")
+
+        assert registry.get("openeo_pg_parser_http_requests_total") == 3
+        assert registry.get("openeo_pg_parser_http_requests_total", loader="load_collections") == 2
+        assert registry.to_prometheus() == \
+            '# HELP openeo_pg_parser_cache_requests_total Cache lookups by cache and result (hit or miss).\n' \
+            '# TYPE openeo_pg_parser_cache_requests_total counter\n' \
+            'openeo_pg_parser_cache_requests_total{cache="a \\"b\\"",result="hit"} 1\n' \
+            '# HELP openeo_pg_parser_http_requests_total HTTP requests sent by the catalog loaders by loader and ' \
+            'status code.\n' \
+            '# TYPE openeo_pg_parser_http_requests_total counter\n' \
+            'openeo_pg_parser_http_requests_total{loader="load_processes",status="200"} 1\n' \
+            'openeo_pg_parser_http_requests_total{loader="load_collections",status="200"} 2\n'
+
+        registry.reset()
+        assert registry.to_prometheus() == ""
+
+    def test_concurrent_increments(self):
+        """ Tests that counters incremented by several threads do not lose any increments. """
+        registry = MetricsRegistry()
+
+        def increment():
+            for _ in range(10000):
+                registry.inc("openeo_pg_parser_loader_calls_total", loader="load_processes", source="url")
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.get("openeo_pg_parser_loader_calls_total") == 40000
+
+    def test_scopes(self):
+        """ Tests that nested scopes only collect the metrics recorded within their context. """
+        n_requests = metrics.REGISTRY.get("openeo_pg_parser_http_requests_total")
+        with metrics.scope() as outer_registry:
+            metrics.record_http_request("load_processes", 200, 100, 0.5)
+            with metrics.scope() as inner_registry:
+                metrics.record_http_request("load_collections", 404, 10, 0.1)
+        metrics.record_http_request("load_collections", 200, 10, 0.1)
+
+        assert outer_registry.get("openeo_pg_parser_http_requests_total") == 2
+        assert outer_registry.get("openeo_pg_parser_http_response_bytes_total") == 110
+        assert inner_registry.get("openeo_pg_parser_http_requests_total", status="404") == 1
+        assert inner_registry.get("openeo_pg_parser_http_wait_seconds_total") == 0.1
+        assert metrics.REGISTRY.get("openeo_pg_parser_http_requests_total") == n_requests + 3
+
+    def test_identity_cache_metrics(self):
+        """ Tests that hits and misses of a named cache are recorded. """
+        cache = IdentityCache(name="test")
+        key = object()
+        with metrics.scope() as registry:
+            cache.get(key, id)
+            cache.get(key, id)
+
+        assert registry.get("openeo_pg_parser_cache_requests_total", cache="test", result="miss") == 1
+        assert registry.get("openeo_pg_parser_cache_requests_total", cache="test", result="hit") == 1
+
+    def test_translation_metrics(self):
+        """ Tests that the process catalog is loaded once and reused by all nodes during a translation. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi.json")
+        with metrics.scope() as registry:
+            graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        assert registry.get("openeo_pg_parser_loader_calls_total", loader="load_processes") == 1
+        # passing the loaded catalog through is neither a load nor a cache hit
+        assert registry.get("openeo_pg_parser_catalog_reuses_total", loader="load_processes") >= len(graph)
+        assert registry.get("openeo_pg_parser_cache_requests_total") == 0
+        assert registry.get("openeo_pg_parser_loader_seconds_total", loader="load_processes") >= \
+            registry.get("openeo_pg_parser_http_wait_seconds_total", loader="load_processes")
+
+
+if __name__ == '__main__':
+    unittest.main()
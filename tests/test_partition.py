@@ -0,0 +1,77 @@
+import os
+import unittest
+from openeo_pg_parser.cost import CostModel
+from openeo_pg_parser.partition import partition_graph
+from openeo_pg_parser.translate import translate_process_graph
+
+OPENEO_PROCESSES_ENDPOINT = "https://processes.openeo.org/1.2.0/processes.json"
+
+
+class PartitionTester(unittest.TestCase):
+    """  Testing the module `partition` for splitting translated process graphs. """
+
+    def setUp(self):
+        """ Setting up variables for one test. """
+        pg_filepath = os.path.join(os.path.dirname(__file__), 'process_graphs', "s1_uc1_temporal.json")
+        self.graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+    def test_partition_graph(self):
+        """ Tests that callbacks are kept together and that all data flows to higher partitions. """
+        process_graphs, manifest = partition_graph(self.graph, 3, cost_model=CostModel())
+
+        assert len(process_graphs) == 3
+        assert set(manifest["assignment"].keys()) == set(self.graph.ids)
+        assert manifest["assignment"]["mean_4"] == manifest["assignment"]["mean_march_3"]
+        for transfer in manifest["transfers"]:
+            assert transfer["from_partition"] < transfer["to_partition"]
+            parameter_names = [parameter["name"] for parameter in
+                               process_graphs[transfer["to_partition"]]["parameters"]]
+            assert transfer["parameter"] in parameter_names
+
+    def test_translate_partitions(self):
+        """ Tests that each partition is a valid standalone process graph. """
+        process_graphs, _ = partition_graph(self.graph, 2)
+
+        for process_graph in process_graphs:
+            parameters = {parameter["name"]: "data" for parameter in process_graph["parameters"]}
+            graph = translate_process_graph(process_graph, process_defs=OPENEO_PROCESSES_ENDPOINT,
+                                            parameters=parameters)
+            assert len([node for node in graph.nodes if node.is_result and node.parent_process is None]) == 1
+
+    def test_declare_global_parameters(self):
+        """ Tests that parameters of the original process graph are declared with their values as defaults. """
+        pg_filepath = os.path.join(os.path.dirname(__file__), 'process_graphs', "lc_global_parameter.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT)
+        process_graphs, _ = partition_graph(graph, 1)
+
+        parameters = {parameter["name"]: parameter.get("default") for parameter in process_graphs[0]["parameters"]}
+        assert parameters == {"collection-id": "COPERNICUS/S2", "bands": ["B08", "B04", "B02"]}
+        assert process_graphs[0]["process_graph"]["dc_0"]["arguments"]["bands"] == {"from_parameter": "bands"}
+
+    def test_declare_global_parameters_in_callbacks(self):
+        """ Tests that global parameters referenced in embedded process graphs are declared, but not callback ones. """
+        pg_filepath = os.path.join(os.path.dirname(__file__), 'process_graphs', "s2_max_ndvi_global_parameter.json")
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT,
+                                        parameters={'test_from_parameter': 3})
+        process_graphs, manifest = partition_graph(graph, 2)
+
+        partition_idx = manifest["assignment"]["reduce_bands_3"]
+        parameters = {parameter["name"]: parameter.get("default")
+                      for parameter in process_graphs[partition_idx]["parameters"]}
+        assert parameters.get("test_from_parameter") == 3
+        assert "data" not in parameters and "x" not in parameters
+        for process_graph in process_graphs:
+            parameters = {parameter["name"]: "data" for parameter in process_graph["parameters"]
+                          if "default" not in parameter}
+            translate_process_graph(process_graph, process_defs=OPENEO_PROCESSES_ENDPOINT, parameters=parameters)
+
+    def test_single_partition(self):
+        """ Tests that a single partition contains the whole process graph without any transfers. """
+        process_graphs, manifest = partition_graph(self.graph, 1)
+
+        assert len(process_graphs[0]["process_graph"]) == 13
+        assert manifest["transfers"] == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import unittest
+import tracemalloc
+from openeo_pg_parser.trace import Tracer
+from openeo_pg_parser.trace import MemoryTracer
+from openeo_pg_parser.trace import MemoryLimitExceeded
+from openeo_pg_parser.trace import NULL_TRACER
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.utils import load_json_file
+from openeo_pg_parser.utils import load_processes
+
+OPENEO_PROCESSES_ENDPOINT = "https://processes.openeo.org/1.2.0/processes.json"
+
+class TraceTester(unittest.TestCase):
+    """  Tests the instrumentation of the translation with the module `trace`. """
+
+    def setUp(self):
+        """ Setting up variables for one test. """
+        self.pg_dirpath = os.path.join(os.path.dirname(__file__), 'process_graphs')
+
+    def test_nested_spans(self):
+        """ Tests the nesting of spans and the statistics per phase. """
+        tracer = Tracer(trace_id="0" * 32, parent_span_id="1" * 16)
+        with tracer.span("outer") as outer_span:
+            for _ in range(2):
+                with tracer.span("inner", nodes=3):
+                    pass
+            outer_span.set(edges=4)
+
+        stats = tracer.to_dict()
+        assert list(stats.keys()) == ["inner", "outer"]
+        assert stats["inner"]["calls"] == 2
+        assert stats["inner"]["nodes"] == 6
+        assert stats["outer"]["edges"] == 4
+        assert stats["outer"]["wall_time"] >= stats["inner"]["wall_time"]
+
+        spans = tracer.to_spans()
+        assert [span["parent_span_id"] for span in spans] == [spans[2]["span_id"]] * 2 + ["1" * 16]
+        assert all([span["trace_id"] == "0" * 32 for span in spans])
+        assert spans[0]["start_time_unix_nano"] <= spans[0]["end_time_unix_nano"]
+
+        tracer.reset()
+        assert tracer.to_dict() == {}
+
+    def test_failed_span(self):
+        """ Tests that a span is recorded with the error type if an exception is raised within its context. """
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span("failing"):
+                raise ValueError()
+
+        assert tracer.to_spans()[0]["attributes"] == {"error": "ValueError"}
+        assert tracer.to_dict()["failing"]["calls"] == 1
+
+    def test_null_tracer(self):
+        """ Tests that the default tracer does not record anything. """
+        with NULL_TRACER.span("phase", nodes=1) as span:
+            span.set(edges=1)
+        assert not NULL_TRACER.enabled
+        assert not hasattr(NULL_TRACER, "spans")
+
+    def test_trace_translation(self):
+        """ Tests that all phases of the translation and later sortings of the graph are recorded. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi.json")
+        tracer = Tracer()
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT, tracer=tracer)
+        graph.sort(by='dependency').sort(by='result')
+
+        stats = tracer.to_dict()
+        assert list(stats.keys()) == ["load_processes", "walk_process_graph", "adjust_from_nodes", "update",
+                                      "adjust_callbacks", "translate_process_graph", "sort"]
+        assert stats["walk_process_graph"]["nodes"] == len(graph)
+        assert stats["translate_process_graph"]["edges"] == graph.n_edges
+        assert stats["sort"]["calls"] == 2
+
+        root_span_id = [span["span_id"] for span in tracer.to_spans() if span["name"] == "translate_process_graph"][0]
+        assert all([span["parent_span_id"] == root_span_id for span in tracer.to_spans()
+                    if span["name"] not in ["translate_process_graph", "sort"]])
+
+    def test_memory_tracer(self):
+        """ Tests that the memory allocations, allocation sites and the graph footprint are reported. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi.json")
+        tracer = MemoryTracer(top_n=3)
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT, tracer=tracer)
+        assert not tracemalloc.is_tracing()
+        # memory tracers are not attached to the graph
+        assert graph.tracer is not tracer
+
+        report = tracer.report(graph)
+        walk_stats = report["phases"]["walk_process_graph"]
+        assert walk_stats["allocated_bytes"] > 0
+        assert walk_stats["peak_bytes"] >= walk_stats["allocated_bytes"]
+        assert report["phases"]["translate_process_graph"]["allocated_bytes"] >= walk_stats["allocated_bytes"]
+        assert 0 < len(report["allocations"]["walk_process_graph"]) <= 3
+        assert set(report["allocations"]["walk_process_graph"][0].keys()) == {"location", "size_diff", "count_diff"}
+
+        footprint = report["footprint"]
+        assert footprint["nodes"] == len(graph)
+        assert footprint["edges"] == graph.n_edges
+        assert footprint["bytes_per_node"] > footprint["bytes_per_edge"] > 0
+
+    def test_memory_limits(self):
+        """ Tests that the translation is aborted if a memory limit is exceeded. """
+        process_graph = load_json_file(os.path.join(self.pg_dirpath, "s2_max_ndvi.json"))
+        process_defs = load_processes(OPENEO_PROCESSES_ENDPOINT)
+        tracer = MemoryTracer(max_phase_bytes=1000, top_n=0, check_interval=1)
+        with self.assertRaises(MemoryLimitExceeded) as context:
+            translate_process_graph(process_graph, process_defs=process_defs, tracer=tracer)
+        # phases include the allocations of their nested phases
+        assert context.exception.phase in ["translate_process_graph", "walk_process_graph"]
+        assert context.exception.size > context.exception.limit == 1000
+        assert str(context.exception).startswith("Memory limit of 1000 bytes per phase exceeded")
+        assert tracer.to_spans()[-1]["attributes"]["error"] == "MemoryLimitExceeded"
+        assert not tracemalloc.is_tracing()
+
+        # the limits are checked for each node while traversing the process graph and linking the nodes
+        process_graph = load_json_file(os.path.join(self.pg_dirpath, "s2_max_ndvi.json"))
+        tracer = MemoryTracer(max_bytes=10 ** 12, top_n=0, check_interval=1)
+        graph = translate_process_graph(process_graph, process_defs=process_defs, tracer=tracer)
+        assert tracer._n_visited == 4 * len(graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,16 @@ class TranslateTester(unittest.TestCase):
         assert graph['dc_0'].arguments['bands'] == ['B08', 'B04', 'B02']
         assert graph['dc_0'].arguments['id'] == 'COPERNICUS/S2'
 
+    def test_lc_explicit_global_parameters(self):
+        """ Tests that explicitly given parameters take precedence over the defaults of the process graph. """
+        pg_filepath = os.path.join(self.pg_dirpath, "lc_global_parameter.json")
+        parameters = {'collection-id': 'COPERNICUS/S1'}
+        graph = translate_process_graph(pg_filepath, parameters=parameters, process_defs=OPENEO_PROCESSES_ENDPOINT)
+
+        assert graph['dc_0'].arguments['id'] == 'COPERNICUS/S1'
+        assert graph['dc_0'].arguments['bands'] == ['B08', 'B04', 'B02']
+        assert parameters == {'collection-id': 'COPERNICUS/S1'}
+
     def test_from_local_parameter(self):
         """ Tests parsing of a locally defined parameter. """
         pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi_local_parameter.json")
@@ -68,6 +78,16 @@ class TranslateTester(unittest.TestCase):
         assert list(graph['cc_1'].output_data_processes.ids)[0] == 'loadco1_0'
         assert list(graph['pf_2'].output_data_processes.ids)[0] == 'loadco1_0'
 
+    def test_visitors(self):
+        """ Tests that visitors are called once for each node with resolved 'from_parameter' arguments. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi_local_parameter.json")
+        visited = []
+        graph = translate_process_graph(pg_filepath, process_defs=OPENEO_PROCESSES_ENDPOINT,
+                                        visitors=[lambda node: visited.append((node.id, node.arguments.get('y')))])
+
+        assert [node_id for node_id, _ in visited] == list(graph.ids)
+        assert dict(visited)['ndvi_6'] == 3
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import unittest
+from openeo_pg_parser.utils import KeyPath
+from openeo_pg_parser.utils import IdentityCache
+from openeo_pg_parser.utils import iter_key_paths
+from openeo_pg_parser.utils import walk_process_dictionary
+
+
+class UtilsTester(unittest.TestCase):
+    """  Tests helper functions of the module `utils`. """
+
+    def setUp(self):
+        """ Setting up variables for one test. """
+        self.arguments = {"data": {"from_node": "dc"},
+                          "reducer": {"process_graph": {"max": {"arguments": {"data": {"from_parameter": "data"}}}}},
+                          "bands": ["B4", "B8"],
+                          "context": {}}
+
+    def test_iter_key_paths(self):
+        """ Tests enumeration of all leaf key paths. """
+        key_paths = list(iter_key_paths(self.arguments, break_points=["process_graph"]))
+        assert key_paths == [("data", "from_node"), ("reducer",), ("bands", 0), ("bands", 1), ("context",)]
+
+    def test_iter_key_paths_leaf_key(self):
+        """ Tests filtering of leaf key paths by their last key. """
+        key_paths = list(iter_key_paths(self.arguments, leaf_key="from_parameter"))
+        assert key_paths == [("reducer", "process_graph", "max", "arguments", "data", "from_parameter")]
+
+    def test_iter_key_paths_large_polygon(self):
+        """ Tests enumeration of leaf key paths of a large GeoJSON polygon. """
+        coordinates = [[[float(i), float(i)] for i in range(100000)]]
+        spatial_extent = {"type": "Polygon", "coordinates": coordinates}
+        assert len(list(iter_key_paths(spatial_extent))) == 200001
+        assert list(iter_key_paths(spatial_extent, leaf_key="from_node")) == []
+
+    def test_walk_process_dictionary(self):
+        """ Tests backwards compatibility of the dictionary walker. """
+        keys_lineage, _, _, _ = walk_process_dictionary(self.arguments, break_points=["process_graph"])
+        assert keys_lineage == [["data", "from_node"], ["reducer"], ["bands", 0], ["bands", 1], ["context"]]
+
+    def test_key_path(self):
+        """ Tests reading and writing via a compiled key path. """
+        key_path = KeyPath(["data", "from_node"], cache_parent=True)
+        assert key_path.get(self.arguments) == "dc"
+        key_path.set(self.arguments, "dc_0")
+        assert self.arguments["data"]["from_node"] == "dc_0"
+        assert key_path.parent(self.arguments) is self.arguments["data"]
+
+    def test_key_path_cache(self):
+        """ Tests that the cached parent container is only reused for the same object. """
+        key_path = KeyPath(["bands", 1], cache_parent=True)
+        assert key_path.get(self.arguments) == "B8"
+        assert key_path.get({"bands": ["B2", "B3"]}) == "B3"
+
+    def test_identity_cache(self):
+        """ Tests that values are cached per object identity and evicted in least recently used order. """
+        cache = IdentityCache(maxsize=2)
+        catalogs = [{"id": 1}, {"id": 1}, {"id": 2}]
+
+        assert cache.get(catalogs[0], len) == 1
+        assert cache.get(catalogs[0], lambda catalog: None) == 1
+        assert cache.get(catalogs[1], lambda catalog: 2) == 2
+        cache.get(catalogs[0], len)
+        cache.get(catalogs[2], len)
+        assert len(cache) == 2
+        assert cache.get(catalogs[1], lambda catalog: 3) == 3
+
+
+if __name__ == '__main__':
+    unittest.main()
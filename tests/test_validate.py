@@ -1,5 +1,16 @@
 import os
+import copy
+import json
 import unittest
+import tempfile
+from openeo_pg_parser import metrics
+from openeo_pg_parser.translate import translate_process_graph
+from openeo_pg_parser.utils import load_processes
+from openeo_pg_parser.validate import jsonschema
+from openeo_pg_parser.validate import ArgumentValidator
+from openeo_pg_parser.validate import CollectionValidator
+from openeo_pg_parser.validate import NodeValidator
+from openeo_pg_parser.validate import ValidationCache
 from openeo_pg_parser.validate import validate_process_graph
 
 GEE_PROCESSES = "https://earthengine.openeo.org/v1.0/processes"
@@ -46,6 +57,187 @@ class ValidateTester(unittest.TestCase):
 
         assert valid
 
+    def test_validate_collections_once(self):
+        """ Tests that each collection definition is only loaded once. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s1_uc1_temporal.json")
+        graph = translate_process_graph(pg_filepath, process_defs=GEE_PROCESSES)
+        validator = CollectionValidator("https://earthengine.openeo.org/v1.0/collections")
+        for node in graph.nodes:
+            validator(node)
+        assert validator.valid, validator.err_msgs
+
+        # collections are not loaded again
+        validator.collections_src = None
+        for node in graph.nodes:
+            validator(node)
+        assert validator.valid, validator.err_msgs
+
+    def test_validate_band_aliases(self):
+        """ Tests that band names are compared ignoring the case and that 'eo:bands' aliases are accepted. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_wrong_band.json")
+        with open(pg_filepath) as file:
+            process_graph = json.load(file)
+        process_graph['process_graph']['load_collection']['arguments']['bands'] = ["b4", "NIR", "B9"]
+        collections = {"COPERNICUS/S2": {
+            "id": "COPERNICUS/S2",
+            "cube:dimensions": {"bands": {"type": "bands", "values": ["B4", "B8"]}},
+            "summaries": {"eo:bands": [{"name": "B4", "common_name": "red"}, {"name": "B8", "common_name": "nir"}]}
+        }}
+
+        valid, err_msgs = validate_process_graph(process_graph, collections, processes_src=GEE_PROCESSES)
+        assert not valid
+        assert [err_msg.keys[-1] for err_msg in err_msgs] == [2]
+        assert str(err_msgs[0]).endswith("with the following bands: 'b4', 'b8'.")
+
+    def test_validate_modes(self):
+        """ Tests that the validation stops after the first or a maximum number of errors. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_wrong_band.json")
+        with open(pg_filepath) as file:
+            process_graph = json.load(file)
+        process_graph['process_graph']['load_collection']['arguments']['bands'] = ["B200", "B300", "B400"]
+        collections_url = "https://earthengine.openeo.org/v1.0/collections"
+
+        _, err_msgs = validate_process_graph(copy.deepcopy(process_graph), collections_url,
+                                             processes_src=GEE_PROCESSES)
+        assert [err_msg.code for err_msg in err_msgs] == ["band_invalid"] * 3
+        assert err_msgs[1].keys == ["load_collection", "arguments", "bands", 1]
+        assert str(err_msgs[1]).startswith("'b300' is not a valid band name for collection 'COPERNICUS/S2'")
+
+        valid, err_msgs = validate_process_graph(copy.deepcopy(process_graph), collections_url,
+                                                 processes_src=GEE_PROCESSES, max_errors=2)
+        assert not valid
+        assert len(err_msgs) == 2
+
+        valid, err_msgs = validate_process_graph(copy.deepcopy(process_graph), collections_url,
+                                                 processes_src=GEE_PROCESSES, mode="fail_fast")
+        assert not valid
+        assert len(err_msgs) == 1
+
+    @unittest.skipIf(jsonschema is None, "'jsonschema' is not installed.")
+    def test_validate_arguments(self):
+        """ Validate argument values against the schemas of the process parameters. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_max_ndvi.json")
+        with open(pg_filepath) as file:
+            process_graph = json.load(file)
+        linear_scale_range = process_graph['process_graph']['apply']['arguments']['process']['process_graph'][
+            'linear_scale_range']
+        linear_scale_range['arguments']['inputMax'] = "one"
+
+        valid, err_msgs = validate_process_graph(process_graph, "https://earthengine.openeo.org/v1.0/collections",
+                                                 processes_src=GEE_PROCESSES, validate_arguments=True)
+
+        assert not valid
+        assert len(err_msgs) == 1
+        assert err_msgs[0].code == "argument_schema"
+        assert err_msgs[0].node_id == "linear_scale_range_1"
+        assert "'inputMax'" in str(err_msgs[0])
+
+    def test_abstract_node_validator(self):
+        """ Tests that node validators need to implement the validation of a node. """
+        with self.assertRaises(TypeError):
+            NodeValidator()
+
+    @unittest.skipIf(jsonschema is None, "'jsonschema' is not installed.")
+    def test_compiled_validators_cached(self):
+        """ Tests that schema validators are compiled only once per process catalog. """
+        process_defs = load_processes(GEE_PROCESSES)
+        validator = ArgumentValidator(process_defs).get_validator('linear_scale_range', 'inputMax')
+
+        assert validator is not None
+        assert ArgumentValidator(process_defs).get_validator('linear_scale_range', 'inputMax') is validator
+        assert ArgumentValidator(process_defs).get_validator('linear_scale_range', 'unknown') is None
+
+        # catalogs given by their source are loaded again, but the validators are cached per source
+        validator = ArgumentValidator(GEE_PROCESSES).get_validator('linear_scale_range', 'inputMax')
+        assert ArgumentValidator(GEE_PROCESSES).get_validator('linear_scale_range', 'inputMax') is validator
+
+    def test_validation_cache(self):
+        """ Tests that validation results are cached per process graph, parameters and catalogs. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_wrong_band.json")
+        process_defs = load_processes(GEE_PROCESSES)
+        collections = {"COPERNICUS/S2": {
+            "id": "COPERNICUS/S2",
+            "cube:dimensions": {"bands": {"type": "bands", "values": ["B4", "B8"]}}
+        }}
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            cache_filepath = os.path.join(dirpath, "validation_cache.json")
+            cache = ValidationCache(maxsize=2, filepath=cache_filepath)
+            valid, err_msgs = validate_process_graph(pg_filepath, collections, processes_src=process_defs,
+                                                     cache=cache)
+            assert not valid
+            assert (cache.hits, cache.misses) == (0, 1)
+
+            valid_cached, err_msgs_cached = cache.validate(pg_filepath, collections, processes_src=process_defs)
+            assert (cache.hits, cache.misses) == (1, 1)
+            assert valid_cached == valid
+            assert [err_msg.to_dict() for err_msg in err_msgs_cached] == [err_msg.to_dict() for err_msg in err_msgs]
+
+            # a changed collection catalog invalidates the cached result
+            collections = copy.deepcopy(collections)
+            collections["COPERNICUS/S2"]["cube:dimensions"]["bands"]["values"].append("B200")
+            valid, _ = cache.validate(pg_filepath, collections, processes_src=process_defs)
+            assert valid
+            assert (cache.hits, cache.misses) == (1, 2)
+
+            # the results are restored from the backing file, the least recently used one is evicted
+            with cache:
+                cache.validate(pg_filepath, collections, processes_src=process_defs, parameters={"unused": 1})
+            cache = ValidationCache(maxsize=2, filepath=cache_filepath)
+            assert len(cache) == 2
+            valid, _ = cache.validate(pg_filepath, collections, processes_src=process_defs)
+            assert valid
+            assert (cache.hits, cache.misses) == (1, 0)
+
+        # catalogs given by their source are not loaded for a cached result
+        cache = ValidationCache()
+        cache.validate(pg_filepath, collections, processes_src=GEE_PROCESSES)
+        with metrics.scope() as registry:
+            cache.validate(pg_filepath, collections, processes_src=GEE_PROCESSES)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert registry.get("openeo_pg_parser_loader_calls_total") == 0
+        # remote collection catalogs require a fingerprint
+        with self.assertRaises(ValueError):
+            cache.validate(pg_filepath, "https://example.org/v1.0/collections", processes_src=GEE_PROCESSES)
+
+    def test_validation_cache_catalog_changes(self):
+        """ Tests that changes of local catalog directories are detected and how results are stored. """
+        pg_filepath = os.path.join(self.pg_dirpath, "s2_wrong_band.json")
+        process_defs = load_processes(GEE_PROCESSES)
+        collection = {"id": "COPERNICUS/S2", "cube:dimensions": {"bands": {"type": "bands", "values": ["B4"]}}}
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            collections_dirpath = os.path.join(dirpath, "collections")
+            os.mkdir(collections_dirpath)
+            collection_filepath = os.path.join(collections_dirpath, "COPERNICUS_S2.json")
+            with open(collection_filepath, 'w') as file:
+                json.dump(collection, file)
+
+            cache = ValidationCache(filepath=os.path.join(dirpath, "validation_cache.json"))
+            valid, _ = cache.validate(pg_filepath, collections_dirpath, processes_src=process_defs)
+            assert not valid
+            # the error messages are only formatted when they are accessed
+            _, err_msgs = cache.validate(pg_filepath, collections_dirpath, processes_src=process_defs)
+            assert callable(err_msgs[0].params["available_bands"])
+            assert str(err_msgs[0]).endswith("with the following bands: 'b4'.")
+
+            # a changed file of the collection directory invalidates the cached result
+            collection["cube:dimensions"]["bands"]["values"].append("B200")
+            with open(collection_filepath, 'w') as file:
+                json.dump(collection, file)
+            valid, _ = cache.validate(pg_filepath, collections_dirpath, processes_src=process_defs)
+            assert valid
+            assert (cache.hits, cache.misses) == (1, 2)
+
+            # volatile results are not written to the backing file
+            cache.put("volatile", True, [], persistent=False)
+            cache.save()
+            cache_restored = ValidationCache(filepath=cache.filepath)
+            assert len(cache_restored) == len(cache) - 1
+            assert cache_restored.get("volatile") is None
+            cache_restored.validate(pg_filepath, collections_dirpath, processes_src=process_defs)
+            assert cache_restored.hits == 1
+
 
 if __name__ == '__main__':
     unittest.main()